@@ -187,11 +187,16 @@ def process_documents_for_aspect(collection_name="derStandard", aspects=["OeNB"]
     :param collection_name: Name der Collection (z. B. "derStandard")
     :param aspects: Liste der zu verarbeitenden Aspekte, z. B. ["OeNB"]
     """
-    docs_cursor, collection = get_docs(collection_name)
-    docs_list = list(docs_cursor)
-    logger.info("Verarbeite %d Dokumente in Collection '%s'.", len(docs_list), collection_name)
-
-    for doc in docs_list:
+    docs, collection = get_docs(
+        collection_name,
+        projection={"article.text": 1},
+        checkpoint=f"absa.method1.{collection_name}"
+    )
+    logger.info("Verarbeite Dokumente in Collection '%s'.", collection_name)
+
+    docs_count = 0
+    for doc in docs:
+        docs_count += 1
         # doc_text ist eine Liste von Paragraph-Strings
         doc_text = doc.get("article", {}).get("text", [])
         
@@ -250,7 +255,7 @@ def process_documents_for_aspect(collection_name="derStandard", aspects=["OeNB"]
         )
         logger.info("Document %s processed: Overall Score: %s, Overall Sentiment: %s",
                     doc["_id"], overall_scores, overall_sentiment)
-    logger.info("%d Dokumente in Collection '%s' verarbeitet (Methode 1).", len(docs_list), collection_name)
+    logger.info("%d Dokumente in Collection '%s' verarbeitet (Methode 1).", docs_count, collection_name)
 
 
 if __name__ == "__main__":
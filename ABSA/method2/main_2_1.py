@@ -104,11 +104,16 @@ def process_documents_for_aspect_method2(collection_name, aspect="OeNB"):
     :param collection_name: Name der Collection (z. B. "derStandard")
     :param aspect: Der Aspekt, z. B. "OeNB"
     """
-    docs_cursor, collection = get_docs(collection_name)
-    docs_list = list(docs_cursor)
-    logger.info("Verarbeite %d Dokumente in Collection %s.", len(docs_list), collection_name)
-
-    for doc in docs_list:
+    docs, collection = get_docs(
+        collection_name,
+        projection={"article.text": 1, "features.absa.method2.overall_sentiment": 1},
+        checkpoint=f"absa.method2.{collection_name}"
+    )
+    logger.info("Verarbeite Dokumente in Collection %s.", collection_name)
+
+    docs_count = 0
+    for doc in docs:
+        docs_count += 1
         doc_id = doc.get("_id")
 
         if doc.get("features", {}).get("absa", {}).get("method2", {}).get("overall_sentiment"):
@@ -163,7 +168,7 @@ def process_documents_for_aspect_method2(collection_name, aspect="OeNB"):
         logger.info("Document %s processed: overall_score=%.3f, overall_sentiment=%s",
                     doc["_id"], overall_score, overall_class)
 
-    logger.info("%d Dokumente in %s verarbeitet (Methode 2).", len(docs_list), collection_name)
+    logger.info("%d Dokumente in %s verarbeitet (Methode 2).", docs_count, collection_name)
 
 
 if __name__ == "__main__":
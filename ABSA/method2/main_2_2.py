@@ -62,11 +62,14 @@ def classify_paragraph_binary(paragraph_text, aspect_label="OeNB"):
 
 
 def process_documents_method2_2(collection_name, aspect="OeNB"):
-    docs_cursor, collection = get_docs(collection_name)
-    docs_list = list(docs_cursor)
-    logger.info("Verarbeite %d Dokumente in Collection %s.", len(docs_list), collection_name)
-
-    for doc in docs_list:
+    docs, collection = get_docs(
+        collection_name,
+        projection={"article.text": 1},
+        checkpoint=f"absa.method2_2.{collection_name}"
+    )
+    logger.info("Verarbeite Dokumente in Collection %s.", collection_name)
+
+    for doc in docs:
         doc_id = doc.get("_id")
 
         #if doc.get("features", {}).get("absa", {}).get("method2_2", {}).get("overall_sentiment"):
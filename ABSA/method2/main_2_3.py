@@ -62,11 +62,14 @@ def classify_sentence_binary(sentence_text, aspect_label="OeNB"):
         return "neutral", 0.0
 
 def process_documents_method2_3(collection_name, aspect="OeNB"):
-    docs_cursor, collection = get_docs(collection_name)
-    docs_list = list(docs_cursor)
-    logger.info("Verarbeite %d Dokumente in Collection %s.", len(docs_list), collection_name)
-
-    for doc in docs_list:
+    docs, collection = get_docs(
+        collection_name,
+        projection={"article.text": 1},
+        checkpoint=f"absa.method2_3.{collection_name}"
+    )
+    logger.info("Verarbeite Dokumente in Collection %s.", collection_name)
+
+    for doc in docs:
         doc_id = doc.get("_id")
         
         doc_text = doc.get("article", {}).get("text", [])
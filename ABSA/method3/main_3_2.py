@@ -35,7 +35,11 @@ def main(aspects=["OeNB"], collections_to_process=["derStandard", "Krone", "ORF"
 
     for collection_name in collections_to_process:
         logger.info("Verarbeite Collection: %s", collection_name)
-        documents, collection = get_docs(collection_name)
+        documents, collection = get_docs(
+            collection_name,
+            projection={"article.text": 1, "features.absa.method3_2.overall_sentiment": 1},
+            checkpoint=f"absa.method3_2.{collection_name}"
+        )
 
         for doc in documents:
             doc_id = doc.get("_id")
@@ -1,8 +1,9 @@
+import os
 import socket
 
-# Konfigurationen
-CHROMEDRIVER_PATH = "/usr/bin/chromedriver" if socket.gethostname() == "raspberrypi" else "chromedriver.exe"
-FRONTPAGE_URL = "https://www.krone.at/"
+# Konfigurationen (per Umgebungsvariable überschreibbar, z.B. für Webscraping/benchmarks/load_test.py)
+CHROMEDRIVER_PATH = os.getenv("CHROMEDRIVER_PATH", "/usr/bin/chromedriver" if socket.gethostname() == "raspberrypi" else "chromedriver.exe")
+FRONTPAGE_URL = os.getenv("KRONE_FRONTPAGE_URL", "https://www.krone.at/")
 USER_AGENT = (
     "Mozilla/5.0 (Windows NT 10.0; Win64; x64) "
     "AppleWebKit/537.36 (KHTML, like Gecko) "
@@ -1,16 +1,38 @@
-import time
+import os
+import sys
 import datetime
+from functools import partial
 from selenium import webdriver as wd
 from selenium.webdriver.chrome.service import Service as ChromeService
 from selenium.common.exceptions import NoSuchElementException
 from selenium.webdriver.common.by import By
 from config import CHROMEDRIVER_PATH, USER_AGENT, FRONTPAGE_URL
 
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..")))
+from common.page_readiness import ReadySelector, wait_for_page
+from common.driver_pool import DriverPool
+from common.network_blocking import profile_from_env, configure_options, apply_profile
+
+# Netzwerk-Profil (Werbung, Tracker, Bilder, Fonts, Videos blockieren), siehe common/network_blocking.py
+NETWORK_PROFILE = profile_from_env()
+
+CONSENT_XPATH = "/html/body/div[1]/div/div/div/div/div/div[2]/button[3]"
+CONSENT_READY = [ReadySelector('consent-button', CONSENT_XPATH, 5)]
+COOKIE_FILE = os.path.join(os.getenv("SCRAPER_COOKIE_DIR", os.path.dirname(os.path.abspath(__file__))), 'consent_cookies.json')
+
 def configure_driver(headless=True):
     """
     Erstellt und konfiguriert den WebDriver für krone.at.
     Klickt ggf. das Cookie-Popup weg.
     """
+    driver = create_driver(headless)
+    accept_consent(driver)
+    return driver
+
+def create_driver(headless=True):
+    """
+    Erstellt den WebDriver für krone.at (ohne Cookie-Popup).
+    """
     chrome_options = wd.ChromeOptions()
     if headless:
         # In neueren Chrome-Versionen: "--headless=new" 
@@ -27,18 +49,39 @@ def configure_driver(headless=True):
         "profile.managed_default_content_settings.images": 2
     }
     chrome_options.experimental_options["prefs"] = chrome_prefs
+    configure_options(chrome_options, NETWORK_PROFILE)
 
     service = ChromeService(executable_path=CHROMEDRIVER_PATH)
     driver = wd.Chrome(service=service, options=chrome_options)
+    apply_profile(driver, NETWORK_PROFILE)
+    return driver
 
+def accept_consent(driver):
+    """
+    Öffnet die Startseite und klickt das Cookie-Popup weg.
+    Rückgabe: True, wenn der Button geklickt wurde
+    """
     # Öffne die Startseite, um das Cookie-Popup zu schließen
     driver.get(FRONTPAGE_URL)
-    time.sleep(5)
+    wait_for_page(driver, CONSENT_READY)
     try:
         # XPath für Cookie-Popup
-        driver.find_element(By.XPATH, "/html/body/div[1]/div/div/div/div/div/div[2]/button[3]").click()
+        driver.find_element(By.XPATH, CONSENT_XPATH).click()
+        return True
     except NoSuchElementException:
         print("Cookie-Popup wurde nicht gefunden oder bereits ausgeblendet.")
-        pass
+        return False
 
-    return driver
+def create_driver_pool(logger, headless=True, max_pages=200, max_rss_mb=1500, size=1):
+    """
+    Driver-Pool für einen Worker-Prozess, siehe common.driver_pool.DriverPool.
+    """
+    return DriverPool(
+        partial(create_driver, headless),
+        accept_consent,
+        COOKIE_FILE,
+        logger,
+        max_pages=max_pages,
+        max_rss_mb=max_rss_mb,
+        size=size,
+    )
@@ -1,15 +1,28 @@
-import time
+import os
+import sys
+from database import get_db_connection
 from logger_setup import setup_logger
-from scraper import scrape_articles
+from scraper import scrape_articles, refresh_comments
 
-def main(n=4):
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..")))
+from common.change_scheduler import ChangeScheduler
+
+def main(n=4, claim_size=1000):
     """
     n = Anzahl der parallelen Prozesse
+
+    Läuft, sobald neue URLs (mit Sentiment) in der Collection landen, sonst
+    spätestens alle max_idle Sekunden (fällige Retries, Kommentar-Aktualisierung).
     """
     logger = setup_logger(log_file='krone_scraper_main.log')
-    while True:
-        scrape_articles(logger, n)
-        time.sleep(60)
+
+    def run(reason):
+        claimed = scrape_articles(logger, n, claim_size)
+        refresh_comments(logger, n)
+        # claim_size ausgeschöpft -> es wartet noch mehr, gleich weitermachen
+        return claimed >= claim_size
+
+    ChangeScheduler(get_db_connection('Krone'), run, logger).serve_forever()
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
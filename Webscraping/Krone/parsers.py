@@ -1,11 +1,20 @@
 # parsers.py
+import os
 import re
-import dateparser
+import sys
 import inspect
-from bs4 import BeautifulSoup
+from bs4 import SoupStrainer
 from selenium.webdriver.common.by import By
 from selenium.common.exceptions import NoSuchElementException
 
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..")))
+from common.html_parser import make_soup
+from common.date_parsing import parse_datetime
+
+# Kommentar-iFrame: nur die Kommentar-Wrapper werden geparst, nicht das ganze Dokument
+COMMENT_WRAPPER_CLASS = re.compile(r"talk-stream-comment-wrapper-level-\d+")
+COMMENTS_STRAINER = SoupStrainer("div", class_=COMMENT_WRAPPER_CLASS)
+
 def parse_krone_article(soup, logger):
     """
     Parst die wichtigsten Meta-Infos aus einem Krone-Artikel:
@@ -61,7 +70,7 @@ def parse_krone_article(soup, logger):
             # Datum
             pubdate_el = kicker_pubdate_div.find('div', class_='bc__date')
             if pubdate_el:
-                data['article.pubdate'] = dateparser.parse(pubdate_el.get_text(strip=True), languages=['de'])
+                data['article.pubdate'] = parse_datetime(pubdate_el.get_text(strip=True))
             else:
                 data['article.pubdate'] = None
         else:
@@ -122,10 +131,11 @@ def parse_krone_article(soup, logger):
     return data
 
 
-def parse_krone_comment_section(driver, logger):
+def parse_krone_comment_section(driver, logger, on_html=None):
     """
     Lädt mithilfe von Selenium die Kommentare (inkl. 'Mehr anzeigen'-Klicks) 
-    und parst sie via BeautifulSoup.
+    und parst sie via BeautifulSoup. 'on_html' wird (falls gesetzt) mit dem
+    HTML des iFrames aufgerufen, z.B. zum Archivieren.
     
     Gibt eine Liste (verschachtelter) Kommentare zurück oder [] wenn keine gefunden.
     """
@@ -164,12 +174,15 @@ def parse_krone_comment_section(driver, logger):
                 break
 
         # Jetzt HTML aus dem iFrame lesen
-        soup_iframe = BeautifulSoup(driver.page_source, 'html.parser')
+        iframe_html = driver.page_source
+        if on_html:
+            on_html(iframe_html)
+        soup_iframe = make_soup(iframe_html, parse_only=COMMENTS_STRAINER)
         # Zurück zum Haupt-Frame
         driver.switch_to.default_content()
 
         # Finde alle Kommentar-DIVs
-        comment_divs = soup_iframe.find_all("div", class_=re.compile(r"talk-stream-comment-wrapper-level-\d+"))
+        comment_divs = soup_iframe.find_all("div", class_=COMMENT_WRAPPER_CLASS)
         comments = parse_krone_nested_comments(comment_divs)
     except Exception as e:
         logger.error(f"Fehler beim Laden/Parsen der Krone-Kommentar-Sektion: {e}", exc_info=True)
@@ -234,8 +247,6 @@ def extract_comment_data(wrapper):
     """
     Extrahiert ID, Autor, Datum, Up-/Downvotes und Kommentartext.
     """
-    import dateparser
-
     # Kommentar-ID
     comment_id = wrapper.get("id", "").strip()
 
@@ -247,7 +258,7 @@ def extract_comment_data(wrapper):
     import re
     timestamp_tag = wrapper.find("span", class_=re.compile(r"TimeAgo__timeago"))
     comment_datetime_str = timestamp_tag.get("title", "").strip() if timestamp_tag else ""
-    datetime_obj = dateparser.parse(comment_datetime_str, languages=['de'])
+    datetime_obj = parse_datetime(comment_datetime_str)
 
     # Up-/Downvotes
     upvote_span = wrapper.find("span", class_="talk-plugin-upvote-count")
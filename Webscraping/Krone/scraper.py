@@ -1,177 +1,349 @@
 import logging
-import time
 import os
 import datetime
-import multiprocessing
+from collections import Counter
+import sys
 from selenium.common.exceptions import TimeoutException
-from bs4 import BeautifulSoup
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 
 from database import get_db_connection
-from driver import configure_driver
+from driver import create_driver_pool, NETWORK_PROFILE
 from logger_setup import setup_logger, close_logger
 from parsers import parse_krone_article, parse_krone_comment_section
 from utils import scraping_status
 
-def scrape_articles(logger, n=10):
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..")))
+from common.work_queue import WorkerStats, iter_queue, run_workers
+from common.metrics import timed
+from common.page_readiness import ReadySelector, wait_for_page
+from common.html_parser import make_soup
+from common.page_archive import open_archive
+from common.retry_state import DEAD_LETTER, due_filter
+from common.network_blocking import page_network_stats, log_network_totals
+from common.date_parsing import log_parse_stats, reset_parse_stats
+from common.mongo import log_latency_stats
+from common.job_lease import LeaseKeeper, claim_batch, ensure_lease_index, release_lease, worker_id
+from common.comment_refresh import refresh_due_filter, refresh_article_comments, record_refresh_failure
+
+# Elemente, auf die nach driver.get gewartet wird (statt fixer time.sleep(1.5))
+ARTICLE_READY = [
+    ReadySelector('title', 'div.c_title[data-nodeid]', 10),
+    ReadySelector('comment-count', 'span.js-krn-comments-count', 3),
+]
+
+def scrape_articles(logger, n=10, claim_size=1000):
     """
-    Liest aus der MongoDB alle URLs, deren Status != 'success' ist,
-    teilt sie auf n Prozesse auf und ruft 'scrape_articles_chunk' parallel auf.
+    Claimt aus der MongoDB bis zu 'claim_size' URLs, deren Status != 'success' ist,
+    per Lease (siehe common/job_lease.py), damit mehrere Scraper (auch auf anderen
+    Rechnern) ohne Überschneidung arbeiten, und verteilt sie über eine gemeinsame
+    Queue auf n Prozesse ('scrape_articles_worker').
+    Rückgabe: Anzahl der geclaimten URLs
     """
     collection = get_db_connection('Krone')
+    ensure_lease_index(collection)
+    owner = worker_id()
 
     # URLs selektieren
-    urls_to_scrape = list(collection.find(
+    urls_to_scrape = claim_batch(
+        collection,
         {
             '$and': [
                 { 'features.APA_OeNB_Sentiment': { '$exists': True, '$nin': [None, ""] } },
                 {
                     '$or': [
-                        {'scraping_info.status': {'$nin': ['success', 'skipped', 'warning (missing title)', 'warning (missing pubdate)']}},
+                        {'scraping_info.status': {'$nin': ['success', 'skipped', 'warning (missing title)', 'warning (missing pubdate)', 'warning (comments)', DEAD_LETTER]}},
                         {'scraping_info.status': {'$exists': False}}
                     ]
-                }
+                },
+                # fehlgeschlagene URLs erst, wenn der nächste Versuch fällig ist
+                due_filter()
             ]
         },
-        {
+        owner,
+        claim_size,
+        projection={
             'scraping_info.url': 1,
             'scraping_info.status': 1
-        }
-    ).sort([
-        ('scraping_info.status', 1)
-    ]))
+        },
+        sort=[
+            ('scraping_info.status', 1)
+        ]
+    )
     
     if len(urls_to_scrape) == 0:
         logger.info("Keine neuen oder fehlerhaften URLs zu verarbeiten.")
-        return
-
-    logger.info(f"Anzahl der zu scrapenden URLs: {len(urls_to_scrape)}")
+        return 0
 
-    # Gleichmäßig auf n Prozesse verteilen
-    chunks = [urls_to_scrape[i::n] for i in range(n)]
+    logger.info(f"Anzahl der zu scrapenden URLs: {len(urls_to_scrape)} (Lease {owner})")
 
-    with multiprocessing.Pool(processes=n) as pool:
-        pool.map(scrape_articles_chunk, chunks)
+    # Gemeinsame Queue: jeder Prozess holt sich die nächste URL, sobald er frei ist
+    with LeaseKeeper(collection, owner, logger):
+        run_workers(urls_to_scrape, scrape_articles_worker, n, logger, metrics_name='Krone')
+    return len(urls_to_scrape)
 
 
-def scrape_articles_chunk(urls_chunk):
+def scrape_articles_worker(task_queue, stats_queue):
     pid = os.getpid()
     log_file = f'scraper_krone_{pid}.log'
     logger = setup_logger(log_file=log_file)
-    logger.info(f"Prozess {pid} gestartet und verarbeitet {len(urls_chunk)} Artikel.")
+    logger.info(f"Prozess {pid} gestartet.")
+    reset_parse_stats()
 
+    stats = WorkerStats()
     collection = get_db_connection('Krone')
-    driver = configure_driver(headless=True)
+    driver_pool = create_driver_pool(logger, headless=True)
+    archive = open_archive('Krone')
+
+    network_totals = Counter()
+    network_pages = 0
 
     try:
-        for url_entry in urls_chunk:
-            full_url = url_entry['scraping_info']['url']
-            logger.info(f"Prozess {pid} verarbeitet URL: {full_url}")
-
-            # 0) Skip bestimmte URLs
-            if full_url.startswith('https://tv.krone.at'):
-                try:
-                    # Setze scraping_info.status auf "skipped" und aktualisiere download_datetime
-                    scraping_status(collection, "skipped", full_url, "URL wird übersprungen", logger)
-                    logger.info(f"URL wird übersprungen: {full_url}")
-                except Exception as e:
-                    logger.error(f"Fehler beim Überspringen der URL {full_url}: {e}", exc_info=True)
-                finally:
-                    # Überspringe die weitere Verarbeitung dieser URL
-                    continue
-
-            # 1) Seite laden
-            try:
-                driver.set_page_load_timeout(30)
-                driver.get(full_url)
-            except TimeoutException:
-                scraping_status(collection, "error", full_url, "Timeout beim Laden der Seite", logger)
-                logger.error(f"Timeout beim Laden der Seite: {full_url}")
-                continue
-            except Exception as e:
-                scraping_status(collection, "error", full_url, f"Fehler beim Laden: {e}", logger)
-                logger.error(f"Fehler beim Laden der Seite: {e}", exc_info=True)
-                continue
-
-            time.sleep(1.5)
-
-            # 2) HTML parsen (BeautifulSoup)
-            soup = BeautifulSoup(driver.page_source, 'html.parser')
-
-            # 3) Artikel parsen (Titel, Kicker, Autor, Paywall etc.)
-            try:
-                article_data = parse_krone_article(soup, logger)
-                logger.debug("Artikel erfolgreich geparst.")
-            except Exception as e:
-                scraping_status(collection, "error", full_url, f"Fehler beim Artikel-Parsing: {e}", logger)
-                logger.error(f"Fehler beim Artikel-Parsing: {e}", exc_info=True)
-                continue
-
-            # 4) Posting Count ermitteln (Kommentaranzahl)
-            try:
-                posting_count_elem = soup.find('span', class_='stb__comment-count js-krn-comments-count')
-                if posting_count_elem:
-                    posting_count = int(posting_count_elem.text.strip())
-                    logger.debug(f"Posting Count gefunden: {posting_count}")
-                else:
-                    posting_count = 0
-                    logger.info("Kein Posting Count gefunden, setze auf 0.")
-            except Exception as e:
-                logger.warning(f"Fehler beim Auslesen des posting_count: {e}", exc_info=True)
-                posting_count = 0
-
-            # posting_count im Artikel-Dict speichern
-            article_data['features.posting_count'] = posting_count
-
-            # 5) Kommentare parsen, nur wenn posting_count > 0 und kein paywall-Artikel
-            if posting_count > 0 and not article_data.get('features.paywall'):
-                try:
-                    forum_comments = parse_krone_comment_section(driver, logger)
-                    comments_count = len(forum_comments)
-                    logger.debug(f"{comments_count} Kommentare geparst.")
-                except Exception as e:
-                    scraping_status(collection, "warning (comments)", full_url, f"Fehler beim Kommentar-Parsing: {e}", logger)
-                    logger.error(f"Fehler beim Kommentar-Parsing: {e}", exc_info=True)
-                    forum_comments = []
-                    comments_count = 0
-            else:
-                # Entweder 0 Kommentare oder paywall => kein Kommentar-Parsing
-                forum_comments = []
-                comments_count = 0
-                if posting_count == 0:
-                    logger.info("Posting Count = 0 -> Keine Kommentare zum Parsen.")
-                elif article_data.get('features.paywall'):
-                    logger.info("Paywall-Artikel -> Keine Kommentare zugänglich.")
-
-            # 6) Status bestimmen
-            if not article_data.get('article.title'):
-                status = "warning (missing title)"
-                logger.warning(f"Kein Titel {full_url}, Status = warning.")
-            elif not article_data.get('article.pubdate'):
-                status = "warning (missing pubdate)"
-                logger.warning(f"Kein Datum für {full_url}, Status = warning.")
-            else:
-                status = "success"
-
-            # 7) DB-Update vorbereiten
-            article_data.update({
-                'article.comments': forum_comments,
-                'scraping_info.status': status,
-                'scraping_info.download_datetime': datetime.datetime.now()
-            })
-
-            try:
-                collection.update_one(
-                    {'scraping_info.url': full_url},
-                    {'$set': article_data}
+        for url_entry in iter_queue(task_queue, stats):
+            with driver_pool.page() as driver:
+                status = scrape_article(driver, collection, url_entry, logger, stats, archive)
+                stats.count_status(status)
+                network = page_network_stats(driver, NETWORK_PROFILE)
+            if network['requests']:
+                network_pages += 1
+                network_totals.update(network)
+                logger.debug(
+                    f"Netzwerk {url_entry['scraping_info']['url']}: {network['requests']} Requests, "
+                    f"{network['bytes'] / 1024:.0f} KB, {network['blocked_requests']} vermieden"
                 )
-                logger.info(f"Scraping abgeschlossen (Status '{status}') für {full_url}")
-            except Exception as e:
-                logger.error(f"Fehler beim DB-Update für {full_url}: {e}", exc_info=True)
+    finally:
+        log_network_totals(network_totals, network_pages, logger)
+        log_parse_stats(logger)
+        log_latency_stats(logger)
+        driver_pool.close()
+        if archive:
+            archive.close()
+        logger.info(f"Prozess {pid}: Browser geschlossen, {stats.items} Artikel mit {driver_pool.drivers_started} Browser-Instanzen verarbeitet.")
+        close_logger(logger)
+        stats_queue.put(stats.as_dict())
+
+
+def scrape_article(driver, collection, url_entry, logger, stats=None, archive=None):
+    """
+    Lädt und parst einen einzelnen Krone-Artikel und schreibt das Ergebnis in die DB.
+    Die Dauer der einzelnen Stufen landet in 'stats'. Rückgabe: Status der Seite
+    """
+    pid = os.getpid()
+    full_url = url_entry['scraping_info']['url']
+    logger.info(f"Prozess {pid} verarbeitet URL: {full_url}")
+
+    # 0) Skip bestimmte URLs
+    if full_url.startswith('https://tv.krone.at'):
+        try:
+            # Setze scraping_info.status auf "skipped" und aktualisiere download_datetime
+            scraping_status(collection, "skipped", full_url, "URL wird übersprungen", logger)
+            logger.info(f"URL wird übersprungen: {full_url}")
+        except Exception as e:
+            logger.error(f"Fehler beim Überspringen der URL {full_url}: {e}", exc_info=True)
+        # Überspringe die weitere Verarbeitung dieser URL
+        return "skipped"
+
+    # 1) Seite laden
+    try:
+        driver.set_page_load_timeout(30)
+        with timed(stats, 'driver.get'):
+            driver.get(full_url)
+    except TimeoutException as e:
+        logger.error(f"Timeout beim Laden der Seite: {full_url}")
+        return scraping_status(collection, "error", full_url, "Timeout beim Laden der Seite", logger, type(e).__name__)
+    except Exception as e:
+        logger.error(f"Fehler beim Laden der Seite: {e}", exc_info=True)
+        return scraping_status(collection, "error", full_url, f"Fehler beim Laden: {e}", logger, type(e).__name__)
+
+    # Warten, bis Titel und Kommentarzähler gerendert sind
+    readiness = wait_for_page(driver, ARTICLE_READY)
+    logger.debug(f"Wartezeit {readiness['waited']:.2f}s für {full_url}, nicht erschienen: {readiness['missing']}")
+    if stats:
+        stats.record('wait', readiness['waited'])
+
+    # 2) HTML parsen (BeautifulSoup), Roh-HTML ggf. archivieren
+    html_content = driver.page_source
+    if archive:
+        archive.add(full_url, html_content)
+
+    # 3) Artikel parsen (Titel, Kicker, Autor, Paywall etc.)
+    try:
+        with timed(stats, 'soup'):
+            soup = make_soup(html_content)
+            article_data = parse_krone_article(soup, logger)
+        logger.debug("Artikel erfolgreich geparst.")
+    except Exception as e:
+        logger.error(f"Fehler beim Artikel-Parsing: {e}", exc_info=True)
+        return scraping_status(collection, "error", full_url, f"Fehler beim Artikel-Parsing: {e}", logger, type(e).__name__)
+
+    # 4) Posting Count ermitteln (Kommentaranzahl)
+    try:
+        posting_count_elem = soup.find('span', class_='stb__comment-count js-krn-comments-count')
+        if posting_count_elem:
+            posting_count = int(posting_count_elem.text.strip())
+            logger.debug(f"Posting Count gefunden: {posting_count}")
+        else:
+            posting_count = 0
+            logger.info("Kein Posting Count gefunden, setze auf 0.")
+    except Exception as e:
+        logger.warning(f"Fehler beim Auslesen des posting_count: {e}", exc_info=True)
+        posting_count = 0
+
+    # posting_count im Artikel-Dict speichern
+    article_data['features.posting_count'] = posting_count
+
+    # 5) Kommentare parsen, nur wenn posting_count > 0 und kein paywall-Artikel
+    if posting_count > 0 and not article_data.get('features.paywall'):
+        try:
+            on_html = (lambda html: archive.add(full_url, html, part='comments')) if archive else None
+            with timed(stats, 'comments'):
+                forum_comments = parse_krone_comment_section(driver, logger, on_html)
+            comments_count = len(forum_comments)
+            logger.debug(f"{comments_count} Kommentare geparst.")
+        except Exception as e:
+            scraping_status(collection, "warning (comments)", full_url, f"Fehler beim Kommentar-Parsing: {e}", logger)
+            logger.error(f"Fehler beim Kommentar-Parsing: {e}", exc_info=True)
+            forum_comments = []
+            comments_count = 0
+    else:
+        # Entweder 0 Kommentare oder paywall => kein Kommentar-Parsing
+        forum_comments = []
+        comments_count = 0
+        if posting_count == 0:
+            logger.info("Posting Count = 0 -> Keine Kommentare zum Parsen.")
+        elif article_data.get('features.paywall'):
+            logger.info("Paywall-Artikel -> Keine Kommentare zugänglich.")
+
+    # 6) Status bestimmen
+    if not article_data.get('article.title'):
+        status = "warning (missing title)"
+        logger.warning(f"Kein Titel {full_url}, Status = warning.")
+    elif not article_data.get('article.pubdate'):
+        status = "warning (missing pubdate)"
+        logger.warning(f"Kein Datum für {full_url}, Status = warning.")
+    else:
+        status = "success"
+
+    # 7) DB-Update vorbereiten
+    article_data.update({
+        'article.comments': forum_comments,
+        'scraping_info.status': status,
+        'scraping_info.download_datetime': datetime.datetime.now()
+    })
+
+    try:
+        with timed(stats, 'db_write'):
+            collection.update_one(
+                {'scraping_info.url': full_url},
+                {'$set': article_data}
+            )
+        logger.info(f"Scraping abgeschlossen (Status '{status}') für {full_url}")
+    except Exception as e:
+        logger.error(f"Fehler beim DB-Update für {full_url}: {e}", exc_info=True)
+        return "error (db)"
+    return status
 
+
+def refresh_comments(logger, n=4, claim_size=500):
+    """
+    Aktualisiert die Kommentare bereits gescrapter Krone-Artikel inkrementell:
+    neue Kommentare werden angehängt, nur geänderte Votes überschrieben (siehe
+    common/comment_refresh.py). Junge Artikel sind öfter fällig als alte.
+    """
+    collection = get_db_connection('Krone')
+    ensure_lease_index(collection)
+    owner = worker_id()
+
+    articles = claim_batch(
+        collection,
+        {
+            '$and': [
+                {'scraping_info.status': 'success'},
+                {'features.posting_count': {'$gt': 0}},
+                {'features.paywall': {'$ne': True}},
+                refresh_due_filter()
+            ]
+        },
+        owner,
+        claim_size,
+        projection={'scraping_info.url': 1}
+    )
+
+    logger.info(f"Artikel mit fälliger Kommentar-Aktualisierung: {len(articles)} (Lease {owner})")
+    if not articles:
+        return
+
+    with LeaseKeeper(collection, owner, logger):
+        run_workers(articles, refresh_comments_worker, n, logger, metrics_name='Krone-refresh')
+
+
+def refresh_comments_worker(task_queue, stats_queue):
+    pid = os.getpid()
+    logger = setup_logger(log_file=f'refresh_krone_{pid}.log')
+    logger.info(f"Prozess {pid} gestartet.")
+    reset_parse_stats()
+
+    stats = WorkerStats()
+    collection = get_db_connection('Krone')
+    driver_pool = create_driver_pool(logger, headless=True)
+
+    network_totals = Counter()
+    network_pages = 0
+
+    try:
+        for url_entry in iter_queue(task_queue, stats):
+            with driver_pool.page() as driver:
+                stats.count_status(refresh_article(driver, collection, url_entry['scraping_info']['url'], logger, stats))
+                # Performance-Log bei jeder Seite leeren, sonst wächst es im gepoolten Driver unbegrenzt
+                network = page_network_stats(driver, NETWORK_PROFILE)
+            if network['requests']:
+                network_pages += 1
+                network_totals.update(network)
     finally:
-        driver.quit()
-        logger.info(f"Prozess {pid}: Browser geschlossen.")
-        close_logger(logger)
\ No newline at end of file
+        log_network_totals(network_totals, network_pages, logger)
+        log_parse_stats(logger)
+        log_latency_stats(logger)
+        driver_pool.close()
+        logger.info(f"Prozess {pid}: Kommentare von {stats.items} Artikeln aktualisiert.")
+        close_logger(logger)
+        stats_queue.put(stats.as_dict())
+
+
+def refresh_article(driver, collection, full_url, logger, stats=None):
+    """
+    Lädt die Kommentar-Sektion eines gespeicherten Artikels erneut und schreibt
+    nur die Änderungen. Rückgabe: Status
+    """
+    stored_doc = collection.find_one(
+        {'scraping_info.url': full_url},
+        {'article.comments': 1, 'article.pubdate': 1, 'scraping_info.comments_refresh': 1}
+    )
+    if stored_doc is None:
+        # Seit dem Claim gelöscht oder umbenannt (z.B. URL-Deduplizierung)
+        logger.warning(f"Artikel zum Aktualisieren nicht mehr vorhanden: {full_url}")
+        release_lease(collection, full_url)
+        return 'missing'
+    pubdate = stored_doc.get('article', {}).get('pubdate')
+    try:
+        driver.set_page_load_timeout(30)
+        with timed(stats, 'driver.get'):
+            driver.get(full_url)
+        readiness = wait_for_page(driver, ARTICLE_READY)
+        if stats:
+            stats.record('wait', readiness['waited'])
+
+        with timed(stats, 'comments'):
+            forum_comments = parse_krone_comment_section(driver, logger)
+        if not forum_comments:
+            record_refresh_failure(collection, full_url, pubdate, 'Keine Kommentare gefunden')
+            return 'warning (comments)'
+
+        with timed(stats, 'db_write'):
+            new_count, changed_votes = refresh_article_comments(collection, full_url, stored_doc, forum_comments)
+        logger.info(f"Kommentare aktualisiert: {new_count} neu, {changed_votes} mit geänderten Votes: {full_url}")
+        return 'refreshed'
+    except Exception as e:
+        logger.error(f"Fehler beim Aktualisieren der Kommentare von {full_url}: {e}", exc_info=True)
+        record_refresh_failure(collection, full_url, pubdate, str(e))
+        return 'error'
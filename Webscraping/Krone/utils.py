@@ -1,9 +1,21 @@
+import os
+import sys
 import datetime
 
-def scraping_status(collection, status, url, exception_message, logger):
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..")))
+from common.retry_state import record_failure
+
+def scraping_status(collection, status, url, exception_message, logger, error_class=None):
     """
-    Schreibt den Status in die DB und loggt eine Warnung.
+    Schreibt den Status in die DB und loggt eine Warnung. Fehler ('error') werden
+    mit Backoff für einen späteren Versuch vorgemerkt (siehe common/retry_state.py),
+    'error_class' ist der Klassenname der auslösenden Exception.
+    Gibt den Status zurück.
     """
+    logger.warning(f"{exception_message}: {url}")
+    if status == 'error':
+        record_failure(collection, url, exception_message, error_class=error_class)
+        return status
     collection.update_one(
         {'scraping_info.url': url},
         {
@@ -13,4 +25,4 @@ def scraping_status(collection, status, url, exception_message, logger):
             }
         }
     )
-    logger.warning(f"{exception_message}: {url}")
+    return status
@@ -0,0 +1,233 @@
+"""
+End-to-End-Lasttest der Scraper gegen den lokalen Ersatz (stand_in_site.py)
+und eine lokale MongoDB, um n, Semaphore-Größen und Timeouts reproduzierbar
+zu vergleichen, ohne die echten Seiten zu belasten.
+
+Pro Site und Wert wird die Collection neu befüllt und der unveränderte
+Scraper als eigener Prozess gestartet (wie main.py):
+  derStandard, Krone:  scrape_articles(logger, n=<Wert>)
+  ORF:                 main(concurrency=<Wert>, max_concurrency=<Wert>)
+Danach werden Durchsatz, End-Status in der DB, Antworten des Ersatz-Servers
+und die Stufen-Metriken (common/metrics.py) des Laufs ausgegeben.
+
+  python Webscraping/benchmarks/load_test.py --sites derStandard Krone --articles 300 --n 2 4 8
+  python Webscraping/benchmarks/load_test.py --sites ORF --concurrency 10 20 50 --latency-ms 400
+
+Ohne --mongo-uri wird ein temporärer mongod (aus dem PATH) gestartet. Eine
+angegebene Instanz muss lokal laufen, weil die Collections derStandard,
+Krone und ORF der Datenbank 'newspapers' dort überschrieben werden.
+Für den Browser muss CHROMEDRIVER_PATH gesetzt sein (außer auf dem Raspberry Pi).
+"""
+import os
+import sys
+import json
+import glob
+import time
+import shutil
+import socket
+import argparse
+import tempfile
+import subprocess
+from contextlib import contextmanager
+from pymongo import MongoClient
+from pymongo.uri_parser import parse_uri
+
+from stand_in_site import StandInServer, add_config_arguments, config_from_args
+
+REPO_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
+LOCAL_HOSTS = {'localhost', '127.0.0.1', '::1'}
+
+# Site -> (Pfad im Ersatz, Startseite für den Consent, Aufruf im Scraper-Prozess)
+SITES = {
+    'derStandard': (
+        '/derstandard/story/{id}/synthetischer-artikel-{id}',
+        '/derstandard/',
+        "from logger_setup import setup_logger\n"
+        "from scraper import scrape_articles\n"
+        "scrape_articles(setup_logger(log_file='load_test.log'), n={value}, claim_size={claim_size}, max_conns={max_conns})",
+    ),
+    'Krone': (
+        '/krone/artikel/{id}',
+        '/krone/',
+        "from logger_setup import setup_logger\n"
+        "from scraper import scrape_articles\n"
+        "scrape_articles(setup_logger(log_file='load_test_krone.log'), n={value}, claim_size={claim_size})",
+    ),
+    'ORF': (
+        '/orf/stories/{id}/',
+        None,
+        "import asyncio\n"
+        "from scraper import main\n"
+        "asyncio.run(main(claim_size={claim_size}, concurrency={value}, max_concurrency={value}))",
+    ),
+}
+
+
+def free_port():
+    with socket.socket() as s:
+        s.bind(('127.0.0.1', 0))
+        return s.getsockname()[1]
+
+
+@contextmanager
+def local_mongodb(mongo_uri):
+    """Liefert die URI einer lokalen MongoDB, ohne Angabe mit temporärem mongod."""
+    if mongo_uri:
+        hosts = {host for host, _ in parse_uri(mongo_uri)['nodelist']}
+        if not hosts <= LOCAL_HOSTS:
+            raise SystemExit(f"--mongo-uri muss auf eine lokale Instanz zeigen, nicht auf {', '.join(sorted(hosts))}.")
+        yield mongo_uri
+        return
+
+    mongod = shutil.which('mongod')
+    if mongod is None:
+        raise SystemExit("mongod nicht gefunden: mongod in den PATH legen oder --mongo-uri angeben.")
+    with tempfile.TemporaryDirectory(prefix='load-test-mongod-') as dbpath:
+        port = free_port()
+        process = subprocess.Popen(
+            [mongod, '--dbpath', dbpath, '--port', str(port), '--bind_ip', '127.0.0.1', '--quiet'],
+            stdout=subprocess.DEVNULL,
+        )
+        uri = f"mongodb://127.0.0.1:{port}/"
+        try:
+            client = MongoClient(uri, serverSelectionTimeoutMS=30000)
+            client.admin.command('ping')
+            client.close()
+            yield uri
+        finally:
+            process.terminate()
+            process.wait(timeout=30)
+
+
+def seed_collection(collection, site, base_url, articles):
+    """Befüllt die Collection mit 'articles' offenen URLs auf dem Ersatz (wie nach dem URL-Scraping)."""
+    path = SITES[site][0]
+    collection.drop()
+    collection.create_index('scraping_info.url', unique=True)
+    collection.insert_many([
+        {
+            'scraping_info': {'url': base_url + path.format(id=3000000000 + i)},
+            'features': {'APA_OeNB_Sentiment': 'neutral'},
+        }
+        for i in range(articles)
+    ])
+
+
+def final_statuses(collection):
+    return {
+        str(group['_id']): group['count']
+        for group in collection.aggregate([{'$group': {'_id': '$scraping_info.status', 'count': {'$sum': 1}}}])
+    }
+
+
+def latest_metrics(metrics_dir, site):
+    paths = sorted(glob.glob(os.path.join(metrics_dir, f"{site}-*.json")))
+    if not paths:
+        return None
+    with open(paths[-1], encoding='utf-8') as f:
+        return json.load(f)
+
+
+def run_scraper(site, value, args, env, run_dir):
+    """Startet den Scraper als eigenen Prozess. Rückgabe: (Exit-Code, Sekunden)"""
+    site_dir = os.path.join(REPO_ROOT, 'Webscraping', site)
+    code = f"import sys\nsys.path.insert(0, {site_dir!r})\n" + SITES[site][2].format(
+        value=value, claim_size=args.articles, max_conns=args.max_conns
+    )
+    started = time.perf_counter()
+    try:
+        completed = subprocess.run([sys.executable, '-c', code], cwd=run_dir, env=env, timeout=args.timeout)
+        returncode = completed.returncode
+    except subprocess.TimeoutExpired:
+        returncode = 'timeout'
+    return returncode, time.perf_counter() - started
+
+
+def run_once(site, value, args, server, db, mongo_uri, work_dir):
+    run_dir = os.path.join(work_dir, f"{site}-{value}-{time.time_ns()}")
+    metrics_dir = os.path.join(run_dir, 'metrics')
+    # Die Logger der Sites schreiben relativ zum Arbeitsverzeichnis
+    for log_dir in ('WebScraping/derStandard/logfiles', 'Webscraping/Krone/logfiles'):
+        os.makedirs(os.path.join(run_dir, log_dir), exist_ok=True)
+
+    env = dict(os.environ)
+    env.update({
+        'MONGODB_URI': mongo_uri,
+        'DERSTANDARD_FRONTPAGE_URL': server.base_url + SITES['derStandard'][1],
+        'KRONE_FRONTPAGE_URL': server.base_url + SITES['Krone'][1],
+        'SCRAPER_COOKIE_DIR': run_dir,
+        'SCRAPER_METRICS_DIR': metrics_dir,
+        'SCRAPER_ARCHIVE_DIR': '',
+    })
+
+    collection = db[site]
+    seed_collection(collection, site, server.base_url, args.articles)
+    server.reset()
+
+    returncode, wall_seconds = run_scraper(site, value, args, env, run_dir)
+
+    statuses = final_statuses(collection)
+    done = sum(count for status, count in statuses.items() if status != 'None')
+    served = server.take_stats()
+    return {
+        'site': site,
+        'value': value,
+        'returncode': returncode,
+        'wall_seconds': wall_seconds,
+        'articles': args.articles,
+        'done': done,
+        'pages_per_minute': done / wall_seconds * 60 if wall_seconds > 0 else 0.0,
+        'statuses': statuses,
+        'responses': {f"{served_site} {status}": count for (served_site, status), count in sorted(served.items())},
+        'metrics': latest_metrics(metrics_dir, site),
+    }
+
+
+def print_result(result):
+    print(
+        f"{result['site']:12} Wert {result['value']:>4}  {result['done']:5}/{result['articles']} Seiten "
+        f"in {result['wall_seconds']:7.1f}s  {result['pages_per_minute']:8.1f} Seiten/min  "
+        f"Exit {result['returncode']}"
+    )
+    print(f"{'':12} Status {result['statuses']}  Antworten {result['responses']}")
+    metrics = result['metrics']
+    if metrics:
+        for stage, values in metrics['stages'].items():
+            print(f"{'':12} Stufe {stage:12} p50 {values['p50']:6.2f}s  p95 {values['p95']:6.2f}s  max {values['max']:6.2f}s")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--sites', nargs='+', choices=sorted(SITES), default=sorted(SITES))
+    parser.add_argument('--articles', type=int, default=200)
+    parser.add_argument('--n', type=int, nargs='+', default=[10], help="Prozesse (derStandard, Krone)")
+    parser.add_argument('--concurrency', type=int, nargs='+', default=[20], help="parallele Requests (ORF)")
+    parser.add_argument('--max-conns', type=int, default=20, help="parallele Requests im HTTP-Fast-Path (derStandard)")
+    parser.add_argument('--repeats', type=int, default=1)
+    parser.add_argument('--timeout', type=int, default=3600, help="Sekunden pro Lauf")
+    parser.add_argument('--mongo-uri', default=None)
+    parser.add_argument('--output', default=None, help="Ergebnisse zusätzlich als JSON speichern")
+    add_config_arguments(parser)
+    args = parser.parse_args()
+
+    results = []
+    with local_mongodb(args.mongo_uri) as mongo_uri, \
+            StandInServer(config_from_args(args)) as server, \
+            tempfile.TemporaryDirectory(prefix='load-test-') as work_dir:
+        db = MongoClient(mongo_uri)['newspapers']
+        print(f"Ersatz-Server {server.base_url}, MongoDB {mongo_uri}")
+        for site in args.sites:
+            values = args.concurrency if site == 'ORF' else args.n
+            for value in values:
+                for _ in range(args.repeats):
+                    result = run_once(site, value, args, server, db, mongo_uri, work_dir)
+                    print_result(result)
+                    results.append(result)
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump({'config': config_from_args(args)._asdict(), 'results': results}, f, indent=2, ensure_ascii=False)
+
+
+if __name__ == "__main__":
+    main()
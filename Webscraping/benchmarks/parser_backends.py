@@ -0,0 +1,135 @@
+"""
+Vergleicht die Parser-Backends (html.parser, lxml) und das Teil-Parsen per
+SoupStrainer für alle Site-Parser:
+  - Äquivalenz: jede Variante muss dasselbe liefern wie html.parser ohne Strainer
+  - Geschwindigkeit: Parse- und Extraktionszeit pro Seite
+
+Aufruf: python Webscraping/benchmarks/parser_backends.py PAGES_DIR [--repeats 5]
+PAGES_DIR enthält je Site einen Unterordner mit HTML-Dateien:
+  PAGES_DIR/derStandard/*.html, PAGES_DIR/Krone/*.html, PAGES_DIR/ORF/*.html
+"""
+import os
+import sys
+import time
+import logging
+import argparse
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..")))
+from common.html_parser import make_soup
+from common.site_modules import load_site_module
+
+BASELINE_BACKEND = 'html.parser'
+
+logger = logging.getLogger(__name__)
+
+
+def available_backends():
+    backends = [BASELINE_BACKEND]
+    try:
+        import lxml  # noqa: F401
+        backends.append('lxml')
+    except ImportError:
+        pass
+    return backends
+
+
+def derstandard_static(parsers, soup):
+    return parsers.parse_static_article(soup, "benchmark", logger)
+
+
+def derstandard_old_forum(parsers, soup):
+    return parsers.parse_forum_comments_alternative(soup, logger)
+
+
+def krone_article(parsers, soup):
+    return parsers.parse_krone_article(soup, logger)
+
+
+def krone_comments(parsers, soup):
+    return parsers.parse_krone_nested_comments(soup.find_all("div", class_=parsers.COMMENT_WRAPPER_CLASS))
+
+
+def orf_article(scraper, soup):
+    return scraper.scrape_article(soup) or scraper.scrape_article_alternative(soup)
+
+
+# Site -> (Modul, [(Extraktor-Name, Funktion(modul, soup), Name des Strainers im Modul oder None)])
+EXTRACTORS = {
+    'derStandard': ('parsers', [
+        ('parse_static_article', derstandard_static, None),
+        ('parse_forum_comments_alternative', derstandard_old_forum, 'OLD_FORUM_STRAINER'),
+    ]),
+    'Krone': ('parsers', [
+        ('parse_krone_article', krone_article, None),
+        ('parse_krone_nested_comments', krone_comments, 'COMMENTS_STRAINER'),
+    ]),
+    'ORF': ('scraper', [
+        ('scrape_article', orf_article, 'ARTICLE_STRAINER'),
+    ]),
+}
+
+
+def run_extractor(module, extractor, html, backend, strainer):
+    start = time.perf_counter()
+    soup = make_soup(html, parse_only=strainer, backend=backend)
+    result = extractor(module, soup)
+    return result, time.perf_counter() - start
+
+
+def benchmark_site(site, pages, repeats):
+    module_name, extractors = EXTRACTORS[site]
+    module = load_site_module(site, module_name)
+
+    for extractor_name, extractor, strainer_name in extractors:
+        variants = [(backend, None) for backend in available_backends()]
+        if strainer_name:
+            variants += [(backend, strainer_name) for backend in available_backends()]
+
+        baseline = [run_extractor(module, extractor, html, BASELINE_BACKEND, None)[0] for html in pages]
+
+        for backend, strainer_name in variants:
+            strainer = getattr(module, strainer_name) if strainer_name else None
+            seconds = 0.0
+            identical = 0
+            for html, expected in zip(pages, baseline):
+                best = None
+                for _ in range(repeats):
+                    result, elapsed = run_extractor(module, extractor, html, backend, strainer)
+                    best = elapsed if best is None else min(best, elapsed)
+                seconds += best
+                identical += result == expected
+
+            variant = f"{backend}{' + ' + strainer_name if strainer_name else ''}"
+            print(
+                f"{site:12} {extractor_name:34} {variant:32} "
+                f"{seconds / len(pages) * 1000:8.2f} ms/Seite   identisch {identical}/{len(pages)}"
+            )
+
+
+def load_pages(pages_dir, site):
+    site_dir = os.path.join(pages_dir, site)
+    if not os.path.isdir(site_dir):
+        return []
+    pages = []
+    for file_name in sorted(os.listdir(site_dir)):
+        if file_name.endswith('.html'):
+            with open(os.path.join(site_dir, file_name), encoding='utf-8') as f:
+                pages.append(f.read())
+    return pages
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('pages_dir')
+    parser.add_argument('--repeats', type=int, default=5)
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.CRITICAL)
+    for site in EXTRACTORS:
+        pages = load_pages(args.pages_dir, site)
+        if pages:
+            benchmark_site(site, pages, args.repeats)
+
+
+if __name__ == "__main__":
+    main()
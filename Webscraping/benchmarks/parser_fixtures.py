@@ -0,0 +1,328 @@
+"""
+Offline-Fixtures für die Site-Parser: gespeicherte Seiten je Layout-Variante
+mit erwarteten Ergebnissen (Golden Files), ohne Browser und Netzwerk.
+
+  record SITE [--per-variant 5] [--since 2025-01-01]
+      übernimmt Seiten aus dem Roh-HTML-Archiv (common/page_archive.py) nach
+      fixtures/<site>/<variante>/ und schreibt die aktuellen Parser-Ergebnisse
+      als <name>.golden.json daneben (vor dem Einchecken prüfen!)
+  check [SITE] [--update] [--backend lxml] [--no-strainer]
+      vergleicht die Parser-Ergebnisse mit den Golden Files
+      (--update übernimmt gewollte Änderungen in die Golden Files); Backend
+      und Strainer sind wählbar, die Golden Files gelten für alle Varianten
+  bench [SITE] [--repeats 20]
+      misst Seiten/s und Speicher (tracemalloc) je Parser
+
+Aufruf: python Webscraping/benchmarks/parser_fixtures.py check
+        python -m unittest Webscraping/benchmarks/test_parser_fixtures.py
+"""
+import os
+import sys
+import json
+import time
+import hashlib
+import logging
+import argparse
+import datetime
+import tracemalloc
+from collections import namedtuple
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..")))
+from common.html_parser import make_soup
+from common.page_archive import latest_records, read_record
+from common.site_modules import load_site_module
+
+FIXTURES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'fixtures')
+
+Fixture = namedtuple('Fixture', ['site', 'variant', 'name', 'url', 'html', 'comments_html'])
+
+logger = logging.getLogger(__name__)
+
+
+def soup_factory(backend=None, strainers=True):
+    """
+    Funktion(html, strainer) -> Soup mit 'backend' (None = konfiguriertes Backend).
+    Den Strainer des Produktivcodes nur mit strainers=True anwenden, sonst wird
+    die ganze Seite geparst.
+    """
+    def parse(html, strainer=None):
+        return make_soup(html, parse_only=strainer if strainers else None, backend=backend)
+    return parse
+
+
+# Parser je Site: Funktion(modul, fixture, parse) -> Ergebnis, 'parse' aus
+# soup_factory. Jeder Aufruf parst die Seite neu, weil einzelne Parser die Soup
+# verändern (decompose).
+
+def derstandard_paragraphs(parsers, fixture, parse):
+    return parsers.get_paragraph_texts(parse(fixture.html), fixture.url, logger)
+
+
+def derstandard_datetime(parsers, fixture, parse):
+    return parsers.get_article_datetime(parse(fixture.html), logger)
+
+
+def derstandard_old_forum(parsers, fixture, parse):
+    # extract_forum_comments_alternative ohne Driver
+    return parsers.parse_forum_comments_alternative(parse(fixture.html, parsers.OLD_FORUM_STRAINER), logger)
+
+
+def krone_article(parsers, fixture, parse):
+    return parsers.parse_krone_article(parse(fixture.html), logger)
+
+
+def krone_comments(parsers, fixture, parse):
+    if fixture.comments_html is None:
+        return None
+    soup = parse(fixture.comments_html, parsers.COMMENTS_STRAINER)
+    return [parsers.extract_comment_data(wrapper) for wrapper in soup.find_all("div", class_=parsers.COMMENT_WRAPPER_CLASS)]
+
+
+def orf_article(scraper, fixture, parse):
+    return scraper.scrape_article(parse(fixture.html, scraper.ARTICLE_STRAINER))
+
+
+def orf_article_alternative(scraper, fixture, parse):
+    return scraper.scrape_article_alternative(parse(fixture.html, scraper.ARTICLE_STRAINER))
+
+
+# Site -> (Modul, [(Parser-Name, Funktion)])
+PARSERS = {
+    'derStandard': ('parsers', [
+        ('get_paragraph_texts', derstandard_paragraphs),
+        ('get_article_datetime', derstandard_datetime),
+        ('extract_forum_comments_alternative', derstandard_old_forum),
+    ]),
+    'Krone': ('parsers', [
+        ('parse_krone_article', krone_article),
+        ('extract_comment_data', krone_comments),
+    ]),
+    'ORF': ('scraper', [
+        ('scrape_article', orf_article),
+        ('scrape_article_alternative', orf_article_alternative),
+    ]),
+}
+
+
+# Layout-Variante einer Seite, bestimmt beim Aufnehmen
+
+def derstandard_variant(module, fixture):
+    article_data, old_design = module.parse_static_article(make_soup(fixture.html), fixture.url, logger)
+    if old_design:
+        return 'old-forum'
+    return 'forum' if article_data['features.posting_count'] else 'no-forum'
+
+
+def krone_variant(module, fixture):
+    article_data = module.parse_krone_article(make_soup(fixture.html), logger)
+    if article_data.get('features.paywall'):
+        return 'paywall'
+    return 'comments' if fixture.comments_html else 'article'
+
+
+def orf_variant(module, fixture):
+    soup = make_soup(fixture.html)
+    if soup.find('div', id='ss-shunter'):
+        return 'shunter'
+    if soup.find('div', id='ss-storyText'):
+        return 'storytext'
+    return 'unknown'
+
+
+VARIANTS = {
+    'derStandard': derstandard_variant,
+    'Krone': krone_variant,
+    'ORF': orf_variant,
+}
+
+
+def normalize(result):
+    """Ergebnis JSON-vergleichbar machen (datetime als ISO-String, Tupel als Listen)."""
+    return json.loads(json.dumps(result, default=lambda o: o.isoformat() if hasattr(o, 'isoformat') else str(o)))
+
+
+def available_backends():
+    """html.parser und, falls installiert, lxml."""
+    backends = ['html.parser']
+    try:
+        import lxml  # noqa: F401
+        backends.append('lxml')
+    except ImportError:
+        pass
+    return backends
+
+
+def run_parsers(site, fixture, backend=None, strainers=True):
+    module_name, parsers = PARSERS[site]
+    module = load_site_module(site, module_name)
+    parse = soup_factory(backend, strainers)
+    return {name: normalize(parser(module, fixture, parse)) for name, parser in parsers}
+
+
+def fixture_paths(site, variant, name):
+    base = os.path.join(FIXTURES_DIR, site, variant, name)
+    return base + '.html', base + '.comments.html', base + '.golden.json'
+
+
+def load_fixtures(site):
+    site_dir = os.path.join(FIXTURES_DIR, site)
+    if not os.path.isdir(site_dir):
+        return []
+    fixtures = []
+    for variant in sorted(os.listdir(site_dir)):
+        variant_dir = os.path.join(site_dir, variant)
+        for file_name in sorted(os.listdir(variant_dir)):
+            if not file_name.endswith('.golden.json'):
+                continue
+            name = file_name[:-len('.golden.json')]
+            html_path, comments_path, golden_path = fixture_paths(site, variant, name)
+            with open(golden_path, encoding='utf-8') as f:
+                url = json.load(f)['url']
+            with open(html_path, encoding='utf-8') as f:
+                html = f.read()
+            comments_html = None
+            if os.path.exists(comments_path):
+                with open(comments_path, encoding='utf-8') as f:
+                    comments_html = f.read()
+            fixtures.append(Fixture(site, variant, name, url, html, comments_html))
+    return fixtures
+
+
+def write_golden(fixture, results):
+    _, _, golden_path = fixture_paths(fixture.site, fixture.variant, fixture.name)
+    with open(golden_path, 'w', encoding='utf-8') as f:
+        json.dump({'url': fixture.url, 'results': results}, f, indent=2, ensure_ascii=False)
+
+
+def record(site, per_variant, since):
+    module_name, _ = PARSERS[site]
+    module = load_site_module(site, module_name)
+    existing = load_fixtures(site)
+    recorded = {fixture.url for fixture in existing}
+    counts = {}
+    for fixture in existing:
+        counts[fixture.variant] = counts.get(fixture.variant, 0) + 1
+
+    for url, parts in latest_records(site, since=since).items():
+        if 'page' not in parts or url in recorded:
+            continue
+        comments_html = read_record(site, parts['comments']) if 'comments' in parts else None
+        fixture = Fixture(site, None, None, url, read_record(site, parts['page']), comments_html)
+        variant = VARIANTS[site](module, fixture)
+        if counts.get(variant, 0) >= per_variant:
+            continue
+        counts[variant] = counts.get(variant, 0) + 1
+
+        fixture = fixture._replace(variant=variant, name=hashlib.sha1(url.encode('utf-8')).hexdigest()[:12])
+        html_path, comments_path, _ = fixture_paths(site, variant, fixture.name)
+        os.makedirs(os.path.dirname(html_path), exist_ok=True)
+        with open(html_path, 'w', encoding='utf-8') as f:
+            f.write(fixture.html)
+        if comments_html is not None:
+            with open(comments_path, 'w', encoding='utf-8') as f:
+                f.write(comments_html)
+        write_golden(fixture, run_parsers(site, fixture))
+
+    print(f"{site}: Fixtures je Variante {counts}")
+
+
+def check(sites, update, backend=None, strainers=True):
+    failed = 0
+    total = 0
+    for site in sites:
+        for fixture in load_fixtures(site):
+            total += 1
+            _, _, golden_path = fixture_paths(site, fixture.variant, fixture.name)
+            with open(golden_path, encoding='utf-8') as f:
+                expected = json.load(f)['results']
+            results = run_parsers(site, fixture, backend, strainers)
+            differing = [name for name in results if results[name] != expected.get(name)]
+            if differing:
+                failed += 1
+                print(f"ABWEICHUNG {site}/{fixture.variant}/{fixture.name} ({fixture.url}): {', '.join(differing)}")
+                if update:
+                    write_golden(fixture, results)
+    if total == 0:
+        # Ohne Fixtures würde ein kaputter Parser unbemerkt "bestehen"
+        print(f"Keine Fixtures unter {FIXTURES_DIR} für {', '.join(sites)} gefunden")
+        return False
+    print(f"{total - failed}/{total} Fixtures entsprechen den Golden Files" + (" (aktualisiert)" if update and failed else ""))
+    return failed == 0
+
+
+def bench(sites, repeats):
+    for site in sites:
+        fixtures = load_fixtures(site)
+        if not fixtures:
+            continue
+        module_name, parsers = PARSERS[site]
+        module = load_site_module(site, module_name)
+        parse = soup_factory()
+
+        for name, parser in parsers:
+            for variant in sorted({f.variant for f in fixtures}):
+                pages = [f for f in fixtures if f.variant == variant]
+
+                # Geschwindigkeit: beste von 'repeats' Wiederholungen je Seite
+                seconds = 0.0
+                for fixture in pages:
+                    best = None
+                    for _ in range(repeats):
+                        start = time.perf_counter()
+                        parser(module, fixture, parse)
+                        elapsed = time.perf_counter() - start
+                        best = elapsed if best is None else min(best, elapsed)
+                    seconds += best
+
+                # Speicher: Spitze und Anzahl Allokationen je Seite (eigener Durchlauf, tracemalloc bremst)
+                peak = 0
+                blocks = 0
+                for fixture in pages:
+                    tracemalloc.start()
+                    before = tracemalloc.take_snapshot()
+                    parser(module, fixture, parse)
+                    after = tracemalloc.take_snapshot()
+                    peak += tracemalloc.get_traced_memory()[1]
+                    tracemalloc.stop()
+                    blocks += sum(max(stat.count_diff, 0) for stat in after.compare_to(before, 'lineno'))
+
+                print(
+                    f"{site:12} {name:36} {variant:12} {len(pages):3} Seiten "
+                    f"{len(pages) / seconds:9.1f} Seiten/s   "
+                    f"Spitze {peak / len(pages) / 1024:8.0f} KB/Seite   "
+                    f"{blocks / len(pages):8.0f} Blöcke/Seite"
+                )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    record_parser = commands.add_parser('record')
+    record_parser.add_argument('site', choices=sorted(PARSERS))
+    record_parser.add_argument('--per-variant', type=int, default=5)
+    record_parser.add_argument('--since', type=datetime.datetime.fromisoformat, default=None)
+
+    check_parser = commands.add_parser('check')
+    check_parser.add_argument('site', nargs='?', choices=sorted(PARSERS))
+    check_parser.add_argument('--update', action='store_true')
+    check_parser.add_argument('--backend', choices=available_backends(), default=None)
+    check_parser.add_argument('--no-strainer', dest='strainers', action='store_false')
+
+    bench_parser = commands.add_parser('bench')
+    bench_parser.add_argument('site', nargs='?', choices=sorted(PARSERS))
+    bench_parser.add_argument('--repeats', type=int, default=20)
+
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.CRITICAL)
+
+    if args.command == 'record':
+        record(args.site, args.per_variant, args.since)
+    elif args.command == 'check':
+        sys.exit(0 if check([args.site] if args.site else list(PARSERS), args.update, args.backend, args.strainers) else 1)
+    else:
+        bench([args.site] if args.site else list(PARSERS), args.repeats)
+
+
+if __name__ == "__main__":
+    main()
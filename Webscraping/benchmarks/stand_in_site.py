@@ -0,0 +1,441 @@
+"""
+Lokaler Ersatz für derStandard, Krone und ORF, damit die Scraper ohne die
+echten Seiten unter Last getestet werden können (siehe load_test.py).
+
+Die Seiten sind synthetisch, verwenden aber dieselben Selektoren wie die
+Parser: derStandard mit Reaktionen und Forum im Shadow DOM (erst nach
+'render_delay_ms' per JavaScript gerendert) und Consent-Dialog im iFrame,
+Krone mit Consent-Banner und Coral-Kommentaren im iFrame, ORF in beiden
+Layouts (ss-shunter, ss-storyText). Der Inhalt hängt nur von der Artikel-ID
+ab, Latenz, Fehler (HTTP 500) und Drosselung (HTTP 429) sind einstellbar.
+
+  /derstandard/YYYY/MM/DD          Startseite mit Consent-iFrame
+  /derstandard/consent             Consent-Dialog
+  /derstandard/story/<id>/<slug>   Artikel
+  /krone/                          Startseite mit Consent-Banner
+  /krone/artikel/<id>              Artikel
+  /krone/comments/<id>             Kommentare (iFrame)
+  /orf/stories/<id>/               Artikel
+
+Aufruf: python Webscraping/benchmarks/stand_in_site.py --port 8765 --latency-ms 150
+"""
+import html
+import random
+import asyncio
+import argparse
+import datetime
+import threading
+from collections import Counter, namedtuple
+from aiohttp import web
+
+# latency_ms/jitter_ms:  Antwortzeit (Normalverteilung) pro Request
+# failure_rate:          Anteil der Artikel-Requests mit HTTP 500
+# throttle_rate:         Anteil der Artikel-Requests mit HTTP 429 (Retry-After: 1)
+# render_delay_ms:       Verzögerung, bis Shadow DOM bzw. Kommentar-iFrame erscheinen
+# forum_rate:            Anteil der Artikel mit Postings (derStandard, Krone)
+# paywall_rate:          Anteil der Krone-Artikel hinter der Paywall
+# postings:              Postings pro Artikel mit Forum
+# padding_kb:            zusätzliches Navigations-Markup pro Seite (echte Seiten sind deutlich größer)
+StandInConfig = namedtuple('StandInConfig', [
+    'latency_ms', 'jitter_ms', 'failure_rate', 'throttle_rate', 'render_delay_ms',
+    'forum_rate', 'paywall_rate', 'postings', 'padding_kb', 'seed',
+], defaults=[150, 50, 0.0, 0.0, 300, 0.7, 0.1, 40, 200, 0])
+
+# Routen, auf die Latenz-Streuung, Fehler und Drosselung angewendet werden (Consent bleibt stabil)
+ARTICLE_ROUTES = {'derstandard-story', 'krone-article', 'krone-comments', 'orf-story'}
+
+WORDS = (
+    "Regierung Inflation Zinsen Nationalbank Wien Budget Bericht Experten Woche Prognose "
+    "Haushalte Preise Energie Löhne Markt Analyse Studie Wirtschaft Verbraucher Entwicklung "
+    "Österreich Euro Quartal Anstieg Rückgang deutlich erneut laut aktuell weiterhin stark"
+).split()
+KICKERS = ["Wirtschaft", "Inland", "International", "Finanzen", "Immobilien"]
+REACTIONS = ["Zustimmung", "Ablehnung", "Überraschung", "Trauer", "Freude"]
+
+
+def words(rng, count):
+    return " ".join(rng.choice(WORDS) for _ in range(count))
+
+
+def sentence(rng, count=12):
+    return html.escape(words(rng, count).capitalize() + ".")
+
+
+def article_rng(site, article_id):
+    return random.Random(f"{site}:{article_id}")
+
+
+def article_datetime(rng):
+    return datetime.datetime(2024, 1, 1, 6, 0) + datetime.timedelta(minutes=rng.randrange(60 * 24 * 365))
+
+
+def padding(config):
+    """Navigations-Markup als Ballast (wird von den Strainern der Parser übersprungen)."""
+    item = '<li><a href="/rubrik/{0}">Rubrik {0}</a></li>'
+    items = []
+    size = 0
+    while size < config.padding_kb * 1024:
+        items.append(item.format(len(items)))
+        size += len(items[-1])
+    return f"<nav><ul>{''.join(items)}</ul></nav>"
+
+
+def page(title, body):
+    return (
+        f'<!DOCTYPE html><html lang="de"><head><meta charset="utf-8">'
+        f'<title>{title}</title></head><body>{body}</body></html>'
+    )
+
+
+SHADOW_ELEMENT_JS = """
+<script>
+function defineShadowElement(tag, templateId, delay) {
+    customElements.define(tag, class extends HTMLElement {
+        connectedCallback() {
+            var host = this;
+            setTimeout(function () {
+                var template = document.getElementById(templateId);
+                host.attachShadow({mode: 'open'}).appendChild(template.content.cloneNode(true));
+            }, delay);
+        }
+    });
+}
+defineShadowElement('dst-community-reactions', 'reactions-template', %(delay)d);
+defineShadowElement('dst-forum', 'forum-template', %(delay)d);
+</script>
+"""
+
+
+# derStandard
+
+async def derstandard_frontpage(request):
+    # Consent-Dialog im iFrame unter /html/body/div/iframe
+    body = (
+        '<div><iframe src="/derstandard/consent" width="600" height="400"></iframe></div>'
+        f'<main><h1>derStandard (lokaler Ersatz)</h1></main>{padding(request.app["config"])}'
+    )
+    return web.Response(text=page("derStandard", body), content_type='text/html')
+
+
+async def derstandard_consent(request):
+    # Button unter /html/body/div[1]/div[2]/div[3]/div[1]/button
+    body = (
+        '<div><div></div><div><div></div><div></div><div><div>'
+        '<button onclick="document.cookie=\'consent=1; path=/; max-age=31536000\'">Einverstanden</button>'
+        '</div></div></div></div>'
+    )
+    return web.Response(text=page("Consent", body), content_type='text/html')
+
+
+def derstandard_posting(rng, posting_id, parent_id, posted_at):
+    return (
+        f'<dst-posting data-postingid="{posting_id}" data-parentpostingid="{parent_id or ""}">'
+        f'<dst-posting--user><button><span><span>{html.escape(rng.choice(WORDS))}{rng.randrange(1000)}</span></span>'
+        f'<div title="{rng.randrange(500)} Follower"></div></button></dst-posting--user>'
+        f'<time data-date="{posted_at.isoformat()}">{posted_at:%d.%m.%Y, %H:%M}</time>'
+        f'<div class="posting--content"><h1>{sentence(rng, 4)}</h1><p>{sentence(rng, 25)}</p></div>'
+        f'<dst-posting--ratinglog positiveratings="{rng.randrange(50)}" negativeratings="{rng.randrange(20)}">'
+        f'</dst-posting--ratinglog></dst-posting>'
+    )
+
+
+def derstandard_forum(rng, article_id, count, published):
+    """Forum wie im neuen Layout: Postings direkt unter main, Antworten in section.thread."""
+    parts = []
+    posting_id = article_id * 1000
+    posted_at = published
+    written = 0
+    while written < count:
+        posting_id += 1
+        posted_at += datetime.timedelta(minutes=rng.randrange(1, 30))
+        parent_id = posting_id
+        parts.append(derstandard_posting(rng, posting_id, None, posted_at))
+        written += 1
+        replies = min(rng.randrange(4), count - written)
+        if replies:
+            thread = []
+            for _ in range(replies):
+                posting_id += 1
+                posted_at += datetime.timedelta(minutes=rng.randrange(1, 10))
+                thread.append(derstandard_posting(rng, posting_id, parent_id, posted_at))
+            parts.append(f'<section class="thread">{"".join(thread)}</section>')
+            written += replies
+    return f'<main class="forum--main">{"".join(parts)}</main>'
+
+
+async def derstandard_article(request):
+    config = request.app['config']
+    article_id = int(request.match_info['article_id'])
+    rng = article_rng('derstandard', article_id)
+    published = article_datetime(rng)
+    title = sentence(rng, 8)
+    postings = config.postings if rng.random() < config.forum_rate else 0
+
+    reactions = ''.join(
+        f'<button><strong>{rng.randrange(100)}</strong><span class="sr-only">{name}</span></button>'
+        for name in REACTIONS
+    )
+    community = (
+        '<dst-community-reactions></dst-community-reactions>'
+        f'<template id="reactions-template"><aside class="reactions"><div class="reactions--buttons">{reactions}</div></aside></template>'
+    )
+    if postings:
+        community += (
+            '<section id="story-community"><div class="story-community-header">'
+            f'<h1>Forum: <span class="js-forum-postingcount">{postings}</span> Postings</h1></div>'
+            '<dst-forum></dst-forum></section>'
+            f'<template id="forum-template">{derstandard_forum(rng, article_id, postings, published)}</template>'
+        )
+    else:
+        community += '<template id="forum-template"></template>'
+
+    paragraphs = ''.join(f'<p>{sentence(rng, 40)}</p>' for _ in range(rng.randrange(5, 15)))
+    body = (
+        f'{padding(config)}<main><article><header>'
+        f'<h2 class="article-kicker">{rng.choice(KICKERS)}</h2>'
+        f'<h1 class="article-title">{title}</h1>'
+        f'<p class="article-subtitle">{sentence(rng, 20)}</p>'
+        f'<div class="article-byline"><div class="article-origins"><span class="simple">{sentence(rng, 2)}</span></div></div>'
+        f'<p class="article-pubdate"><time datetime="{published.isoformat()}">{published:%d.%m.%Y, %H:%M}</time></p>'
+        f'</header><div class="article-body">{paragraphs}</div></article>{community}</main>'
+        + SHADOW_ELEMENT_JS % {'delay': config.render_delay_ms}
+    )
+    return web.Response(text=page(title, body), content_type='text/html')
+
+
+# Krone
+
+async def krone_frontpage(request):
+    # Akzeptieren-Button unter /html/body/div[1]/div/div/div/div/div/div[2]/button[3]
+    body = (
+        '<div id="consent"><div><div><div><div><div>'
+        '<div></div><div><button>Einstellungen</button><button>Ablehnen</button>'
+        '<button onclick="document.cookie=\'consent=1; path=/; max-age=31536000\'; '
+        'document.getElementById(\'consent\').remove()">Akzeptieren</button></div>'
+        '</div></div></div></div></div></div>'
+        f'<main><h1>Krone (lokaler Ersatz)</h1></main>{padding(request.app["config"])}'
+    )
+    return web.Response(text=page("Krone", body), content_type='text/html')
+
+
+async def krone_article(request):
+    config = request.app['config']
+    article_id = int(request.match_info['article_id'])
+    rng = article_rng('krone', article_id)
+    published = article_datetime(rng)
+    title = sentence(rng, 8)
+    paywall = rng.random() < config.paywall_rate
+    postings = config.postings if rng.random() < config.forum_rate else 0
+
+    if paywall:
+        content = '<div id="paywall-content" data-product="paywall"></div>'
+    else:
+        boxes = ''.join(
+            f'<div class="box col-xs-12 c_tinymce"><p>{sentence(rng, 40)}</p></div>'
+            for _ in range(rng.randrange(5, 15))
+        )
+        content = f'<div class="box col-xs-12 c_content" data-nodeid="{article_id}-8d883f15">{boxes}</div>'
+
+    comments = ''
+    if postings:
+        # Coral lädt das iFrame erst nachträglich in #coral-container
+        comments = (
+            '<div id="coral-container"></div><script>setTimeout(function () {'
+            'var iframe = document.createElement("iframe");'
+            f'iframe.src = "/krone/comments/{article_id}";'
+            'document.getElementById("coral-container").appendChild(iframe);'
+            f'}}, {config.render_delay_ms});</script>'
+        )
+
+    body = (
+        f'{padding(config)}'
+        f'<div class="box col-xs-12 c_breadcrumbs marginbottom-30" data-nodeid="{article_id}-9b995933">'
+        f'<a class="bc__link bc__link--shortened" href="/">{rng.choice(KICKERS)}</a>'
+        f'<div class="bc__date">{published:%d.%m.%Y %H:%M}</div></div>'
+        f'<div class="box col-xs-12 c_title" data-nodeid="{article_id}-94f40e7b"><h1>{title}</h1></div>'
+        f'<div class="box col-xs-12 c_lead" data-nodeid="{article_id}-a75a93ac"><p>{sentence(rng, 20)}</p></div>'
+        f'<div class="box col-xs-12 c_authorline" data-nodeid="{article_id}-ac9231da">'
+        f'<div class="al__author">{sentence(rng, 2)}</div></div>'
+        f'{content}<span class="stb__comment-count js-krn-comments-count">{postings}</span>{comments}'
+    )
+    return web.Response(text=page(title, body), content_type='text/html')
+
+
+async def krone_comments(request):
+    config = request.app['config']
+    article_id = int(request.match_info['article_id'])
+    rng = article_rng('krone-comments', article_id)
+    posted_at = article_datetime(rng)
+    wrappers = []
+    level = 0
+    for i in range(config.postings):
+        # Ebene 0 beginnt einen neuen Thread, sonst höchstens eine Ebene tiefer als zuvor
+        level = 0 if level == 0 and rng.random() < 0.5 else rng.randrange(0, level + 2)
+        posted_at += datetime.timedelta(minutes=rng.randrange(1, 30))
+        wrappers.append(
+            f'<div id="comment-{article_id}-{i}" class="talk-stream-comment-wrapper-level-{level}">'
+            f'<span class="AuthorName__name___3O4jF">{html.escape(rng.choice(WORDS))}{rng.randrange(1000)}</span>'
+            f'<span class="TimeAgo__timeago___3aHze" title="{posted_at:%d.%m.%Y, %H:%M}">vor {i + 1} Std.</span>'
+            f'<span class="Linkify">{sentence(rng, 25)}</span>'
+            f'<span class="talk-plugin-upvote-count">{rng.randrange(50)}</span>'
+            f'<span class="talk-plugin-downvote-count">{rng.randrange(20)}</span></div>'
+        )
+    return web.Response(text=page("Kommentare", ''.join(wrappers)), content_type='text/html')
+
+
+# ORF
+
+async def orf_story(request):
+    config = request.app['config']
+    article_id = int(request.match_info['article_id'])
+    rng = article_rng('orf', article_id)
+    published = article_datetime(rng)
+    title = sentence(rng, 8)
+    paragraphs = ''.join(f'<p>{sentence(rng, 40)}</p>' for _ in range(rng.randrange(5, 15)))
+
+    if rng.random() < 0.8:
+        article = (
+            f'<div id="ss-shunter"><h1 class="story-lead-headline">{title}</h1>'
+            f'<p class="story-lead-text"><strong>{sentence(rng, 20)}</strong></p>'
+            f'<div class="byline">{sentence(rng, 2)}</div>'
+            f'<div class="story-meta-dates"><div aria-hidden="true" class="print-only">{published:%d.%m.%Y %H.%M}</div></div>'
+            f'<div class="story-story">{paragraphs}</div></div>'
+        )
+    else:
+        article = (
+            f'<div id="ss-storyText"><h1>{title}</h1>'
+            f'<p class="teaser"><strong>{sentence(rng, 20)}</strong></p>'
+            f'<p class="date">Publiziert am {published:%d.%m.%Y}</p>{paragraphs}</div>'
+        )
+    return web.Response(text=page(title, padding(config) + article), content_type='text/html')
+
+
+@web.middleware
+async def simulate_network(request, handler):
+    """Latenz, Fehler und Drosselung wie bei einem ausgelasteten Server; zählt die Antworten."""
+    app = request.app
+    config = app['config']
+    rng = app['rng']
+    site = request.path.strip('/').split('/')[0]
+
+    delay = max(0.0, rng.gauss(config.latency_ms, config.jitter_ms)) / 1000
+    if delay:
+        await asyncio.sleep(delay)
+
+    if request.match_info.route.name in ARTICLE_ROUTES:
+        roll = rng.random()
+        if roll < config.throttle_rate:
+            app['stats'][(site, 429)] += 1
+            return web.Response(status=429, headers={'Retry-After': '1'}, text="Too Many Requests")
+        if roll < config.throttle_rate + config.failure_rate:
+            app['stats'][(site, 500)] += 1
+            return web.Response(status=500, text="Internal Server Error")
+
+    try:
+        response = await handler(request)
+    except web.HTTPException as e:
+        app['stats'][(site, e.status)] += 1
+        raise
+    app['stats'][(site, response.status)] += 1
+    return response
+
+
+def make_app(config):
+    app = web.Application(middlewares=[simulate_network])
+    app['config'] = config
+    app['rng'] = random.Random(config.seed)
+    app['stats'] = Counter()
+    app.router.add_get('/derstandard/consent', derstandard_consent, name='derstandard-consent')
+    app.router.add_get(r'/derstandard/{year:\d{4}}/{month:\d{2}}/{day:\d{2}}', derstandard_frontpage, name='derstandard-frontpage')
+    app.router.add_get(r'/derstandard/story/{article_id:\d+}/{slug}', derstandard_article, name='derstandard-story')
+    app.router.add_get('/krone/', krone_frontpage, name='krone-frontpage')
+    app.router.add_get(r'/krone/artikel/{article_id:\d+}', krone_article, name='krone-article')
+    app.router.add_get(r'/krone/comments/{article_id:\d+}', krone_comments, name='krone-comments')
+    app.router.add_get(r'/orf/stories/{article_id:\d+}/', orf_story, name='orf-story')
+    return app
+
+
+class StandInServer:
+    """
+    Startet den Ersatz in einem Hintergrund-Thread (eigene Event-Loop), damit
+    der Lasttest im selben Prozess die Zähler der Antworten auslesen kann.
+
+    Verwendung:
+        with StandInServer(StandInConfig(latency_ms=200)) as server:
+            server.base_url  # z.B. http://127.0.0.1:41234
+    """
+
+    def __init__(self, config, host='127.0.0.1', port=0):
+        self.app = make_app(config)
+        self.host = host
+        self.port = port
+        self.loop = asyncio.new_event_loop()
+        self.runner = web.AppRunner(self.app, access_log=None)
+        self.started = threading.Event()
+        self.thread = threading.Thread(target=self._serve, daemon=True)
+
+    def _serve(self):
+        asyncio.set_event_loop(self.loop)
+        self.loop.run_until_complete(self.runner.setup())
+        site = web.TCPSite(self.runner, self.host, self.port)
+        self.loop.run_until_complete(site.start())
+        self.port = self.runner.addresses[0][1]
+        self.started.set()
+        self.loop.run_forever()
+        self.loop.run_until_complete(self.runner.cleanup())
+        self.loop.close()
+
+    @property
+    def base_url(self):
+        return f"http://{self.host}:{self.port}"
+
+    def reset(self):
+        """Vor jedem Lauf: gleiche Zufallsfolge für Latenz und Fehler, Zähler auf 0."""
+        self.app['rng'].seed(self.app['config'].seed)
+        self.app['stats'] = Counter()
+
+    def take_stats(self):
+        """Antworten pro (Site, HTTP-Status) seit dem letzten Aufruf."""
+        stats, self.app['stats'] = self.app['stats'], Counter()
+        return stats
+
+    def __enter__(self):
+        self.thread.start()
+        self.started.wait()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.loop.call_soon_threadsafe(self.loop.stop)
+        self.thread.join()
+
+
+def add_config_arguments(parser):
+    """Gemeinsame Optionen für stand_in_site.py und load_test.py."""
+    defaults = StandInConfig()
+    parser.add_argument('--latency-ms', type=float, default=defaults.latency_ms)
+    parser.add_argument('--jitter-ms', type=float, default=defaults.jitter_ms)
+    parser.add_argument('--failure-rate', type=float, default=defaults.failure_rate)
+    parser.add_argument('--throttle-rate', type=float, default=defaults.throttle_rate)
+    parser.add_argument('--render-delay-ms', type=int, default=defaults.render_delay_ms)
+    parser.add_argument('--forum-rate', type=float, default=defaults.forum_rate)
+    parser.add_argument('--paywall-rate', type=float, default=defaults.paywall_rate)
+    parser.add_argument('--postings', type=int, default=defaults.postings)
+    parser.add_argument('--padding-kb', type=int, default=defaults.padding_kb)
+    parser.add_argument('--seed', type=int, default=defaults.seed)
+
+
+def config_from_args(args):
+    return StandInConfig(**{field: getattr(args, field) for field in StandInConfig._fields})
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8765)
+    add_config_arguments(parser)
+    args = parser.parse_args()
+    web.run_app(make_app(config_from_args(args)), host=args.host, port=args.port)
+
+
+if __name__ == "__main__":
+    main()
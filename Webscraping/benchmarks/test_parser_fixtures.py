@@ -0,0 +1,63 @@
+"""
+Prüft die Site-Parser gegen die eingecheckten Fixtures und Golden Files
+(siehe parser_fixtures.py), ohne Browser, Netzwerk und Datenbank.
+
+Aufruf: python -m unittest Webscraping/benchmarks/test_parser_fixtures.py
+"""
+import os
+import sys
+import logging
+import unittest
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+import parser_fixtures
+
+
+class ParserFixturesTest(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        logging.disable(logging.CRITICAL)
+
+    @classmethod
+    def tearDownClass(cls):
+        logging.disable(logging.NOTSET)
+
+    def test_every_variant_has_fixtures(self):
+        for site in parser_fixtures.PARSERS:
+            with self.subTest(site=site):
+                variants = {fixture.variant for fixture in parser_fixtures.load_fixtures(site)}
+                self.assertTrue(variants, f"Keine Fixtures für {site}")
+                self.assertNotIn('unknown', variants)
+
+    def test_parsers_match_golden_files(self):
+        for site in parser_fixtures.PARSERS:
+            with self.subTest(site=site):
+                self.assertTrue(parser_fixtures.check([site], update=False))
+
+    def test_backends_and_strainers_match_golden_files(self):
+        # Dieselben Golden Files für jedes installierte Backend, mit und ohne Strainer
+        # (lxml wird ohne Installation ausgelassen, siehe available_backends)
+        for backend in parser_fixtures.available_backends():
+            for strainers in (True, False):
+                for site in parser_fixtures.PARSERS:
+                    with self.subTest(backend=backend, strainers=strainers, site=site):
+                        self.assertTrue(parser_fixtures.check([site], update=False, backend=backend, strainers=strainers))
+
+    @unittest.skipUnless('lxml' in parser_fixtures.available_backends(), "lxml nicht installiert")
+    def test_lxml_backend(self):
+        for site in parser_fixtures.PARSERS:
+            with self.subTest(site=site):
+                self.assertTrue(parser_fixtures.check([site], update=False, backend='lxml'))
+
+    def test_check_fails_without_fixtures(self):
+        fixtures_dir = parser_fixtures.FIXTURES_DIR
+        parser_fixtures.FIXTURES_DIR = os.path.join(fixtures_dir, 'nicht-vorhanden')
+        try:
+            self.assertFalse(parser_fixtures.check(list(parser_fixtures.PARSERS), update=False))
+        finally:
+            parser_fixtures.FIXTURES_DIR = fixtures_dir
+
+
+if __name__ == "__main__":
+    unittest.main()
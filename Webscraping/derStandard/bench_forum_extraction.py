@@ -0,0 +1,67 @@
+"""
+Vergleicht extract_forum_comments_normal (mehrere WebDriver-Aufrufe pro Posting)
+mit extract_forum_comments_js (ein execute_script-Aufruf pro Forum).
+
+Aufruf: python Webscraping/derStandard/bench_forum_extraction.py URL [URL ...]
+"""
+import os
+import sys
+import time
+
+from driver import configure_driver
+from logger_setup import setup_logger, close_logger
+from parsers import extract_forum_comments_normal, extract_forum_comments_js
+from scraper import FORUM_READY
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..")))
+from common.page_readiness import wait_for_page
+
+EXTRACTORS = [
+    ('normal', extract_forum_comments_normal),
+    ('js', extract_forum_comments_js),
+]
+
+
+def benchmark_url(driver, url, logger, repeats=3):
+    """Misst die beste von 'repeats' Laufzeiten je Extraktor und prüft, ob beide dasselbe liefern."""
+    driver.get(url)
+    wait_for_page(driver, [FORUM_READY])
+
+    timings = {}
+    results = {}
+    for name, extractor in EXTRACTORS:
+        for _ in range(repeats):
+            start = time.perf_counter()
+            comments, _ = extractor(driver, logger)
+            elapsed = time.perf_counter() - start
+            timings[name] = min(elapsed, timings.get(name, elapsed))
+        results[name] = comments
+
+    identical = results['normal'] == results['js']
+    logger.info(
+        f"{url}: {len(results['js'])} Threads, normal {timings['normal']:.3f}s, js {timings['js']:.3f}s, "
+        f"Faktor {timings['normal'] / timings['js']:.1f}x, identisch: {identical}"
+    )
+    return timings
+
+
+def main(urls):
+    logger = setup_logger(log_file='bench_forum_extraction.log')
+    driver = configure_driver(headless=True)
+    totals = {name: 0.0 for name, _ in EXTRACTORS}
+    try:
+        for url in urls:
+            for name, seconds in benchmark_url(driver, url, logger).items():
+                totals[name] += seconds
+        if urls:
+            logger.info(
+                f"Gesamt über {len(urls)} Seiten: normal {totals['normal']:.2f}s, js {totals['js']:.2f}s, "
+                f"Faktor {totals['normal'] / totals['js']:.1f}x"
+            )
+    finally:
+        driver.quit()
+        close_logger(logger)
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
@@ -1,6 +1,7 @@
+import os
 import socket
 
-# Konfigurationen
-CHROMEDRIVER_PATH = "/usr/bin/chromedriver" if socket.gethostname() == "raspberrypi" else "chromedriver.exe"
-FRONTPAGE_URL = "https://www.derstandard.at/"
+# Konfigurationen (per Umgebungsvariable überschreibbar, z.B. für Webscraping/benchmarks/load_test.py)
+CHROMEDRIVER_PATH = os.getenv("CHROMEDRIVER_PATH", "/usr/bin/chromedriver" if socket.gethostname() == "raspberrypi" else "chromedriver.exe")
+FRONTPAGE_URL = os.getenv("DERSTANDARD_FRONTPAGE_URL", "https://www.derstandard.at/")
 USER_AGENT = "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/109.0.0.0 Safari/537.36"
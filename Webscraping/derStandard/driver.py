@@ -1,12 +1,32 @@
-import time
+import os
+import sys
 import datetime
+from functools import partial
 from selenium import webdriver as wd
 from selenium.webdriver.chrome.service import Service as ChromeService
 from selenium.common.exceptions import NoSuchElementException
 from selenium.webdriver.common.by import By
 from config import CHROMEDRIVER_PATH, USER_AGENT, FRONTPAGE_URL
 
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..")))
+from common.page_readiness import ReadySelector, wait_for_page
+from common.driver_pool import DriverPool
+from common.network_blocking import profile_from_env, configure_options, apply_profile
+
+# Netzwerk-Profil (Werbung, Tracker, Bilder, Fonts, Videos blockieren), siehe common/network_blocking.py
+NETWORK_PROFILE = profile_from_env()
+
+CONSENT_XPATH = "/html/body/div[1]/div[2]/div[3]/div[1]/button"
+CONSENT_READY = [ReadySelector('consent', '/html/body/div/iframe', 5)]
+CONSENT_BUTTON_READY = [ReadySelector('consent-button', CONSENT_XPATH, 5)]
+COOKIE_FILE = os.path.join(os.getenv("SCRAPER_COOKIE_DIR", os.path.dirname(os.path.abspath(__file__))), 'consent_cookies.json')
+
 def configure_driver(headless=True):
+    driver = create_driver(headless)
+    accept_consent(driver)
+    return driver
+
+def create_driver(headless=True):
     chrome_options = wd.ChromeOptions()
     if headless:
         chrome_options.add_argument("--headless=new")
@@ -20,18 +40,36 @@ def configure_driver(headless=True):
         "profile.managed_default_content_settings.images": 2
     }
     chrome_options.experimental_options["prefs"] = chrome_prefs
+    configure_options(chrome_options, NETWORK_PROFILE)
 
     service = ChromeService(executable_path=CHROMEDRIVER_PATH)
     driver = wd.Chrome(service=service, options=chrome_options)
+    apply_profile(driver, NETWORK_PROFILE)
+    return driver
 
-    # POPUP WEGKLICKEN
+def accept_consent(driver):
+    """Klickt das Consent-Popup weg. Rückgabe: True, wenn der Button geklickt wurde"""
     driver.get(FRONTPAGE_URL + datetime.date.today().strftime("%Y/%m/%d"))
-    time.sleep(5)
+    wait_for_page(driver, CONSENT_READY)
     try:
         driver.switch_to.frame(driver.find_element(By.XPATH, "/html/body/div/iframe"))
-        driver.find_element(By.XPATH, "/html/body/div[1]/div[2]/div[3]/div[1]/button").click()
+        wait_for_page(driver, CONSENT_BUTTON_READY)
+        driver.find_element(By.XPATH, CONSENT_XPATH).click()
         driver.switch_to.parent_frame()
+        return True
     except NoSuchElementException:
-        pass  # Popup nicht gefunden, nichts zu tun
+        driver.switch_to.default_content()
+        return False  # Popup nicht gefunden
+
+def create_driver_pool(logger, headless=True, max_pages=200, max_rss_mb=1500, size=1):
+    """Driver-Pool für einen Worker-Prozess, siehe common.driver_pool.DriverPool."""
+    return DriverPool(
+        partial(create_driver, headless),
+        accept_consent,
+        COOKIE_FILE,
+        logger,
+        max_pages=max_pages,
+        max_rss_mb=max_rss_mb,
+        size=size,
+    )
 
-    return driver
@@ -0,0 +1,331 @@
+"""
+Vollständiges Crawlen großer Foren (über die 70 Postings von scrape_article hinaus).
+
+Der Crawler blättert im Browser durch das Forum (dst-forum, Shadow DOM), liest
+pro Seite nur die noch nicht gesehenen Postings aus und schreibt sie sofort
+gebündelt in die Collection 'derStandard_postings' (ein Dokument pro Posting,
+Upsert über article_url + commentID). Pro Artikel begrenzen ein Zeit- und ein
+Größenbudget den Aufwand, der Fortschritt steht unter features.forum_crawl.
+Ein nicht fertig gecrawltes Forum wird im nächsten Lauf ab der zuletzt
+erreichten Seite fortgesetzt (resume_page). Läufe ohne Fortschritt
+('no-pagination', 'error') werden mit wachsendem Abstand wiederholt und nach
+MAX_STALLED_CRAWLS aufgegeben (abandoned).
+
+Aufruf (aus dem Repo-Root): python Webscraping/derStandard/forum_crawler.py --n 4 --max-seconds 600
+"""
+import os
+import sys
+import time
+import argparse
+import datetime
+from collections import Counter
+from pymongo import UpdateOne
+
+from database import get_db_connection
+from driver import create_driver_pool, NETWORK_PROFILE
+from logger_setup import setup_logger, close_logger
+from parsers import READ_POSTING_JS, posting_from_raw
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..")))
+from common.work_queue import WorkerStats, iter_queue, run_workers
+from common.metrics import timed
+from common.page_readiness import ReadySelector, wait_for_page
+from common.network_blocking import page_network_stats, log_network_totals
+from common.date_parsing import log_parse_stats, reset_parse_stats
+from common.mongo import log_latency_stats
+from common.job_lease import LeaseKeeper, claim_batch, ensure_lease_index, worker_id
+
+POSTINGS_COLLECTION = 'derStandard_postings'
+
+# Mehr Postings hat scrape_article ohnehin schon gespeichert
+MIN_POSTINGS = 70
+
+# Läufe ohne Fortschritt: nächster Versuch nach 1 Tag, 2 Tagen, ..., danach aufgeben
+STALLED_STOPS = ('no-pagination', 'error')
+MAX_STALLED_CRAWLS = 3
+STALLED_RETRY_DELAY = datetime.timedelta(days=1)
+
+FORUM_READY = [ReadySelector('forum', 'dst-forum', 10, shadow='main.forum--main dst-posting')]
+
+# Schaltflächen für die nächste Seite bzw. "weitere Postings laden" im Shadow Root
+# des Forums (erste sichtbare, aktive gewinnt). Bei Layout-Änderungen hier anpassen.
+NEXT_PAGE_SELECTORS = [
+    'button[data-forum-action="next-page"]',
+    'button.forum--pagination-next',
+    'a.forum--pagination-next',
+    'a[rel="next"]',
+    'button.forum--loadmore',
+]
+
+# Liefert alle Postings im Forum, die im aktuellen Dokument noch nicht gelesen wurden
+# (flach, Antworten mit parentid). Die gelesenen IDs merkt sich die Seite selbst, das
+# funktioniert beim Nachladen (Anhängen) ebenso wie beim Ersetzen der Seite.
+FORUM_PAGE_JS = READ_POSTING_JS + """
+var host = document.querySelector('dst-forum');
+if (!host || !host.shadowRoot) return null;
+var main = host.shadowRoot.querySelector('main.forum--main');
+if (!main) return null;
+var seen = window.__forumCrawlSeen || (window.__forumCrawlSeen = {});
+var postings = main.querySelectorAll('dst-posting');
+var result = [];
+for (var i = 0; i < postings.length; i++) {
+    var id = postings[i].getAttribute('data-postingid');
+    if (!id || seen[id]) continue;
+    seen[id] = true;
+    result.push(readPosting(postings[i]));
+}
+return result;
+"""
+
+# true: geklickt, false: Schaltfläche vorhanden, aber inaktiv (letzte Seite),
+# null: keiner der Selektoren passt (Layout unbekannt, Ende nicht bestätigt)
+FORUM_NEXT_PAGE_JS = """
+var host = document.querySelector('dst-forum');
+if (!host || !host.shadowRoot) return null;
+var selectors = arguments[0];
+var found = false;
+for (var i = 0; i < selectors.length; i++) {
+    var el = host.shadowRoot.querySelector(selectors[i]);
+    if (!el) continue;
+    found = true;
+    if (!el.disabled && el.offsetParent !== null) {
+        el.scrollIntoView();
+        el.click();
+        return true;
+    }
+}
+return found ? false : null;
+"""
+
+
+def ensure_postings_index(postings):
+    postings.create_index([('article_url', 1), ('commentID', 1)], unique=True)
+
+
+def posting_update(article_url, raw, crawled_at, logger):
+    """UpdateOne (Upsert) für ein Posting aus FORUM_PAGE_JS, None ohne gültige ID."""
+    posting = posting_from_raw(raw, logger)
+    posting.pop('replies')
+    if posting['commentID'] is None:
+        return None
+    posting.update({'article_url': article_url, 'crawled_at': crawled_at})
+    return UpdateOne(
+        {'article_url': article_url, 'commentID': posting['commentID']},
+        {'$set': posting},
+        upsert=True
+    )
+
+
+def next_postings(driver, page_timeout, poll_interval=0.25):
+    """Wartet nach dem Blättern, bis neue Postings gerendert sind. Rückgabe: Rohwerte oder []"""
+    deadline = time.monotonic() + page_timeout
+    while True:
+        raw_postings = driver.execute_script(FORUM_PAGE_JS) or []
+        if raw_postings or time.monotonic() >= deadline:
+            return raw_postings
+        time.sleep(poll_interval)
+
+
+def crawl_forum(driver, postings, article_url, logger, posting_count=None, resume_page=0,
+                max_seconds=600, max_postings=20000, batch_size=500, page_timeout=10):
+    """
+    Blättert durch das Forum der geladenen Seite und schreibt die Postings
+    gebündelt (je 'batch_size') in 'postings'. Es werden nie mehr als eine
+    Seite Postings plus ein Batch im Speicher gehalten.
+
+    Mit 'resume_page' werden die ersten Seiten (aus einem früheren Lauf schon
+    gespeichert) nur durchgeblättert, das Zeitbudget beginnt erst danach.
+    Findet sich keine Schaltfläche zum Weiterblättern, gilt das Forum nur als
+    zu Ende gelesen, wenn insgesamt 'posting_count' Postings gespeichert sind.
+
+    Rückgabe: dict mit 'postings', 'pages' und 'stopped'
+    ('end', 'time', 'size', 'no-pagination', 'no-forum')
+    """
+    crawled_at = datetime.datetime.now()
+    batch = []
+    count = 0
+    pages = 0
+    stopped = None
+
+    raw_postings = driver.execute_script(FORUM_PAGE_JS)
+    if raw_postings is None:
+        return {'postings': 0, 'pages': 0, 'stopped': 'no-forum'}
+
+    # Bis zum Fortsetzungspunkt blättern, die Postings dort sind schon gespeichert
+    while raw_postings and pages < resume_page:
+        if not driver.execute_script(FORUM_NEXT_PAGE_JS, NEXT_PAGE_SELECTORS):
+            break
+        pages += 1
+        raw_postings = next_postings(driver, page_timeout)
+    if pages:
+        logger.debug(f"Forum {article_url}: {pages} bereits gecrawlte Seiten übersprungen.")
+
+    started = time.monotonic()
+    while raw_postings:
+        pages += 1
+        for raw in raw_postings:
+            update = posting_update(article_url, raw, crawled_at, logger)
+            if update is None:
+                continue
+            batch.append(update)
+            count += 1
+            if len(batch) >= batch_size:
+                postings.bulk_write(batch, ordered=False)
+                batch = []
+
+        if count >= max_postings:
+            stopped = 'size'
+            break
+        if time.monotonic() - started >= max_seconds:
+            stopped = 'time'
+            break
+        clicked = driver.execute_script(FORUM_NEXT_PAGE_JS, NEXT_PAGE_SELECTORS)
+        if clicked is False:
+            stopped = 'end'
+            break
+        if clicked is None:
+            break
+        raw_postings = next_postings(driver, page_timeout)
+
+    if batch:
+        postings.bulk_write(batch, ordered=False)
+    if stopped is None:
+        # Keine (bekannte) Schaltfläche oder keine neuen Postings nach dem Blättern:
+        # vollständig nur, wenn alle Postings laut Artikel gespeichert sind
+        stored = postings.count_documents({'article_url': article_url})
+        stopped = 'end' if posting_count is not None and stored >= posting_count else 'no-pagination'
+    logger.debug(f"Forum {article_url}: {count} Postings auf {pages} Seiten in {time.monotonic() - started:.1f}s ({stopped}).")
+    return {'postings': count, 'pages': pages, 'stopped': stopped}
+
+
+def crawl_article(driver, collection, postings, task, logger, stats=None):
+    """Lädt einen Artikel, crawlt das Forum und vermerkt das Ergebnis unter features.forum_crawl."""
+    article_url = task['url']
+    logger.info(f"Prozess {os.getpid()} crawlt Forum: {article_url}")
+    try:
+        driver.set_page_load_timeout(10)
+        with timed(stats, 'driver.get'):
+            driver.get(article_url)
+        readiness = wait_for_page(driver, FORUM_READY)
+        if stats:
+            stats.record('wait', readiness['waited'])
+        with timed(stats, 'forum_crawl'):
+            result = crawl_forum(
+                driver, postings, article_url, logger,
+                posting_count=task['posting_count'], resume_page=task['resume_page'],
+                max_seconds=task['max_seconds'], max_postings=task['max_postings']
+            )
+    except Exception as e:
+        logger.error(f"Fehler beim Crawlen des Forums {article_url}: {e}", exc_info=True)
+        result = {'postings': 0, 'pages': task['resume_page'], 'stopped': 'error', 'error': str(e)}
+
+    complete = result['stopped'] in ('end', 'size', 'no-forum')
+    now = datetime.datetime.now()
+    stalled_attempts = task['stalled_attempts'] + 1 if result['stopped'] in STALLED_STOPS else 0
+    if stalled_attempts >= MAX_STALLED_CRAWLS:
+        # Bleibt unvollständig, wird aber nicht mehr geclaimt
+        result['abandoned'] = True
+        logger.warning(f"Forum {article_url}: {stalled_attempts} Läufe ohne Fortschritt ({result['stopped']}), wird aufgegeben.")
+    elif stalled_attempts:
+        result['next_attempt_at'] = now + STALLED_RETRY_DELAY * 2 ** (stalled_attempts - 1)
+    result.update({
+        # Erledigt: bis zum Ende gelesen, Größenbudget erreicht oder kein dst-forum (altes Layout).
+        # Sonst setzt der nächste Lauf nach der zuletzt erreichten Seite fort (Upsert, keine Duplikate).
+        'complete': complete,
+        'resume_page': 0 if complete else result['pages'],
+        'stalled_attempts': stalled_attempts,
+        'crawled_at': now,
+    })
+    collection.update_one({'scraping_info.url': article_url}, {'$set': {'features.forum_crawl': result}})
+    logger.info(f"Forum {article_url}: {result['postings']} Postings, {result['pages']} Seiten, Ende: {result['stopped']}")
+    return result['stopped']
+
+
+def crawl_forums_worker(task_queue, stats_queue):
+    pid = os.getpid()
+    logger = setup_logger(log_file=f'forum_crawler_{pid}.log')
+    logger.info(f"Prozess {pid} gestartet.")
+    reset_parse_stats()
+
+    stats = WorkerStats()
+    collection = get_db_connection()
+    postings = get_db_connection(POSTINGS_COLLECTION)
+    driver_pool = create_driver_pool(logger, headless=True)
+
+    network_totals = Counter()
+    network_pages = 0
+
+    try:
+        for task in iter_queue(task_queue, stats):
+            with driver_pool.page() as driver:
+                stats.count_status(crawl_article(driver, collection, postings, task, logger, stats))
+                # Performance-Log nach jedem Forum leeren, sonst wächst es im gepoolten Driver unbegrenzt
+                network = page_network_stats(driver, NETWORK_PROFILE)
+            if network['requests']:
+                network_pages += 1
+                network_totals.update(network)
+    finally:
+        log_network_totals(network_totals, network_pages, logger)
+        log_parse_stats(logger)
+        log_latency_stats(logger)
+        driver_pool.close()
+        logger.info(f"Prozess {pid}: {stats.items} Foren mit {driver_pool.drivers_started} Browser-Instanzen gecrawlt.")
+        close_logger(logger)
+        stats_queue.put(stats.as_dict())
+
+
+def crawl_forums(logger, n=4, claim_size=200, max_seconds=600, max_postings=20000):
+    """
+    Claimt gescrapte Artikel mit mehr als MIN_POSTINGS Postings, deren Forum noch
+    nicht vollständig gecrawlt und nicht aufgegeben ist (nach einem Lauf ohne
+    Fortschritt erst wieder ab next_attempt_at), und verteilt sie auf n Prozesse.
+    """
+    collection = get_db_connection()
+    ensure_lease_index(collection)
+    ensure_postings_index(get_db_connection(POSTINGS_COLLECTION))
+    owner = worker_id()
+
+    articles = claim_batch(collection, {
+        'scraping_info.status': {'$in': ['success', 'warning (reactions)']},
+        'features.posting_count': {'$gt': MIN_POSTINGS},
+        'features.forum_crawl.complete': {'$ne': True},
+        'features.forum_crawl.abandoned': {'$ne': True},
+        'features.forum_crawl.next_attempt_at': {'$not': {'$gt': datetime.datetime.now()}},
+    }, owner, claim_size, projection={
+        'scraping_info.url': 1, 'features.posting_count': 1,
+        'features.forum_crawl.resume_page': 1, 'features.forum_crawl.stalled_attempts': 1,
+    }, sort=[('features.posting_count', -1)])
+
+    logger.info(f"Foren zu crawlen: {len(articles)} (Lease {owner})")
+    if not articles:
+        return
+
+    tasks = [
+        {
+            'url': article['scraping_info']['url'],
+            'posting_count': article['features'].get('posting_count'),
+            'resume_page': article['features'].get('forum_crawl', {}).get('resume_page', 0),
+            'stalled_attempts': article['features'].get('forum_crawl', {}).get('stalled_attempts', 0),
+            'max_seconds': max_seconds,
+            'max_postings': max_postings,
+        }
+        for article in articles
+    ]
+    with LeaseKeeper(collection, owner, logger):
+        run_workers(tasks, crawl_forums_worker, n, logger, metrics_name='derStandard-forum')
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--n', type=int, default=4)
+    parser.add_argument('--claim-size', type=int, default=200)
+    parser.add_argument('--max-seconds', type=int, default=600, help="Zeitbudget pro Artikel")
+    parser.add_argument('--max-postings', type=int, default=20000, help="Größenbudget pro Artikel")
+    args = parser.parse_args()
+
+    logger = setup_logger(log_file='forum_crawler.log')
+    crawl_forums(logger, args.n, args.claim_size, args.max_seconds, args.max_postings)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+import os
+import sys
+import json
+import asyncio
+import aiohttp
+
+from config import USER_AGENT
+from driver import COOKIE_FILE
+from parsers import parse_static_article
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..")))
+from common.html_parser import make_soup
+from common.rate_limit import AdaptiveLimiter
+
+
+def load_consent_cookies():
+    """Consent-Cookies aus dem Driver-Pool wiederverwenden (falls vorhanden)."""
+    if not os.path.exists(COOKIE_FILE):
+        return {}
+    try:
+        with open(COOKIE_FILE, encoding='utf-8') as f:
+            return {cookie['name']: cookie['value'] for cookie in json.load(f)}
+    except (OSError, ValueError, KeyError):
+        return {}
+
+
+def parse_html(html_content, full_url, logger):
+    """Parst die statischen Felder aus dem Roh-HTML. Rückgabe: (article_data, old_design)"""
+    return parse_static_article(make_soup(html_content), full_url, logger)
+
+
+async def fetch_static(session, limiter, url_dict, logger, archive=None):
+    """
+    Lädt einen Artikel per HTTP und parst die statischen Felder.
+    Gibt (url_dict, article_data, old_design) zurück, article_data ist None bei Fehlern.
+    Mit 'archive' (PageArchive) wird das Roh-HTML mitgeschrieben.
+    """
+    full_url = url_dict['scraping_info']['url']
+    try:
+        async with limiter.slot(full_url) as slot:
+            async with session.get(full_url) as response:
+                slot.done(response.status, response.headers)
+                if response.status != 200:
+                    logger.debug(f"HTTP {response.status} für {full_url}, Fallback auf Browser.")
+                    return url_dict, None, False
+                html_content = await response.text()
+    except Exception as e:
+        logger.debug(f"HTTP-Fehler für {full_url}: {e}, Fallback auf Browser.")
+        return url_dict, None, False
+
+    # Komprimieren (zstd) und Parsen im Thread-Pool, damit die Event-Loop die übrigen
+    # Downloads weiterbedient (sonst verfälscht die CPU-Zeit auch die Latenz-Messung
+    # des AdaptiveLimiter). PageArchive.add ist thread-sicher.
+    loop = asyncio.get_running_loop()
+    if archive:
+        await loop.run_in_executor(None, archive.add, full_url, html_content)
+
+    article_data, old_design = await loop.run_in_executor(None, parse_html, html_content, full_url, logger)
+    return url_dict, article_data, old_design
+
+
+async def fetch_static_articles(url_dicts, logger, max_conns=20, archive=None):
+    limiter = AdaptiveLimiter(concurrency=max_conns, max_concurrency=max_conns)
+    connector = aiohttp.TCPConnector(limit=max_conns)
+    timeout = aiohttp.ClientTimeout(total=15)
+    async with aiohttp.ClientSession(
+        connector=connector,
+        timeout=timeout,
+        headers={'User-Agent': USER_AGENT},
+        cookies=load_consent_cookies(),
+    ) as session:
+        tasks = [fetch_static(session, limiter, url_dict, logger, archive) for url_dict in url_dicts]
+        results = await asyncio.gather(*tasks)
+    limiter.log_summary(logger)
+    return results
+
+
+def prefetch_static_articles(url_dicts, logger, max_conns=20, archive=None):
+    """
+    Lädt die statischen Artikelfelder aller URLs parallel per aiohttp.
+    Rückgabe: Liste von (url_dict, article_data oder None, old_design)
+    """
+    if not url_dicts:
+        return []
+    return asyncio.run(fetch_static_articles(url_dicts, logger, max_conns, archive))
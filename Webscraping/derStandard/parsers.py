@@ -1,12 +1,19 @@
+import os
 import re
-import datetime
-import dateparser
-from bs4 import BeautifulSoup
+import sys
+from bs4 import SoupStrainer
 from selenium.webdriver.common.by import By
 from selenium.common.exceptions import NoSuchElementException
 import inspect
 from utils import expand_shadow_element
 
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..")))
+from common.html_parser import make_soup
+from common.date_parsing import parse_datetime
+
+# Altes Forum-Layout: nur die Postings werden geparst, nicht die ganze Seite
+OLD_FORUM_STRAINER = SoupStrainer('div', attrs={'data-postingid': True})
+
 
 def parse_posting(posting_element, logger):
     # Parst ein einzelnes <dst-posting>-Element und extrahiert die relevanten Daten.
@@ -39,7 +46,7 @@ def parse_posting(posting_element, logger):
         try:
             time_tag = posting_element.find_element(By.CSS_SELECTOR, "time[data-date]")
             datetime_str = time_tag.get_attribute("data-date")
-            datetime_obj = dateparser.parse(datetime_str, languages=['de'])
+            datetime_obj = parse_datetime(datetime_str)
         except NoSuchElementException:
             pass
 
@@ -96,7 +103,7 @@ def parse_posting(posting_element, logger):
         return None
 
 def parse_comment_datetime(datetime_str):
-    return dateparser.parse(datetime_str, languages=['de'])
+    return parse_datetime(datetime_str)
 
 
 def get_article_byline(soup, logger):
@@ -142,13 +149,10 @@ def get_article_datetime(soup, logger):
             datetime_str = time_element.get("datetime", "").strip() or time_element.get_text(strip=True)
             datetime_str = datetime_str.replace('\n', '').strip()
 
-            # parse the datetime string
-            try:
-                return datetime.datetime.fromisoformat(datetime_str)
-            except (TypeError, ValueError):
-                article_datetime = dateparser.parse(datetime_str, languages=['de'])
-                if article_datetime:
-                    return article_datetime
+            # parse the datetime string (ISO direkt, sonst Fallback auf dateparser)
+            article_datetime = parse_datetime(datetime_str)
+            if article_datetime:
+                return article_datetime
 
     # Log if no datetime was found
     logger.debug(f"{inspect.currentframe().f_back.f_code.co_name} Kein Datum gefunden.")
@@ -215,6 +219,40 @@ def get_paragraph_texts(soup, full_url, logger):
     return paragraph_texts
 
 
+def parse_static_article(soup, full_url, logger):
+    """
+    Extrahiert alle serverseitig gerenderten Artikelfelder (ohne Reaktionen und Forum).
+    Gibt ein Tuple zurück: (article_data, old_design)
+      article_data: dict mit den Feldnamen der DB ('article.title', ...)
+      old_design:   True, wenn das Forum im alten Layout (ohne Shadow DOM) eingebettet ist
+    """
+    # Rubrik/Kicker
+    kicker_tag = soup.find('h2', class_='article-kicker')
+    kicker = kicker_tag.get_text(strip=True) if kicker_tag else None
+
+    # Titel
+    title_tag = soup.find('h1', class_='article-title')
+    title = title_tag.get_text(strip=True) if title_tag else None
+
+    # Subtitel
+    subtitle_tag = soup.find('p', class_='article-subtitle')
+    subtitle = subtitle_tag.get_text(strip=True) if subtitle_tag else None
+
+    # manchmal ist die Seite anders strukturiert
+    old_design = soup.find("div", class_="forum use-unobtrusive-ajax visible") is not None
+
+    article_data = {
+        'article.title': title,
+        'article.subtitle': subtitle,
+        'article.kicker': kicker,
+        'article.author': get_article_byline(soup, logger),
+        'article.pubdate': get_article_datetime(soup, logger),
+        'features.posting_count': get_posting_count(soup, full_url, logger),
+        'article.text': get_paragraph_texts(soup, full_url, logger),
+    }
+    return article_data, old_design
+
+
 def extract_reactions(driver, logger):
     """
     Extrahiert die Reaktionen aus dem Shadow DOM der aktuellen Seite.
@@ -295,14 +333,136 @@ def extract_forum_comments_normal(driver, logger, max_comments=70):
         return [], True
     
 
+# Liest ein <dst-posting> aus, gemeinsam für FORUM_EXTRACT_JS und den Forum-Crawler (forum_crawler.py).
+# Liefert die Rohwerte als Strings, die Umwandlung passiert in posting_from_raw().
+READ_POSTING_JS = """
+function texts(root, selector) {
+    return Array.prototype.map.call(root.querySelectorAll(selector), function (el) { return el.innerText; });
+}
+
+function readPosting(posting) {
+    var spans = posting.querySelectorAll('dst-posting--user button span > span');
+    var followers = posting.querySelector('dst-posting--user button div[title]');
+    var time = posting.querySelector('time[data-date]');
+    var content = posting.querySelector('div.posting--content');
+    var ratinglog = posting.querySelector('dst-posting--ratinglog');
+    return {
+        author: spans.length ? spans[0].innerText : null,
+        followers: followers ? followers.getAttribute('title') : null,
+        datetime: time ? time.getAttribute('data-date') : null,
+        headers: content ? texts(content, 'h1') : null,
+        paragraphs: content ? texts(content, 'p') : null,
+        positiveratings: ratinglog ? ratinglog.getAttribute('positiveratings') : null,
+        negativeratings: ratinglog ? ratinglog.getAttribute('negativeratings') : null,
+        parentid: posting.getAttribute('data-parentpostingid'),
+        postingid: posting.getAttribute('data-postingid'),
+        replies: []
+    };
+}
+"""
+
+# Liest das komplette Forum (inkl. Shadow Root) in einem einzigen execute_script-Aufruf aus.
+FORUM_EXTRACT_JS = READ_POSTING_JS + """
+var maxComments = arguments[0];
+var host = document.querySelector('dst-forum');
+if (!host || !host.shadowRoot) return null;
+var main = host.shadowRoot.querySelector('main.forum--main');
+if (!main) return null;
+
+var comments = [], count = 0, currentParent = null;
+var children = main.children;
+for (var i = 0; i < children.length && count < maxComments; i++) {
+    var child = children[i];
+    var tagName = child.tagName.toLowerCase();
+    if (tagName === 'dst-posting') {
+        currentParent = readPosting(child);
+        comments.push(currentParent);
+        count++;
+    } else if (tagName === 'section' && child.className.indexOf('thread') !== -1) {
+        if (!currentParent) continue;
+        var replies = child.querySelectorAll('dst-posting');
+        for (var j = 0; j < replies.length && count < maxComments; j++) {
+            currentParent.replies.push(readPosting(replies[j]));
+            count++;
+        }
+    }
+}
+return comments;
+"""
+
+
+def posting_from_raw(raw, logger):
+    """Wandelt die Rohwerte aus FORUM_EXTRACT_JS in ein Kommentar-dict wie parse_posting um."""
+    author = raw['author'].strip() if raw['author'] is not None else "Unbekannter Benutzer"
+
+    user_followers = 0
+    if raw['followers']:
+        followers_match = re.search(r'\d+', raw['followers'])
+        if followers_match:
+            user_followers = int(followers_match.group())
+
+    datetime_obj = parse_datetime(raw['datetime'])
+
+    content = ""
+    if raw['headers'] is not None:
+        header_text = "\n".join(raw['headers'])
+        paragraph_text = "\n".join(raw['paragraphs'])
+        content = "\n".join([header_text, paragraph_text]).strip()
+
+    positiveratings = raw['positiveratings']
+    negativeratings = raw['negativeratings']
+    upvotes = int(positiveratings) if positiveratings and positiveratings.isdigit() else 0
+    downvotes = int(negativeratings) if negativeratings and negativeratings.isdigit() else 0
+
+    parent_id = raw['parentid']
+    commentID = raw['postingid']
+
+    return {
+        'commentID': int(commentID) if commentID and commentID.isdigit() else None,
+        'author': author,
+        'user_followers': user_followers,
+        'datetime': datetime_obj,
+        'content': content,
+        'upvotes': upvotes,
+        'downvotes': downvotes,
+        'reply_on_comment': int(parent_id) if parent_id and parent_id.isdigit() else None,
+        'replies': [posting_from_raw(reply, logger) for reply in raw['replies']]
+    }
+
+
+def extract_forum_comments_js(driver, logger, max_comments=70):
+    """
+    Wie extract_forum_comments_normal, liest aber alle Postings mit einem einzigen
+    WebDriver-Aufruf aus statt mit mehreren Aufrufen pro Posting.
+    Gibt ein Tuple zurück: (comments_list, warning_flag)
+    """
+    try:
+        raw_comments = driver.execute_script(FORUM_EXTRACT_JS, max_comments)
+        if raw_comments is None:
+            logger.warning("Forum-Elemente nicht gefunden.")
+            return [], True
+        return [posting_from_raw(raw, logger) for raw in raw_comments], False
+    except Exception as e:
+        logger.error(f"Fehler beim Extrahieren der Forenkommentare: {e}", exc_info=True)
+        return [], True
+
+
 def extract_forum_comments_alternative(driver, logger, max_comments=70):
     """
     Extrahiert Benutzerkommentare aus der aktuellen Seite unter Verwendung von BeautifulSoup
     und bildet verschachtelte Antworten ab.
     """
+    soup = make_soup(driver.page_source, parse_only=OLD_FORUM_STRAINER)
+    return parse_forum_comments_alternative(soup, logger, max_comments)
+
+
+def parse_forum_comments_alternative(soup, logger, max_comments=70):
+    """
+    Parst die Postings des alten Forum-Layouts aus einer Soup.
+    Gibt ein Tuple zurück: (comments_list, warning_flag)
+    """
     comments_data = []
     comment_map = {}
-    soup = BeautifulSoup(driver.page_source, 'html.parser')
     postings = soup.find_all('div', class_='posting', attrs={'data-postingid': True})
 
     if not postings:
@@ -1,187 +1,305 @@
-import logging
-import time
 import os
 import datetime
-import multiprocessing
+from collections import Counter
+import sys
+import time
+from pymongo import UpdateOne
 from selenium.common.exceptions import TimeoutException
-from bs4 import BeautifulSoup
-from selenium.webdriver.common.by import By
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
 
 from database import get_db_connection
-from driver import configure_driver
+from driver import create_driver_pool, NETWORK_PROFILE
 from logger_setup import setup_logger, close_logger
+from http_fetch import prefetch_static_articles
 from parsers import (
-    get_article_byline,
-    get_article_datetime,
-    get_posting_count,
-    get_paragraph_texts,
+    parse_static_article,
     extract_reactions,
-    extract_forum_comments_normal,
+    extract_forum_comments_js,
     extract_forum_comments_alternative,
 )
-from utils import expand_shadow_element
 
-def scrape_articles(logger, n=10):
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..")))
+from common.work_queue import WorkerStats, iter_queue, run_workers
+from common.metrics import timed
+from common.page_readiness import ReadySelector, wait_for_page
+from common.html_parser import make_soup
+from common.page_archive import open_archive
+from common.retry_state import DEAD_LETTER, due_filter, record_failure
+from common.network_blocking import page_network_stats, log_network_totals
+from common.date_parsing import log_parse_stats, reset_parse_stats
+from common.mongo import log_latency_stats
+from common.job_lease import LeaseKeeper, claim_batch, ensure_lease_index, release_lease, worker_id
+from common.comment_refresh import refresh_due_filter, refresh_article_comments, record_refresh_failure
+
+# Elemente, auf die nach driver.get gewartet wird (statt fixer time.sleep(5))
+ARTICLE_READY = [ReadySelector('title', 'h1.article-title', 10)]
+REACTIONS_READY = ReadySelector('reactions', 'dst-community-reactions', 5, shadow='aside.reactions')
+FORUM_READY = ReadySelector('forum', 'dst-forum', 10, shadow='main.forum--main dst-posting')
+OLD_FORUM_READY = ReadySelector('forum', 'div.posting[data-postingid]', 10)
+
+# Status ohne erneuten Versuch (außer 'success' und DEAD_LETTER)
+TERMINAL_STATUSES = ['skipped', 'warning', 'warning (reactions)', 'warning (comments)']
+
+# Beim Aktualisieren werden mehr Postings gelesen, neue landen sonst evtl. hinter dem Limit
+REFRESH_MAX_COMMENTS = 300
+
+def scrape_articles(logger, n=10, claim_size=1000, max_conns=20):
+    """
+    Claimt bis zu 'claim_size' offene URLs per Lease (siehe common/job_lease.py),
+    damit mehrere Scraper (auch auf anderen Rechnern) dieselbe Collection ohne
+    Überschneidung abarbeiten, und verteilt sie auf n Prozesse. 'max_conns'
+    begrenzt die parallelen Requests im HTTP-Fast-Path.
+    Rückgabe: Anzahl der geclaimten URLs
+    """
     collection = get_db_connection()
-    
+    ensure_lease_index(collection)
+    owner = worker_id()
+
     # get URLs
-    urls_to_scrape = list(collection.find({
+    urls_to_scrape = claim_batch(collection, {
         '$and': [
             { 'features.APA_OeNB_Sentiment': { '$exists': True, '$nin': [None, ""] } },
-            {'scraping_info.status': {'$nin': ['success']}},
+            # Warnungen und übersprungene URLs sind endgültig (Daten gespeichert bzw. bewusst ausgelassen),
+            # nur 'error' wird mit Backoff erneut versucht
+            {'scraping_info.status': {'$nin': ['success', *TERMINAL_STATUSES, DEAD_LETTER]}},
+            due_filter(),
             #{ '$or': [
             #    {'scraping_info.status': {'$nin': ['success']}},
             #    {'scraping_info.status': {'$exists': False}}
             #]}
         ]
-    }, {'scraping_info.url': 1}))
+    }, owner, claim_size, projection={'scraping_info.url': 1})
     
     if len(urls_to_scrape)==0:
-        logger.info(f"Alle Files bereits gescraped... Files mit status=error werden erneut gescraped")
-        urls_to_scrape = list(collection.find({'scraping_info.status': 'error'}, {'scraping_info.url': 1}))
+        logger.info(f"Alle Files bereits gescraped... fällige Files mit status=error werden erneut gescraped")
+        urls_to_scrape = claim_batch(collection, {'scraping_info.status': 'error', **due_filter()}, owner, claim_size, projection={'scraping_info.url': 1})
     
-    logger.info(f"Anzahl der zu scrapenden URLs: {len(urls_to_scrape)}")
-
-    # URLs gleichmäßig auf n Prozesse verteilen
-    chunks = [urls_to_scrape[i::n] for i in range(n)]
-
-    # Multiprocessing Pool verwenden
-    with multiprocessing.Pool(processes=n) as pool:
-        pool.map(scrape_articles_chunk, chunks)
-
-def scrape_articles_chunk(urls_chunk):
+    logger.info(f"Anzahl der zu scrapenden URLs: {len(urls_to_scrape)} (Lease {owner})")
+    if not urls_to_scrape:
+        return 0
+
+    with LeaseKeeper(collection, owner, logger):
+        # Statische Felder per HTTP laden, der Browser wird nur noch für Reaktionen/Forum gebraucht
+        urls_for_browser = scrape_static_articles(collection, urls_to_scrape, logger, max_conns=max_conns)
+
+        # Gemeinsame Queue: jeder Prozess holt sich die nächste URL, sobald er frei ist
+        run_workers(urls_for_browser, scrape_articles_worker, n, logger, metrics_name='derStandard')
+    return len(urls_to_scrape)
+
+def scrape_static_articles(collection, urls_to_scrape, logger, batch_size=500, max_conns=20):
+    """
+    HTTP-Fast-Path: lädt alle Artikel per aiohttp und parst die serverseitig
+    gerenderten Felder. Artikel mit posting_count 0 werden direkt gespeichert.
+    Rückgabe: Liste der URL-Dicts, die noch den Browser brauchen. Bei Artikeln
+    mit Postings sind die statischen Felder unter 'static' bereits enthalten.
+    """
+    urls_to_fetch = []
+    for url_dict in urls_to_scrape:
+        full_url = url_dict['scraping_info']['url']
+        reason = skip_reason(full_url)
+        if reason:
+            scraping_status(collection, "skipped", full_url, reason, logger)
+        else:
+            urls_to_fetch.append(url_dict)
+
+    started = time.perf_counter()
+    archive = open_archive('derStandard')
+    try:
+        results = prefetch_static_articles(urls_to_fetch, logger, max_conns=max_conns, archive=archive)
+    finally:
+        if archive:
+            archive.close()
+
+    urls_for_browser = []
+    updates = []
+    for url_dict, static_data, old_design in results:
+        full_url = url_dict['scraping_info']['url']
+        if static_data is None or static_data['article.title'] is None or static_data['article.pubdate'] is None:
+            # HTTP fehlgeschlagen oder unvollständig -> komplett über den Browser
+            urls_for_browser.append(url_dict)
+        elif static_data['features.posting_count'] == 0:
+            article_data = build_article_data(static_data, [], None, 'success')
+            updates.append(UpdateOne({'scraping_info.url': full_url}, {'$set': article_data}))
+            logger.debug(f"Ohne Browser gescraped: {full_url}")
+        else:
+            # Postings vorhanden oder Anzahl nicht im Server-HTML (None) -> Browser
+            url_dict['static'] = static_data
+            url_dict['old_design'] = old_design
+            urls_for_browser.append(url_dict)
+
+    for i in range(0, len(updates), batch_size):
+        collection.bulk_write(updates[i:i + batch_size], ordered=False)
+
+    logger.info(
+        f"HTTP-Fast-Path: {len(urls_to_fetch)} Artikel in {time.perf_counter() - started:.1f}s geladen, "
+        f"{len(updates)} ohne Browser gespeichert, {len(urls_for_browser)} brauchen den Browser."
+    )
+    log_parse_stats(logger)
+    return urls_for_browser
+
+def skip_reason(full_url):
+    # liveticker
+    if full_url.startswith("https://www.derstandard.at/jetzt"):
+        return "Skipping Liveticker"
+    if "kreuzwortraetsel" in full_url:
+        return "Skipping Kreuzworträtsel"
+    return None
+
+def build_article_data(static_data, forum_comments, reactions, status):
+    article_data = dict(static_data)
+    article_data.update({
+        'article.comments': forum_comments,
+        'features.reactions': reactions,
+        'scraping_info.status': status,
+        'scraping_info.download_datetime': datetime.datetime.now()
+    })
+    return article_data
+
+def scrape_articles_worker(task_queue, stats_queue):
     pid = os.getpid()
     log_file = f'scraper_{pid}.log'
     logger = setup_logger(log_file=log_file)
-    logger.info(f"Prozess {pid} gestartet und verarbeitet {len(urls_chunk)} Artikel.")
+    logger.info(f"Prozess {pid} gestartet.")
+    reset_parse_stats()
 
+    stats = WorkerStats()
     collection = get_db_connection()
-    driver = configure_driver(headless=True)
+    driver_pool = create_driver_pool(logger, headless=True)
+    archive = open_archive('derStandard')
 
-    try:
-        for url_dict in urls_chunk:
-            full_url = url_dict['scraping_info']['url']
-
-            # liveticker
-            if full_url.startswith("https://www.derstandard.at/jetzt"):
-                scraping_status(collection, "skipped", full_url, "Skipping Liveticker", logger)
-                continue
-
-            if "kreuzwortraetsel" in full_url:
-                scraping_status(collection, "skipped", full_url, "Skipping Kreuzworträtsel", logger)
-                continue
-
-            logger.info(f"Prozess {pid} verarbeitet URL: {full_url}")
-
-            try:
-                driver.set_page_load_timeout(10)
-                # Seite laden
-                try:
-                    driver.get(full_url)
-                except TimeoutException:
-                    scraping_status(collection, "error", full_url, "Timeout nach 10 Sekunden", logger)
-                    continue
-
-                wait = WebDriverWait(driver, 10)
-                time.sleep(5)
-
-                # Warten, bis die Seite geladen ist
-                wait.until(EC.presence_of_element_located((By.TAG_NAME, "body")))
-                logger.debug(f"Seite {full_url} vollständig geladen.")
-
-                # Seite mit BeautifulSoup parsen
-                soup = BeautifulSoup(driver.page_source, 'html.parser')
-                logger.debug(f"HTML-Inhalt von {full_url} mit BeautifulSoup geparst.")
+    network_totals = Counter()
+    network_pages = 0
 
-                # Rubrik/Kicker
-                kicker_tag = soup.find('h2', class_='article-kicker')
-                kicker = kicker_tag.get_text(strip=True) if kicker_tag else None
-
-                # Titel
-                title_tag = soup.find('h1', class_='article-title')
-                title = title_tag.get_text(strip=True) if title_tag else None
-
-                # Subtitel
-                subtitle_tag = soup.find('p', class_='article-subtitle')
-                subtitle = subtitle_tag.get_text(strip=True) if subtitle_tag else None
-
-                # Artikel-Byline
-                article_byline = get_article_byline(soup, logger)
-
-                # Datum und Uhrzeit
-                article_datetime = get_article_datetime(soup, logger)
-
-                if article_datetime is None or title is None:
-                    scraping_status(collection, "error", full_url, 'Fehlendes Datum oder Titel', logger)
-                    continue
-
-                # Anzahl der Postings
-                posting_count = get_posting_count(soup, full_url, logger)
-
-                # Reaktionen
-                reactions, reactions_warning = extract_reactions(driver, logger)
-
-                # Artikelinhalt
-                paragraph_texts = get_paragraph_texts(soup, full_url, logger)
-
-                # manchmal ist die Seite anders strukturiert
-                old_design = soup.find("div", class_="forum use-unobtrusive-ajax visible")
-
-                # Kommentare
-                if old_design:
-                    forum_comments, comments_warning = extract_forum_comments_alternative(driver, logger)
-                else:
-                    forum_comments, comments_warning = extract_forum_comments_normal(driver, logger)
-
-                # Status bestimmen
-                if reactions_warning and comments_warning:
-                    status = 'warning'
-                elif reactions_warning:
-                    status = 'warning (reactions)'
-                elif comments_warning:
-                    status = 'warning (comments)'
-                else:
-                    status = 'success'
-
-                # Daten vorbereiten
-                article_data = {
-                    'article.title': title,
-                    'article.subtitle': subtitle,
-                    'article.kicker': kicker,
-                    'article.text': paragraph_texts,
-                    'article.author': article_byline,
-                    'article.pubdate': article_datetime,
-                    'article.comments': forum_comments,
-                    'features.posting_count': posting_count,
-                    'features.reactions': reactions,
-                    'scraping_info.status': status,
-                    'scraping_info.download_datetime': datetime.datetime.now()
-                }
-
-                # Daten in die 'derStandard' Collection einfügen
-                collection.update_one(
-                    {'scraping_info.url': full_url},
-                    {'$set': article_data}
+    try:
+        for url_dict in iter_queue(task_queue, stats):
+            with driver_pool.page() as driver:
+                status = scrape_article(driver, collection, url_dict, logger, stats, archive)
+                stats.count_status(status)
+                network = page_network_stats(driver, NETWORK_PROFILE)
+            if network['requests']:
+                network_pages += 1
+                network_totals.update(network)
+                logger.debug(
+                    f"Netzwerk {url_dict['scraping_info']['url']}: {network['requests']} Requests, "
+                    f"{network['bytes'] / 1024:.0f} KB, {network['blocked_requests']} vermieden"
                 )
-
-                logger.info(f"Erfolgreich gescraped mit Status '{status}': {full_url} am {article_datetime}")
-
-            except TimeoutException:
-                scraping_status(collection, "error", full_url,'Timeout nach 10 Sekunden', logger)
-            except Exception as e:
-                scraping_status(collection, "error", full_url, str(e), logger)
-                logger.error(f"Fehler beim Verarbeiten von {full_url}: {e}", exc_info=True)
-                continue
     finally:
-        driver.quit()
-        logger.info("Browser erfolgreich geschlossen.")
+        log_network_totals(network_totals, network_pages, logger)
+        log_parse_stats(logger)
+        log_latency_stats(logger)
+        driver_pool.close()
+        if archive:
+            archive.close()
+        logger.info(f"Browser erfolgreich geschlossen, {stats.items} Artikel mit {driver_pool.drivers_started} Browser-Instanzen verarbeitet.")
         close_logger(logger)
+        stats_queue.put(stats.as_dict())
+
 
+def scrape_article(driver, collection, url_dict, logger, stats=None, archive=None):
+    """
+    Lädt und parst einen Artikel im Browser und schreibt das Ergebnis in die DB.
+    Die Dauer der einzelnen Stufen landet in 'stats'. Rückgabe: Status der Seite
+    """
+    pid = os.getpid()
+    full_url = url_dict['scraping_info']['url']
+
+    reason = skip_reason(full_url)
+    if reason:
+        return scraping_status(collection, "skipped", full_url, reason, logger)
 
+    logger.info(f"Prozess {pid} verarbeitet URL: {full_url}")
 
-def scraping_status(collection, status, url, exception_message, logger):
+    try:
+        driver.set_page_load_timeout(10)
+        # Seite laden
+        try:
+            with timed(stats, 'driver.get'):
+                driver.get(full_url)
+        except TimeoutException as e:
+            return scraping_status(collection, "error", full_url, "Timeout nach 10 Sekunden", logger, type(e).__name__)
+
+        static_data = url_dict.get('static')
+        if static_data is None:
+            # Warten, bis der Titel gerendert ist
+            readiness = wait_for_page(driver, ARTICLE_READY)
+            waited = readiness['waited']
+            logger.debug(f"Seite {full_url} geladen nach {waited:.2f}s.")
+
+            # Seite mit BeautifulSoup parsen
+            with timed(stats, 'soup'):
+                soup = make_soup(driver.page_source)
+                logger.debug(f"HTML-Inhalt von {full_url} mit BeautifulSoup geparst.")
+                static_data, old_design = parse_static_article(soup, full_url, logger)
+        else:
+            # Statische Felder kommen bereits aus dem HTTP-Fast-Path
+            waited = 0.0
+            old_design = url_dict.get('old_design', False)
+
+        article_datetime = static_data['article.pubdate']
+        if article_datetime is None or static_data['article.title'] is None:
+            return scraping_status(collection, "error", full_url, 'Fehlendes Datum oder Titel', logger)
+
+        # Auf Reaktionen und (außer bei sicher 0 Postings) auf das Forum warten
+        dynamic_selectors = [REACTIONS_READY]
+        if static_data['features.posting_count'] != 0:
+            dynamic_selectors.append(OLD_FORUM_READY if old_design else FORUM_READY)
+        dynamic_readiness = wait_for_page(driver, dynamic_selectors)
+        waited += dynamic_readiness['waited']
+        logger.debug(f"Wartezeit gesamt {waited:.2f}s für {full_url}, nicht erschienen: {dynamic_readiness['missing']}")
+        if stats:
+            stats.record('wait', waited)
+
+        # Roh-HTML archivieren, sofern es nicht schon aus dem HTTP-Fast-Path stammt
+        # (das alte Forum steht im DOM, das neue liegt im Shadow-DOM und fehlt hier)
+        if archive and ('static' not in url_dict or old_design):
+            archive.add(full_url, driver.page_source)
+
+        # Reaktionen
+        with timed(stats, 'reactions'):
+            reactions, reactions_warning = extract_reactions(driver, logger)
+
+        # Kommentare
+        with timed(stats, 'comments'):
+            if old_design:
+                forum_comments, comments_warning = extract_forum_comments_alternative(driver, logger)
+            else:
+                forum_comments, comments_warning = extract_forum_comments_js(driver, logger)
+
+        # Status bestimmen
+        if reactions_warning and comments_warning:
+            status = 'warning'
+        elif reactions_warning:
+            status = 'warning (reactions)'
+        elif comments_warning:
+            status = 'warning (comments)'
+        else:
+            status = 'success'
+
+        # Daten vorbereiten
+        article_data = build_article_data(static_data, forum_comments, reactions, status)
+
+        # Daten in die 'derStandard' Collection einfügen
+        with timed(stats, 'db_write'):
+            collection.update_one(
+                {'scraping_info.url': full_url},
+                {'$set': article_data}
+            )
+
+        logger.info(f"Erfolgreich gescraped mit Status '{status}': {full_url} am {article_datetime}")
+        return status
+
+    except TimeoutException as e:
+        return scraping_status(collection, "error", full_url,'Timeout nach 10 Sekunden', logger, type(e).__name__)
+    except Exception as e:
+        logger.error(f"Fehler beim Verarbeiten von {full_url}: {e}", exc_info=True)
+        return scraping_status(collection, "error", full_url, str(e), logger, type(e).__name__)
+
+
+def scraping_status(collection, status, url, exception_message, logger, error_class=None):
+    logger.warning(f"{exception_message}: {url}")
+    if status == 'error':
+        # Fehler mit Backoff für einen späteren Versuch vormerken
+        record_failure(collection, url, exception_message, error_class=error_class)
+        return status
     collection.update_one(
         {'scraping_info.url': url},
         {
@@ -191,4 +309,100 @@ def scraping_status(collection, status, url, exception_message, logger):
             }
         }
     )
-    logger.warning(f"{exception_message}: {url}")
+    return status
+
+
+def refresh_comments(logger, n=4, claim_size=500):
+    """
+    Aktualisiert die Kommentare bereits gescrapter Artikel inkrementell: neue
+    Postings werden angehängt, nur geänderte Votes überschrieben (siehe
+    common/comment_refresh.py). Junge Artikel sind öfter fällig als alte.
+    """
+    collection = get_db_connection()
+    ensure_lease_index(collection)
+    owner = worker_id()
+
+    articles = claim_batch(collection, {
+        '$and': [
+            {'scraping_info.status': {'$in': ['success', 'warning (reactions)']}},
+            {'features.posting_count': {'$gt': 0}},
+            refresh_due_filter(),
+        ]
+    }, owner, claim_size, projection={'scraping_info.url': 1})
+
+    logger.info(f"Artikel mit fälliger Kommentar-Aktualisierung: {len(articles)} (Lease {owner})")
+    if not articles:
+        return
+
+    with LeaseKeeper(collection, owner, logger):
+        run_workers(articles, refresh_comments_worker, n, logger, metrics_name='derStandard-refresh')
+
+def refresh_comments_worker(task_queue, stats_queue):
+    pid = os.getpid()
+    logger = setup_logger(log_file=f'refresh_{pid}.log')
+    logger.info(f"Prozess {pid} gestartet.")
+    reset_parse_stats()
+
+    stats = WorkerStats()
+    collection = get_db_connection()
+    driver_pool = create_driver_pool(logger, headless=True)
+
+    network_totals = Counter()
+    network_pages = 0
+
+    try:
+        for url_dict in iter_queue(task_queue, stats):
+            with driver_pool.page() as driver:
+                stats.count_status(refresh_article(driver, collection, url_dict['scraping_info']['url'], logger, stats))
+                # Performance-Log bei jeder Seite leeren, sonst wächst es im gepoolten Driver unbegrenzt
+                network = page_network_stats(driver, NETWORK_PROFILE)
+            if network['requests']:
+                network_pages += 1
+                network_totals.update(network)
+    finally:
+        log_network_totals(network_totals, network_pages, logger)
+        log_parse_stats(logger)
+        log_latency_stats(logger)
+        driver_pool.close()
+        logger.info(f"Prozess {pid}: Kommentare von {stats.items} Artikeln aktualisiert.")
+        close_logger(logger)
+        stats_queue.put(stats.as_dict())
+
+def refresh_article(driver, collection, full_url, logger, stats=None):
+    """Liest das Forum eines gespeicherten Artikels erneut und schreibt nur die Änderungen. Rückgabe: Status"""
+    stored_doc = collection.find_one(
+        {'scraping_info.url': full_url},
+        {'article.comments': 1, 'article.pubdate': 1, 'scraping_info.comments_refresh': 1}
+    )
+    if stored_doc is None:
+        # Seit dem Claim gelöscht oder umbenannt (z.B. URL-Deduplizierung)
+        logger.warning(f"Artikel zum Aktualisieren nicht mehr vorhanden: {full_url}")
+        release_lease(collection, full_url)
+        return 'missing'
+    pubdate = stored_doc.get('article', {}).get('pubdate')
+    try:
+        driver.set_page_load_timeout(10)
+        with timed(stats, 'driver.get'):
+            driver.get(full_url)
+        readiness = wait_for_page(driver, [FORUM_READY])
+        if stats:
+            stats.record('wait', readiness['waited'])
+
+        with timed(stats, 'comments'):
+            if 'forum' in readiness['missing']:
+                # kein Shadow-DOM-Forum, evtl. altes Layout
+                forum_comments, comments_warning = extract_forum_comments_alternative(driver, logger, REFRESH_MAX_COMMENTS)
+            else:
+                forum_comments, comments_warning = extract_forum_comments_js(driver, logger, REFRESH_MAX_COMMENTS)
+        if comments_warning:
+            record_refresh_failure(collection, full_url, pubdate, 'Forum nicht gefunden')
+            return 'warning (comments)'
+
+        with timed(stats, 'db_write'):
+            new_count, changed_votes = refresh_article_comments(collection, full_url, stored_doc, forum_comments)
+        logger.info(f"Kommentare aktualisiert: {new_count} neu, {changed_votes} mit geänderten Votes: {full_url}")
+        return 'refreshed'
+    except Exception as e:
+        logger.error(f"Fehler beim Aktualisieren der Kommentare von {full_url}: {e}", exc_info=True)
+        record_refresh_failure(collection, full_url, pubdate, str(e))
+        return 'error'
@@ -0,0 +1,130 @@
+"""
+Wendet die aktuellen Parser erneut auf archivierte Roh-HTML-Seiten an
+(siehe common/page_archive.py), ohne die Seiten neu zu laden. Die Seiten
+werden parallel auf alle Kerne verteilt; mit --write werden die Ergebnisse
+in die MongoDB übernommen, sonst nur gezählt.
+
+Aufruf: python Webscraping/reparse_archive.py SITE [--since 2025-01-01] [--workers 8] [--write]
+SITE: derStandard, Krone oder ORF. Es wird jeweils der neueste Abruf je URL verwendet.
+"""
+import os
+import sys
+import time
+import logging
+import argparse
+import datetime
+from concurrent.futures import ProcessPoolExecutor
+from pymongo import UpdateOne
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+from common.html_parser import make_soup
+from common.page_archive import latest_records, read_record
+from common.site_modules import load_site_module
+
+logger = logging.getLogger(__name__)
+
+
+def reparse_derstandard(url, parts):
+    parsers = load_site_module('derStandard', 'parsers')
+    soup = make_soup(read_record('derStandard', parts['page']))
+    article_data, old_design = parsers.parse_static_article(soup, url, logger)
+    if old_design:
+        # Das alte Forum steht im HTML, das neue (Shadow-DOM) nicht
+        article_data['article.comments'], _ = parsers.parse_forum_comments_alternative(soup, logger)
+    return article_data
+
+
+def reparse_krone(url, parts):
+    parsers = load_site_module('Krone', 'parsers')
+    soup = make_soup(read_record('Krone', parts['page']))
+    article_data = parsers.parse_krone_article(soup, logger)
+
+    posting_count_elem = soup.find('span', class_='stb__comment-count js-krn-comments-count')
+    article_data['features.posting_count'] = int(posting_count_elem.text.strip()) if posting_count_elem else 0
+
+    if 'comments' in parts:
+        soup_iframe = make_soup(read_record('Krone', parts['comments']), parse_only=parsers.COMMENTS_STRAINER)
+        comment_divs = soup_iframe.find_all("div", class_=parsers.COMMENT_WRAPPER_CLASS)
+        article_data['article.comments'] = parsers.parse_krone_nested_comments(comment_divs)
+    return article_data
+
+
+def reparse_orf(url, parts):
+    scraper = load_site_module('ORF', 'scraper')
+    article_data, _ = scraper.parse_article_html(read_record('ORF', parts['page']))
+    return {'article': article_data} if article_data else None
+
+
+REPARSERS = {
+    'derStandard': reparse_derstandard,
+    'Krone': reparse_krone,
+    'ORF': reparse_orf,
+}
+
+
+def reparse_page(task):
+    """Läuft im Prozess-Pool. Rückgabe: (url, Update-Felder oder None, Fehlermeldung oder None)"""
+    site, url, parts = task
+    try:
+        return url, REPARSERS[site](url, parts), None
+    except Exception as e:
+        return url, None, f"{type(e).__name__}: {e}"
+
+
+def get_collection(site):
+    if site == 'ORF':
+        return load_site_module('ORF', 'scraper').get_db_connection('ORF')
+    return load_site_module(site, 'database').get_db_connection(site)
+
+
+def reparse_site(site, since=None, workers=None, write=False, batch_size=500):
+    latest = latest_records(site, since=since)
+    tasks = [(site, url, parts) for url, parts in latest.items() if 'page' in parts]
+    if not tasks:
+        print(f"Keine archivierten Seiten für {site} gefunden.")
+        return
+
+    collection = get_collection(site) if write else None
+    updates = []
+    parsed = 0
+    failed = 0
+    started = time.perf_counter()
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        for url, article_data, error in pool.map(reparse_page, tasks, chunksize=16):
+            if error or not article_data:
+                failed += 1
+                logger.warning(f"Neu-Parsen fehlgeschlagen für {url}: {error or 'kein Artikel gefunden'}")
+                continue
+            parsed += 1
+            if collection is not None:
+                article_data['scraping_info.reparsed_at'] = datetime.datetime.now()
+                updates.append(UpdateOne({'scraping_info.url': url}, {'$set': article_data}))
+                if len(updates) >= batch_size:
+                    collection.bulk_write(updates, ordered=False)
+                    updates = []
+
+    if updates:
+        collection.bulk_write(updates, ordered=False)
+
+    seconds = time.perf_counter() - started
+    print(
+        f"{site}: {len(tasks)} Seiten in {seconds:.1f}s neu geparst ({len(tasks) / seconds:.1f} Seiten/s), "
+        f"{parsed} erfolgreich, {failed} fehlgeschlagen{', in MongoDB übernommen' if write else ''}."
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('site', choices=sorted(REPARSERS))
+    parser.add_argument('--since', type=datetime.datetime.fromisoformat, default=None)
+    parser.add_argument('--workers', type=int, default=None)
+    parser.add_argument('--write', action='store_true')
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.WARNING)
+    reparse_site(args.site, since=args.since, workers=args.workers, write=args.write)
+
+
+if __name__ == "__main__":
+    main()
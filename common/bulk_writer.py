@@ -0,0 +1,82 @@
+import asyncio
+import threading
+from pymongo.errors import BulkWriteError
+
+
+class AsyncBulkWriter:
+    """
+    Sammelt pymongo-Operationen (z.B. UpdateOne) aus asyncio-Coroutinen und
+    schreibt sie gebündelt per bulk_write(ordered=False). Geschrieben wird im
+    Thread-Executor, sobald 'max_ops' Operationen gesammelt sind oder
+    spätestens nach 'max_delay' Sekunden. Die Event-Loop wartet dadurch nie
+    auf die Datenbank.
+
+    Verwendung:
+        async with AsyncBulkWriter(collection, logger) as writer:
+            writer.add(UpdateOne(...))
+    """
+
+    def __init__(self, collection, logger, max_ops=100, max_delay=2.0):
+        self.collection = collection
+        self.logger = logger
+        self.max_ops = max_ops
+        self.max_delay = max_delay
+        self.ops = []
+        self.pending = set()
+        self.timer = None
+        self.written = 0
+        self.modified = 0
+        self.errors = 0
+        self.lock = threading.Lock()  # _write läuft ggf. parallel in mehreren Threads
+
+    async def __aenter__(self):
+        self.timer = asyncio.create_task(self._flush_periodically())
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        self.timer.cancel()
+        self.flush()
+        if self.pending:
+            await asyncio.gather(*self.pending)
+        self.logger.info(
+            f"Bulk-Writer: {self.written} Operationen geschrieben, {self.modified} Dokumente geändert, "
+            f"{self.errors} fehlerhaft."
+        )
+
+    def add(self, op):
+        self.ops.append(op)
+        if len(self.ops) >= self.max_ops:
+            self.flush()
+
+    def flush(self):
+        """Startet das Schreiben der gesammelten Operationen, ohne darauf zu warten."""
+        if not self.ops:
+            return
+        ops, self.ops = self.ops, []
+        loop = asyncio.get_running_loop()
+        task = asyncio.ensure_future(loop.run_in_executor(None, self._write, ops))
+        self.pending.add(task)
+        task.add_done_callback(self.pending.discard)
+
+    async def _flush_periodically(self):
+        while True:
+            await asyncio.sleep(self.max_delay)
+            self.flush()
+
+    def _write(self, ops):
+        try:
+            result = self.collection.bulk_write(ops, ordered=False)
+            with self.lock:
+                self.written += len(ops)
+                self.modified += result.modified_count
+        except BulkWriteError as e:
+            write_errors = e.details.get('writeErrors', [])
+            with self.lock:
+                self.written += len(ops) - len(write_errors)
+                self.modified += e.details.get('nModified', 0)
+                self.errors += len(write_errors)
+            self.logger.error(f"Bulk-Write mit {len(write_errors)} Fehlern: {write_errors[:3]}")
+        except Exception as e:
+            with self.lock:
+                self.errors += len(ops)
+            self.logger.error(f"Bulk-Write fehlgeschlagen ({len(ops)} Operationen): {e}", exc_info=True)
@@ -0,0 +1,150 @@
+import time
+from pymongo.errors import OperationFailure, PyMongoError
+
+# Fehlercodes, wenn der Server keine Change Streams kann (Standalone statt Replica Set)
+CHANGE_STREAMS_UNSUPPORTED = {40573, 40324}
+
+# Fehlercodes, wenn der Resume-Token nicht mehr im Oplog liegt
+# (ChangeStreamHistoryLost, bei älteren Servern ChangeStreamFatalError)
+CHANGE_STREAM_HISTORY_LOST = {286, 280}
+
+# Felder, deren Setzen eine URL scrape-bar macht (die Sentiment-Klassifikation kommt
+# nachträglich per Update, nachdem scrape_urls_rss.py die URL eingefügt hat)
+TRIGGER_FIELDS = ('features.APA_OeNB_Sentiment',)
+
+
+def trigger_pipeline(trigger_fields=TRIGGER_FIELDS):
+    """
+    Change-Stream-Filter (serverseitig, damit die eigenen Status-Updates der
+    Scraper den Scheduler nicht wecken): eingefügte Dokumente, die ein
+    Trigger-Feld schon haben, und Updates, die ein Trigger-Feld (oder dessen
+    Eltern-Objekt) setzen.
+    """
+    prefixes = set()
+    for field in trigger_fields:
+        parts = field.split('.')
+        prefixes.update('.'.join(parts[:i]) for i in range(1, len(parts) + 1))
+    key_regex = '^(' + '|'.join(sorted(p.replace('.', r'\.') for p in prefixes)) + ')$'
+
+    return [
+        {'$match': {'$or': [
+            *({'operationType': 'insert', f'fullDocument.{field}': {'$exists': True, '$nin': [None, '']}}
+              for field in trigger_fields),
+            {'operationType': {'$in': ['update', 'replace']}, '$expr': {'$gt': [
+                {'$size': {'$filter': {
+                    'input': {'$objectToArray': {'$ifNull': ['$updateDescription.updatedFields', {}]}},
+                    'cond': {'$regexMatch': {'input': '$$this.k', 'regex': key_regex}},
+                }}},
+                0
+            ]}},
+        ]}},
+        {'$project': {'operationType': 1, 'documentKey': 1}},
+    ]
+
+
+class ChangeScheduler:
+    """
+    Startet 'run' ereignisgesteuert statt in einer festen Schleife mit sleep:
+
+      - Change Stream auf 'collection': sobald passende Dokumente ankommen
+        (siehe trigger_pipeline), wird ein Lauf gestartet, sobald 'debounce'
+        Sekunden lang kein weiteres Event kam (spätestens nach 'max_batch_wait').
+        Im Leerlauf wartet der Stream serverseitig (getMore mit maxAwaitTimeMS),
+        ohne Abfragen auf der Collection.
+      - Ohne Change Streams (Standalone-Server): Polling auf die höchste _id
+        (Index immer vorhanden) alle 'poll_interval' Sekunden.
+      - Spätestens nach 'max_idle' Sekunden ohne Lauf wird trotzdem gestartet,
+        für zeitgesteuerte Arbeit (fällige Retries, abgelaufene Leases,
+        Kommentar-Aktualisierung) und Updates, die das Polling nicht sieht.
+
+    'run(reason)' gibt True zurück, wenn noch Arbeit übrig ist (z.B. claim_size
+    ausgeschöpft), dann folgt direkt der nächste Lauf.
+
+    Verwendung:
+        ChangeScheduler(collection, run, logger).serve_forever()
+    """
+
+    def __init__(self, collection, run, logger, debounce=5.0, max_batch_wait=30.0, max_idle=300.0,
+                 poll_interval=30.0, trigger_fields=TRIGGER_FIELDS):
+        self.collection = collection
+        self.run = run
+        self.logger = logger
+        self.debounce = debounce
+        self.max_batch_wait = max_batch_wait
+        self.max_idle = max_idle
+        self.poll_interval = poll_interval
+        self.pipeline = trigger_pipeline(trigger_fields)
+        self.resume_token = None
+        self.last_run = 0.0
+
+    def _run(self, reason):
+        while True:
+            self.logger.info(f"Scheduler: Lauf gestartet ({reason}).")
+            started = time.monotonic()
+            more = self.run(reason)
+            self.last_run = time.monotonic()
+            self.logger.info(f"Scheduler: Lauf nach {self.last_run - started:.1f}s beendet.")
+            if not more:
+                return
+            reason = 'Rückstand'
+
+    def _idle_expired(self):
+        return time.monotonic() - self.last_run >= self.max_idle
+
+    def serve_forever(self):
+        self._run('Start')
+        while True:
+            try:
+                self._watch()
+            except OperationFailure as e:
+                if e.code in CHANGE_STREAMS_UNSUPPORTED:
+                    self.logger.info("Scheduler: keine Change Streams (Standalone-Server), Fallback auf Polling über _id.")
+                    self._poll()
+                elif e.code in CHANGE_STREAM_HISTORY_LOST:
+                    # Mit dem alten Token ließe sich der Stream nie wieder öffnen: ohne Token neu
+                    # beginnen und die dazwischen verpassten Änderungen mit einem Lauf nachholen
+                    self.logger.warning(f"Scheduler: Resume-Token nicht mehr im Oplog ({e}), Stream wird neu geöffnet.")
+                    self.resume_token = None
+                    self._run('Change-Stream-Verlauf verloren')
+                else:
+                    self.logger.warning(f"Scheduler: Change Stream fehlgeschlagen ({e}), wird neu geöffnet.")
+                    time.sleep(self.debounce)
+            except PyMongoError as e:
+                # z.B. Failover oder Netzwerkfehler: Stream ab dem letzten Resume-Token neu öffnen
+                self.logger.warning(f"Scheduler: Change Stream unterbrochen ({e}), wird neu geöffnet.")
+                time.sleep(self.debounce)
+
+    def _watch(self):
+        # try_next wartet serverseitig bis zu 'debounce' Sekunden auf das nächste Event
+        max_await_ms = int(self.debounce * 1000)
+        with self.collection.watch(self.pipeline, resume_after=self.resume_token, max_await_time_ms=max_await_ms) as stream:
+            self.logger.info(f"Scheduler: warte auf Änderungen in {self.collection.full_name}.")
+            while True:
+                change = stream.try_next()
+                if change is None:
+                    self.resume_token = stream.resume_token
+                    if self._idle_expired():
+                        self._run('Intervall')
+                    continue
+
+                # Events sammeln, bis 'debounce' Sekunden Ruhe ist (höchstens max_batch_wait),
+                # damit ein RSS-Batch einen einzigen Lauf auslöst
+                events = 1
+                deadline = time.monotonic() + self.max_batch_wait
+                while time.monotonic() < deadline and stream.try_next() is not None:
+                    events += 1
+                self.resume_token = stream.resume_token
+                self._run(f"{events} neue/geänderte Dokumente")
+
+    def _poll(self):
+        newest = self.collection.find_one({}, sort=[('_id', -1)], projection={'_id': 1})
+        last_id = newest['_id'] if newest else None
+        while True:
+            time.sleep(self.poll_interval)
+            query = {'_id': {'$gt': last_id}} if last_id is not None else {}
+            newest = self.collection.find_one(query, sort=[('_id', -1)], projection={'_id': 1})
+            if newest is not None:
+                last_id = newest['_id']
+                self._run('neue Dokumente (Polling)')
+            elif self._idle_expired():
+                self._run('Intervall')
@@ -0,0 +1,199 @@
+import datetime
+from pymongo import UpdateOne
+
+# Wie oft die Kommentare eines Artikels abhängig von seinem Alter aktualisiert werden:
+# (Alter bis, Abstand). Ältere Artikel werden nicht mehr aktualisiert.
+REFRESH_SCHEDULE = [
+    (datetime.timedelta(days=1), datetime.timedelta(hours=1)),
+    (datetime.timedelta(days=3), datetime.timedelta(hours=4)),
+    (datetime.timedelta(days=14), datetime.timedelta(hours=24)),
+]
+MAX_REFRESH_AGE = REFRESH_SCHEDULE[-1][0]
+
+
+def _naive(value):
+    """
+    Vergleichbar machen: Zeitstempel mit Zeitzone (derStandard, ISO) als naive
+    UTC-Zeit, so wie pymongo sie aus der DB zurückliefert.
+    """
+    if value is not None and value.tzinfo is not None:
+        return value.astimezone(datetime.timezone.utc).replace(tzinfo=None)
+    return value
+
+
+def _utcnow():
+    """
+    Aktuelle Zeit als naive UTC-Zeit, wie _naive und pymongo sie liefern. Alle
+    Zeitpunkte unter scraping_info.comments_refresh werden so gespeichert und
+    mit pubdate verglichen; die lokale Zeit würde Alter und Termine um den
+    UTC-Offset des Rechners verschieben.
+    """
+    return datetime.datetime.now(datetime.timezone.utc).replace(tzinfo=None)
+
+
+def _max(a, b):
+    return b if a is None else a if b is None else max(a, b)
+
+
+def next_refresh_at(pubdate, now=None):
+    """Zeitpunkt der nächsten Aktualisierung laut REFRESH_SCHEDULE, None = nicht mehr aktualisieren."""
+    now = now or _utcnow()
+    if pubdate is None:
+        return None
+    age = now - _naive(pubdate)
+    for max_age, interval in REFRESH_SCHEDULE:
+        if age < max_age:
+            return now + interval
+    return None
+
+
+def refresh_due_filter(now=None):
+    """
+    Artikel, deren Kommentare fällig sind: nächster Termin erreicht oder noch
+    nie aktualisiert und jünger als MAX_REFRESH_AGE.
+    """
+    now = now or _utcnow()
+    return {'$or': [
+        {'scraping_info.comments_refresh.next_at': {'$lte': now}},
+        {
+            'scraping_info.comments_refresh': {'$exists': False},
+            'article.pubdate': {'$gte': now - MAX_REFRESH_AGE},
+        },
+    ]}
+
+
+def iter_comments(comments, depth=0):
+    """Alle Kommentare eines verschachtelten Baums mit Tiefe (0 = oberste Ebene)."""
+    for comment in comments or []:
+        yield comment, depth
+        yield from iter_comments(comment.get('replies'), depth + 1)
+
+
+def high_water(comments):
+    """Höchste commentID (falls numerisch) und neuester Zeitstempel der Kommentare."""
+    ids = [c['commentID'] for c, _ in iter_comments(comments) if isinstance(c.get('commentID'), int)]
+    times = [_naive(c['datetime']) for c, _ in iter_comments(comments) if c.get('datetime')]
+    return {
+        'commentID': max(ids) if ids else None,
+        'datetime': max(times) if times else None,
+    }
+
+
+def is_newer(comment, mark):
+    """Neuer als die Hochwassermarke: über die commentID, sonst (Krone: IDs als String) über den Zeitstempel."""
+    if mark['commentID'] is not None and isinstance(comment.get('commentID'), int):
+        return comment['commentID'] > mark['commentID']
+    if mark['datetime'] is not None and comment.get('datetime'):
+        return _naive(comment['datetime']) > mark['datetime']
+    return True
+
+
+def _element_path(depth, identifier):
+    """Pfad eines Kommentars in Tiefe 'depth', ausgewählt über den arrayFilter 'identifier'."""
+    return 'article.comments' + '.$[].replies' * depth + f'.$[{identifier}]'
+
+
+def comment_refresh_updates(url, stored_comments, fetched_comments, mark=None):
+    """
+    Vergleicht die gespeicherten mit den neu gelesenen Kommentaren und baut die
+    nötigen Updates, ohne das Array article.comments neu zu schreiben:
+      - neue Kommentare (neuer als die Hochwassermarke, noch nicht gespeichert)
+        per $push an die oberste Ebene bzw. in die replies des bekannten Parents
+        (Antworten auf nicht gespeicherte Parents behalten reply_on_comment)
+      - Up-/Downvotes per $set (arrayFilters) nur bei geänderten Kommentaren
+    Ein neuer Kommentar bringt seine (ebenfalls neuen) Antworten mit.
+    Rückgabe: (Liste von UpdateOne, Anzahl neuer Kommentare, Anzahl geänderter Votes)
+    """
+    mark = mark or high_water(stored_comments)
+    stored = {c['commentID']: (c, depth) for c, depth in iter_comments(stored_comments) if c.get('commentID') is not None}
+
+    pushes = {}
+    vote_updates = []
+    new_count = 0
+
+    def visit(comments, parent_id):
+        nonlocal new_count
+        for comment in comments or []:
+            comment_id = comment.get('commentID')
+            known = stored.get(comment_id)
+            if known is None:
+                if comment_id is None or not is_newer(comment, mark):
+                    continue
+                # Parent aus dem Baum oder (Antwort ohne gelesenen Parent) aus reply_on_comment.
+                # Parent gespeichert -> in dessen replies, sonst oberste Ebene mit Verweis auf den Parent
+                target = parent_id if parent_id is not None else comment.get('reply_on_comment')
+                if target in stored:
+                    pushes.setdefault(target, []).append(comment)
+                else:
+                    if target is not None:
+                        comment = dict(comment, reply_on_comment=target)
+                    pushes.setdefault(None, []).append(comment)
+                new_count += sum(1 for _ in iter_comments([comment]))
+                continue
+
+            stored_comment, depth = known
+            if (comment['upvotes'], comment['downvotes']) != (stored_comment.get('upvotes'), stored_comment.get('downvotes')):
+                path = _element_path(depth, 'c')
+                vote_updates.append(UpdateOne(
+                    {'scraping_info.url': url},
+                    {'$set': {f'{path}.upvotes': comment['upvotes'], f'{path}.downvotes': comment['downvotes']}},
+                    array_filters=[{'c.commentID': comment_id}],
+                ))
+            visit(comment.get('replies'), comment_id)
+
+    visit(fetched_comments, None)
+
+    # Pro Ziel-Array ein eigenes Update ($push auf überlappende Pfade ist in einem Update nicht erlaubt)
+    push_updates = []
+    for parent_id, comments in pushes.items():
+        if parent_id is None:
+            push_updates.append(UpdateOne(
+                {'scraping_info.url': url},
+                {'$push': {'article.comments': {'$each': comments}}},
+            ))
+        else:
+            _, depth = stored[parent_id]
+            push_updates.append(UpdateOne(
+                {'scraping_info.url': url},
+                {'$push': {f"{_element_path(depth, 'p')}.replies": {'$each': comments}}},
+                array_filters=[{'p.commentID': parent_id}],
+            ))
+    return push_updates + vote_updates, new_count, len(vote_updates)
+
+
+def refresh_article_comments(collection, url, stored_doc, fetched_comments, now=None):
+    """
+    Schreibt die Änderungen an den Kommentaren eines Artikels (siehe
+    comment_refresh_updates) und legt Hochwassermarke und nächsten Termin unter
+    scraping_info.comments_refresh ab.
+    Rückgabe: (Anzahl neuer Kommentare, Anzahl geänderter Votes)
+    """
+    now = now or _utcnow()
+    article = stored_doc.get('article', {})
+    stored_comments = article.get('comments') or []
+    refresh = stored_doc.get('scraping_info', {}).get('comments_refresh', {})
+    mark = refresh.get('high_water') or high_water(stored_comments)
+
+    updates, new_count, changed_votes = comment_refresh_updates(url, stored_comments, fetched_comments, mark)
+
+    fetched_mark = high_water(fetched_comments)
+    updated_mark = {key: _max(mark[key], fetched_mark[key]) for key in ('commentID', 'datetime')}
+    updates.append(UpdateOne({'scraping_info.url': url}, {'$set': {
+        'scraping_info.comments_refresh.high_water': updated_mark,
+        'scraping_info.comments_refresh.refreshed_at': now,
+        'scraping_info.comments_refresh.next_at': next_refresh_at(article.get('pubdate'), now),
+        'scraping_info.comments_refresh.new_comments': new_count,
+        'scraping_info.comments_refresh.changed_votes': changed_votes,
+    }}))
+    collection.bulk_write(updates, ordered=True)
+    return new_count, changed_votes
+
+
+def record_refresh_failure(collection, url, pubdate, error, now=None):
+    """Fehlgeschlagene Aktualisierung: Fehler merken, nächster Versuch laut Zeitplan."""
+    now = now or _utcnow()
+    collection.update_one({'scraping_info.url': url}, {'$set': {
+        'scraping_info.comments_refresh.last_error': error,
+        'scraping_info.comments_refresh.refreshed_at': now,
+        'scraping_info.comments_refresh.next_at': next_refresh_at(pubdate, now),
+    }})
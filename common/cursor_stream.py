@@ -0,0 +1,73 @@
+import datetime
+
+# Collection (in derselben Datenbank) mit dem Fortschritt langer Läufe: ein Dokument pro Lauf-Name
+CHECKPOINT_COLLECTION = 'checkpoints'
+
+
+def load_checkpoint(collection, name):
+    """Letzte fertig verarbeitete _id des Laufs 'name', None = von vorne beginnen."""
+    checkpoint = collection.database[CHECKPOINT_COLLECTION].find_one({'_id': name})
+    return checkpoint['last_id'] if checkpoint else None
+
+
+def save_checkpoint(collection, name, last_id, processed):
+    collection.database[CHECKPOINT_COLLECTION].update_one(
+        {'_id': name},
+        {'$set': {
+            'collection': collection.name,
+            'last_id': last_id,
+            'processed': processed,
+            'updated_at': datetime.datetime.now(),
+        }},
+        upsert=True
+    )
+
+
+def clear_checkpoint(collection, name):
+    collection.database[CHECKPOINT_COLLECTION].delete_one({'_id': name})
+
+
+def stream_documents(collection, query, projection=None, batch_size=100, checkpoint=None, logger=None):
+    """
+    Liefert die Dokumente zu 'query' einzeln, aufsteigend nach _id, ohne die
+    Ergebnismenge im Speicher zu halten: pro Seite werden höchstens
+    'batch_size' Dokumente (nur die Felder aus 'projection') geladen. Jede Seite
+    ist eine eigene kurze Abfrage ab der letzten _id (Index immer vorhanden),
+    dadurch läuft auch bei stundenlanger Verarbeitung kein Cursor ab.
+
+    Mit 'checkpoint' (Name des Laufs) wird nach jeder vollständig verarbeiteten
+    Seite die letzte _id gespeichert (Collection CHECKPOINT_COLLECTION). Ein
+    abgebrochener Lauf setzt dort fort und wiederholt höchstens eine Seite; nach
+    einem vollständigen Durchlauf wird der Checkpoint gelöscht, der nächste Lauf
+    beginnt wieder von vorne.
+
+    Verwendung:
+        for doc in stream_documents(collection, query, {'article.text': 1}, checkpoint='absa.method0.ORF'):
+            ...
+    """
+    last_id = load_checkpoint(collection, checkpoint) if checkpoint else None
+    if last_id is not None and logger:
+        logger.info(f"Setze Lauf '{checkpoint}' nach _id {last_id} fort.")
+
+    processed = 0
+    while True:
+        page_query = {'$and': [query, {'_id': {'$gt': last_id}}]} if last_id is not None else query
+        page = list(collection.find(page_query, projection).sort('_id', 1).limit(batch_size))
+        if not page:
+            break
+
+        for doc in page:
+            yield doc
+            processed += 1
+
+        # Erst hier ist die ganze Seite verarbeitet (der Aufrufer hat das nächste Dokument angefordert)
+        last_id = page[-1]['_id']
+        if checkpoint:
+            save_checkpoint(collection, checkpoint, last_id, processed)
+        if len(page) < batch_size:
+            break
+
+    if checkpoint:
+        clear_checkpoint(collection, checkpoint)
+    if logger:
+        logger.info(f"{processed} Dokumente aus {collection.name} gelesen.")
@@ -0,0 +1,120 @@
+import re
+import datetime
+from functools import lru_cache
+from collections import Counter
+import dateparser
+
+# Schnelle Wege für die bekannten Formate der Sites, dateparser nur als Rückfall:
+#   ISO 8601:             derStandard data-date / datetime-Attribut ("2024-10-18T14:05:00+02:00")
+#   dd.mm.yyyy[,] HH:MM:  Krone bc__date und Kommentar-title ("18.10.2024, 14:05:32"), ORF ("18.10.2024 14.05")
+#   dd.mm.yyyy
+#   dd. Monat yyyy:       ausgeschriebener Monat, optional mit Wochentag und Uhrzeit
+ISO_RE = re.compile(r'\d{4}-\d{2}-\d{2}')
+NUMERIC_RE = re.compile(r'(\d{1,2})\.(\d{1,2})\.(\d{4}),?(?:\s+(\d{1,2})[:.](\d{2})(?::(\d{2}))?)?(?:\s*Uhr)?')
+MONTH_NAMES = {
+    'jänner': 1, 'januar': 1, 'februar': 2, 'feber': 2, 'märz': 3, 'april': 4, 'mai': 5, 'juni': 6,
+    'juli': 7, 'august': 8, 'september': 9, 'oktober': 10, 'november': 11, 'dezember': 12,
+}
+MONTH_NAME_RE = re.compile(
+    r'(?:[A-Za-z]+,\s*)?(\d{1,2})\.\s*(' + '|'.join(MONTH_NAMES) + r')\s+(\d{4})'
+    r'(?:,?\s+(\d{1,2})[:.](\d{2})(?::(\d{2}))?)?(?:\s*Uhr)?',
+    re.IGNORECASE
+)
+# Nur Angaben mit Jahreszahl werden gecacht, relative ("vor 5 Minuten") hängen vom Zeitpunkt ab
+YEAR_RE = re.compile(r'\d{4}')
+
+CACHE_SIZE = 8192
+
+# Zähler pro Prozess: wie oft welcher Weg gegriffen hat (ohne Cache-Treffer)
+PARSE_STATS = Counter()
+
+
+def _from_groups(day, month, year, hour, minute, second):
+    return datetime.datetime(int(year), int(month), int(day), int(hour or 0), int(minute or 0), int(second or 0))
+
+
+def _parse_fast(text):
+    """Versucht die bekannten Formate, gibt None zurück, wenn keines passt."""
+    if ISO_RE.match(text):
+        try:
+            return datetime.datetime.fromisoformat(text)
+        except ValueError:
+            return None
+
+    match = NUMERIC_RE.fullmatch(text)
+    if match:
+        try:
+            return _from_groups(*match.groups())
+        except ValueError:
+            return None
+
+    match = MONTH_NAME_RE.fullmatch(text)
+    if match:
+        day, month, year, hour, minute, second = match.groups()
+        try:
+            return _from_groups(day, MONTH_NAMES[month.lower()], year, hour, minute, second)
+        except ValueError:
+            return None
+    return None
+
+
+def _parse_uncached(text):
+    result = _parse_fast(text)
+    if result is not None:
+        PARSE_STATS['fast_path'] += 1
+        return result
+    result = dateparser.parse(text, languages=['de'])
+    PARSE_STATS['dateparser' if result is not None else 'failed'] += 1
+    return result
+
+
+_parse_cached = lru_cache(maxsize=CACHE_SIZE)(_parse_uncached)
+
+
+def parse_datetime(text):
+    """
+    Ersatz für dateparser.parse(text, languages=['de']) mit demselben Ergebnis
+    für die Formate der Sites, aber ohne dateparser-Aufruf für bekannte Formate.
+    Gleiche Strings (z.B. Zeitstempel mehrerer Postings) werden aus dem Cache beantwortet.
+    Rückgabe: datetime oder None
+    """
+    if not text:
+        return None
+    text = text.strip()
+    if not text:
+        return None
+    PARSE_STATS['calls'] += 1
+    if YEAR_RE.search(text):
+        return _parse_cached(text)
+    return _parse_uncached(text)
+
+
+def parse_stats():
+    """Trefferquoten seit Prozessstart: Cache, schneller Weg, dateparser."""
+    calls = PARSE_STATS['calls']
+    cache_hits = _parse_cached.cache_info().hits
+    return {
+        'calls': calls,
+        'cache_hits': cache_hits,
+        'fast_path': PARSE_STATS['fast_path'],
+        'dateparser': PARSE_STATS['dateparser'],
+        'failed': PARSE_STATS['failed'],
+        'hit_rate': (cache_hits + PARSE_STATS['fast_path']) / calls if calls else 0.0,
+    }
+
+
+def reset_parse_stats():
+    """Zähler und Cache leeren, z.B. in geforkten Worker-Prozessen, die sonst die Werte des Elternprozesses erben."""
+    PARSE_STATS.clear()
+    _parse_cached.cache_clear()
+
+
+def log_parse_stats(logger):
+    stats = parse_stats()
+    if not stats['calls']:
+        return
+    logger.info(
+        f"Datumsangaben: {stats['calls']} geparst, {stats['hit_rate']:.1%} ohne dateparser "
+        f"(Cache {stats['cache_hits']}, schneller Weg {stats['fast_path']}), "
+        f"dateparser {stats['dateparser']}, nicht erkannt {stats['failed']}"
+    )
@@ -0,0 +1,209 @@
+import os
+import json
+import time
+from contextlib import contextmanager
+from urllib3.exceptions import HTTPError as Urllib3Error
+from selenium.common.exceptions import WebDriverException
+
+try:
+    import psutil
+except ImportError:  # RSS-Grenze wird ohne psutil nicht geprüft
+    psutil = None
+
+# Ältere Cookie-Dateien gelten als veraltet, der Consent wird dann neu geklickt
+COOKIE_MAX_AGE = 7 * 24 * 3600
+
+# Fehler beim Start von Chrome bzw. des Chromedrivers: WebDriverException (inkl.
+# Selenium-Timeouts), Verbindungsfehler und Timeouts zum Driver-Prozess
+STARTUP_ERRORS = (WebDriverException, OSError, Urllib3Error)
+
+
+class DriverPool:
+    """
+    Verwaltet den Chrome-Driver eines Worker-Prozesses:
+      - beim Anlegen werden 'size' Driver gestartet und mit dem gespeicherten
+        Consent-Cookie vorgewärmt, das Popup muss nur einmal (pro Cookie-Datei)
+        weggeklickt werden; abgelaufene oder veraltete Cookies (COOKIE_MAX_AGE)
+        werden verworfen und der Consent neu geklickt
+      - nach 'max_pages' Seiten oder bei mehr als 'max_rss_mb' Speicher
+        (Chrome inkl. Kindprozesse) wird der Driver ersetzt
+      - abgestürzte Driver werden nach einer Seite erkannt und ersetzt
+      - schlägt der Start eines Drivers fehl (STARTUP_ERRORS), wird ein halb
+        gestarteter Driver beendet und der Start bis zu 'start_attempts' Mal
+        wiederholt, der Worker bekommt davon nichts mit
+
+    create_driver:   Funktion ohne Argumente, liefert einen neuen WebDriver
+    accept_consent:  Funktion(driver), klickt das Consent-Popup weg, True nach erfolgtem Klick
+    cookie_file:     JSON-Datei, in der die Consent-Cookies abgelegt werden
+    """
+
+    def __init__(self, create_driver, accept_consent, cookie_file, logger, max_pages=200, max_rss_mb=1500, size=1,
+                 start_attempts=3, start_retry_delay=5.0):
+        self.create_driver = create_driver
+        self.accept_consent = accept_consent
+        self.cookie_file = cookie_file
+        self.logger = logger
+        self.max_pages = max_pages
+        self.max_rss_mb = max_rss_mb
+        self.start_attempts = start_attempts
+        self.start_retry_delay = start_retry_delay
+        self.driver = None
+        self.pages = 0
+        self.drivers_started = 0
+        # Vorgewärmte Driver, die noch keine Seite geladen haben
+        self.idle = []
+
+        if psutil is None and max_rss_mb:
+            logger.info("psutil nicht installiert, Speichergrenze für Chrome wird nicht geprüft.")
+
+        for _ in range(size):
+            try:
+                self.idle.append(self._start_driver())
+            except STARTUP_ERRORS as e:
+                # acquire startet dann bei Bedarf einen neuen Driver
+                logger.warning(f"Driver konnte nicht vorgewärmt werden: {e}")
+
+    @contextmanager
+    def page(self):
+        """
+        Liefert einen einsatzbereiten Driver für genau eine Seite. Danach wird
+        geprüft, ob der Driver noch lebt bzw. recycelt werden muss.
+        """
+        driver = self.acquire()
+        try:
+            yield driver
+        finally:
+            self.release()
+
+    def acquire(self):
+        if self.driver is None:
+            self.driver = self.idle.pop() if self.idle else self._start_driver()
+            self.pages = 0
+        return self.driver
+
+    def release(self):
+        self.pages += 1
+        if not self._is_healthy():
+            self.logger.warning("Driver reagiert nicht mehr und wird ersetzt.")
+            self._discard()
+        elif self.max_pages and self.pages >= self.max_pages:
+            self.logger.info(f"Driver nach {self.pages} Seiten recycelt.")
+            self._discard()
+        else:
+            rss_mb = self._rss_mb()
+            if rss_mb > self.max_rss_mb:
+                self.logger.info(f"Driver bei {rss_mb:.0f} MB Speicher recycelt.")
+                self._discard()
+
+    def close(self):
+        self._discard()
+        for driver in self.idle:
+            self._quit(driver)
+        self.idle = []
+
+    def _start_driver(self):
+        """Startet einen Driver, bei STARTUP_ERRORS bis zu 'start_attempts' Versuche (danach wird der Fehler ausgelöst)."""
+        for attempt in range(1, self.start_attempts + 1):
+            driver = None
+            try:
+                driver = self.create_driver()
+                self.drivers_started += 1
+                if not self._load_cookies(driver):
+                    # Nur nach bestätigtem Klick speichern, sonst würde ein Cookie-Satz ohne Consent
+                    # abgelegt und der Consent nie wieder versucht
+                    if self.accept_consent(driver):
+                        self._save_cookies(driver)
+                    else:
+                        self.logger.warning("Consent-Popup nicht bestätigt, Cookies werden nicht gespeichert.")
+                return driver
+            except STARTUP_ERRORS as e:
+                if driver is not None:
+                    self._quit(driver)
+                if attempt >= self.start_attempts:
+                    self.logger.error(f"Driver nach {attempt} Versuchen nicht gestartet: {e}")
+                    raise
+                self.logger.warning(f"Start des Drivers fehlgeschlagen (Versuch {attempt}/{self.start_attempts}): {e}")
+                time.sleep(self.start_retry_delay * attempt)
+
+    def _quit(self, driver):
+        try:
+            driver.quit()
+        except Exception as e:
+            self.logger.debug(f"Fehler beim Beenden des Drivers: {e}")
+
+    def _discard(self):
+        if self.driver is None:
+            return
+        self._quit(self.driver)
+        self.driver = None
+
+    def _is_healthy(self):
+        if self.driver is None:
+            return True
+        try:
+            return self.driver.execute_script("return 1") == 1
+        except WebDriverException:
+            return False
+
+    def _rss_mb(self):
+        if psutil is None or not self.max_rss_mb or self.driver is None:
+            return 0
+        try:
+            process = psutil.Process(self.driver.service.process.pid)
+            processes = [process] + process.children(recursive=True)
+            return sum(p.memory_info().rss for p in processes) / 1024 / 1024
+        except (psutil.Error, AttributeError):
+            return 0
+
+    def _load_cookies(self, driver):
+        """
+        Setzt gespeicherte Consent-Cookies per CDP, ohne eine Seite zu laden.
+        False, wenn keine gültigen Cookies vorliegen (Datei fehlt, älter als
+        COOKIE_MAX_AGE oder alle Cookies abgelaufen).
+        """
+        if not os.path.exists(self.cookie_file):
+            return False
+        try:
+            if time.time() - os.path.getmtime(self.cookie_file) > COOKIE_MAX_AGE:
+                self.logger.info("Consent-Cookies veraltet, Consent wird neu geklickt.")
+                return False
+            with open(self.cookie_file, encoding='utf-8') as f:
+                cookies = json.load(f)
+            now = time.time()
+            cookies = [c for c in cookies if 'expiry' not in c or c['expiry'] > now]
+            if not cookies:
+                self.logger.info("Consent-Cookies abgelaufen, Consent wird neu geklickt.")
+                return False
+            driver.execute_cdp_cmd('Network.enable', {})
+            driver.execute_cdp_cmd('Network.setCookies', {'cookies': [_to_cdp_cookie(c) for c in cookies]})
+            return True
+        except (OSError, ValueError, WebDriverException) as e:
+            self.logger.warning(f"Consent-Cookies konnten nicht gesetzt werden: {e}")
+            return False
+
+    def _save_cookies(self, driver):
+        # atomar schreiben, andere Worker lesen die Datei eventuell gerade
+        tmp_file = f"{self.cookie_file}.{os.getpid()}.tmp"
+        try:
+            with open(tmp_file, 'w', encoding='utf-8') as f:
+                json.dump(driver.get_cookies(), f)
+            os.replace(tmp_file, self.cookie_file)
+        except (OSError, WebDriverException) as e:
+            self.logger.warning(f"Consent-Cookies konnten nicht gespeichert werden: {e}")
+
+
+def _to_cdp_cookie(cookie):
+    """Wandelt ein Selenium-Cookie (get_cookies) in das CDP-Format um."""
+    cdp_cookie = {
+        'name': cookie['name'],
+        'value': cookie['value'],
+        'domain': cookie.get('domain'),
+        'path': cookie.get('path', '/'),
+        'secure': cookie.get('secure', False),
+        'httpOnly': cookie.get('httpOnly', False),
+    }
+    if 'expiry' in cookie:
+        cdp_cookie['expires'] = cookie['expiry']
+    if cookie.get('sameSite'):
+        cdp_cookie['sameSite'] = cookie['sameSite']
+    return cdp_cookie
@@ -0,0 +1,20 @@
+import os
+from bs4 import BeautifulSoup
+
+# Standard bleibt html.parser, bis die Gleichheit der Ergebnisse mit lxml auf echten
+# Seiten belegt ist (Webscraping/benchmarks/parser_backends.py)
+DEFAULT_BACKEND = 'html.parser'
+
+# Parser-Backend für alle Site-Parser, lxml z.B. mit SCRAPER_HTML_PARSER=lxml aktivieren
+HTML_PARSER = os.getenv('SCRAPER_HTML_PARSER', DEFAULT_BACKEND)
+
+
+def make_soup(html_content, parse_only=None, backend=None):
+    """
+    Erstellt eine BeautifulSoup mit dem konfigurierten Backend.
+    'parse_only' (SoupStrainer) baut nur die Teilbäume auf, die der Extraktor
+    tatsächlich durchsucht. Eine bereits geparste Soup wird unverändert zurückgegeben.
+    """
+    if isinstance(html_content, BeautifulSoup):
+        return html_content
+    return BeautifulSoup(html_content, backend or HTML_PARSER, parse_only=parse_only)
@@ -0,0 +1,141 @@
+import os
+import uuid
+import socket
+import datetime
+import threading
+
+# Wie lange eine geclaimte URL für andere Scraper gesperrt ist (wird verlängert, solange der Lauf dauert)
+LEASE_SECONDS = 900
+
+
+def worker_id():
+    """
+    Eindeutige Kennung eines Scraper-Laufs über alle Rechner hinweg. Pro Lauf
+    neu erzeugen, sonst würden die Leases früherer Läufe weiter verlängert.
+    """
+    return f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+
+
+def ensure_lease_index(collection):
+    collection.create_index('scraping_info.lease_until')
+    collection.create_index('scraping_info.worker_id')
+
+
+def lease_free_filter(now):
+    """Dokumente ohne Lease oder mit abgelaufenem Lease."""
+    return {'scraping_info.lease_until': {'$not': {'$gt': now}}}
+
+
+def claim_batch(collection, query, owner, limit, lease_seconds=LEASE_SECONDS, projection=None, sort=None):
+    """
+    Claimt bis zu 'limit' Dokumente, die 'query' erfüllen und frei sind, mit
+    wenigen Abfragen statt einer pro Dokument:
+      1. eine begrenzte find-Abfrage nach den _ids freier Kandidaten
+      2. ein update_many auf diese _ids, das nur noch freie Dokumente mit
+         Lease (lease_until, worker_id) versieht; das Update ist pro Dokument
+         atomar, parallel laufende Scraper (auch auf anderen Rechnern)
+         bekommen daher nie dieselbe URL
+      3. Rücklesen der tatsächlich geclaimten Dokumente über das eigene Lease
+    Hat ein anderer Scraper zwischen 1. und 2. Kandidaten geclaimt, wird mit den
+    restlichen freien Dokumenten nachgefüllt.
+    Rückgabe: Liste der geclaimten Dokumente (mit 'projection', Reihenfolge nach 'sort')
+    """
+    now = datetime.datetime.now()
+    lease_until = now + datetime.timedelta(seconds=lease_seconds)
+    lease = {
+        'scraping_info.lease_until': lease_until,
+        'scraping_info.worker_id': owner,
+    }
+    claimed_ids = []
+    while len(claimed_ids) < limit:
+        cursor = collection.find({'$and': [query, lease_free_filter(now)]}, {'_id': 1})
+        if sort:
+            cursor = cursor.sort(sort)
+        candidate_ids = [doc['_id'] for doc in cursor.limit(limit - len(claimed_ids))]
+        if not candidate_ids:
+            break
+
+        collection.update_many(
+            {'$and': [query, lease_free_filter(now), {'_id': {'$in': candidate_ids}}]},
+            {'$set': lease}
+        )
+        won = {
+            doc['_id'] for doc in collection.find(
+                {'_id': {'$in': candidate_ids}, 'scraping_info.worker_id': owner, 'scraping_info.lease_until': lease_until},
+                {'_id': 1}
+            )
+        }
+        claimed_ids.extend(_id for _id in candidate_ids if _id in won)
+
+    if not claimed_ids:
+        return []
+    docs = {doc['_id']: doc for doc in collection.find({'_id': {'$in': claimed_ids}}, projection)}
+    return [docs[_id] for _id in claimed_ids if _id in docs]
+
+
+def renew_leases(collection, owner, lease_seconds=LEASE_SECONDS):
+    """Verlängert alle noch gültigen Leases dieses Scrapers."""
+    now = datetime.datetime.now()
+    return collection.update_many(
+        {'scraping_info.worker_id': owner, 'scraping_info.lease_until': {'$gt': now}},
+        {'$set': {'scraping_info.lease_until': now + datetime.timedelta(seconds=lease_seconds)}}
+    ).modified_count
+
+
+def release_leases(collection, owner):
+    """Gibt alle Leases dieses Scrapers sofort wieder frei."""
+    return collection.update_many(
+        {'scraping_info.worker_id': owner},
+        {'$unset': {'scraping_info.lease_until': '', 'scraping_info.worker_id': ''}}
+    ).modified_count
+
+
+def release_lease(collection, url):
+    """Gibt das Lease einer einzelnen URL frei, z.B. wenn sie nicht bearbeitet werden kann."""
+    return collection.update_one(
+        {'scraping_info.url': url},
+        {'$unset': {'scraping_info.lease_until': '', 'scraping_info.worker_id': ''}}
+    ).modified_count
+
+
+class LeaseKeeper:
+    """
+    Verlängert die Leases eines Scrapers im Hintergrund-Thread, solange der
+    Lauf dauert (alle lease_seconds / 3).
+
+    Nach einem normalen Ende laufen die Leases einfach aus, bearbeitete URLs
+    werden also nicht sofort wieder geclaimt. Bei einer Exception werden sie
+    freigegeben, damit andere Scraper die URLs direkt übernehmen können.
+    Stürzt der Prozess ab, übernehmen andere nach Ablauf des Leases.
+
+    Verwendung:
+        with LeaseKeeper(collection, owner, logger):
+            ...
+    """
+
+    def __init__(self, collection, owner, logger, lease_seconds=LEASE_SECONDS):
+        self.collection = collection
+        self.owner = owner
+        self.logger = logger
+        self.lease_seconds = lease_seconds
+        self.stopped = threading.Event()
+        self.thread = threading.Thread(target=self._renew_periodically, daemon=True)
+
+    def _renew_periodically(self):
+        while not self.stopped.wait(self.lease_seconds / 3):
+            try:
+                renewed = renew_leases(self.collection, self.owner, self.lease_seconds)
+                self.logger.debug(f"{renewed} Leases von {self.owner} verlängert.")
+            except Exception as e:
+                self.logger.warning(f"Leases von {self.owner} konnten nicht verlängert werden: {e}")
+
+    def __enter__(self):
+        self.thread.start()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.stopped.set()
+        self.thread.join()
+        if exc_type is not None:
+            released = release_leases(self.collection, self.owner)
+            self.logger.warning(f"Lauf abgebrochen, {released} Leases von {self.owner} freigegeben.")
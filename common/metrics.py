@@ -0,0 +1,148 @@
+import os
+import json
+import math
+import time
+import datetime
+from contextlib import contextmanager
+
+# Ablageort der Metriken, mit SCRAPER_METRICS_DIR="" wird nichts exportiert
+METRICS_DIR = os.getenv(
+    "SCRAPER_METRICS_DIR",
+    os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "metrics"))
+)
+
+# Obergrenzen (Sekunden) der Histogramm-Buckets pro Stufe
+BUCKETS = (0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+
+@contextmanager
+def timed(stats, stage):
+    """
+    Misst die Dauer einer Stufe (z.B. 'driver.get') und legt sie in den
+    WorkerStats ab. Ohne stats (None) wird nur der Block ausgeführt.
+    """
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        if stats is not None:
+            stats.record(stage, time.perf_counter() - start)
+
+
+def percentile(sorted_values, q):
+    """Perzentil nach Nearest-Rank, 'sorted_values' muss sortiert sein."""
+    rank = max(1, math.ceil(q * len(sorted_values)))
+    return sorted_values[rank - 1]
+
+
+def summarize(name, worker_stats, wall_seconds):
+    """Fasst die WorkerStats-Dicts eines Laufs zu Stufen-Histogrammen und Zählern zusammen."""
+    timings = {}
+    statuses = {}
+    for stats in worker_stats:
+        for stage, values in stats.get('timings', {}).items():
+            timings.setdefault(stage, []).extend(values)
+        for status, count in stats.get('statuses', {}).items():
+            statuses[status] = statuses.get(status, 0) + count
+
+    pages = sum(s['items'] for s in worker_stats)
+    stages = {}
+    for stage, values in sorted(timings.items()):
+        values = sorted(values)
+        stages[stage] = {
+            'count': len(values),
+            'sum': sum(values),
+            'mean': sum(values) / len(values),
+            'p50': percentile(values, 0.5),
+            'p95': percentile(values, 0.95),
+            'max': values[-1],
+            'buckets': {str(le): sum(1 for v in values if v <= le) for le in BUCKETS},
+        }
+
+    return {
+        'scraper': name,
+        'finished_at': datetime.datetime.now().isoformat(timespec='seconds'),
+        'wall_seconds': wall_seconds,
+        'workers': len(worker_stats),
+        'pages': pages,
+        'pages_per_minute': pages / wall_seconds * 60 if wall_seconds > 0 else 0.0,
+        'statuses': statuses,
+        'stages': stages,
+    }
+
+
+def _label(value):
+    return str(value).replace('\\', '\\\\').replace('"', '\\"')
+
+
+def to_prometheus(summary):
+    """Zusammenfassung im Prometheus-Textformat (z.B. für den node_exporter-Textfile-Collector)."""
+    scraper = f'scraper="{_label(summary["scraper"])}"'
+    lines = [
+        '# HELP scraper_pages_total Verarbeitete Seiten im letzten Lauf.',
+        '# TYPE scraper_pages_total gauge',
+        f'scraper_pages_total{{{scraper}}} {summary["pages"]}',
+        '# HELP scraper_pages_per_minute Durchsatz im letzten Lauf.',
+        '# TYPE scraper_pages_per_minute gauge',
+        f'scraper_pages_per_minute{{{scraper}}} {summary["pages_per_minute"]:.3f}',
+        '# HELP scraper_run_seconds Dauer des letzten Laufs.',
+        '# TYPE scraper_run_seconds gauge',
+        f'scraper_run_seconds{{{scraper}}} {summary["wall_seconds"]:.3f}',
+        '# HELP scraper_status_total Seiten pro Ergebnis-Status im letzten Lauf.',
+        '# TYPE scraper_status_total gauge',
+    ]
+    for status, count in sorted(summary['statuses'].items()):
+        lines.append(f'scraper_status_total{{{scraper},status="{_label(status)}"}} {count}')
+
+    lines += [
+        '# HELP scraper_stage_seconds Dauer pro Stufe und Seite im letzten Lauf.',
+        '# TYPE scraper_stage_seconds histogram',
+    ]
+    for stage, values in summary['stages'].items():
+        labels = f'{scraper},stage="{_label(stage)}"'
+        for le, count in values['buckets'].items():
+            lines.append(f'scraper_stage_seconds_bucket{{{labels},le="{le}"}} {count}')
+        lines.append(f'scraper_stage_seconds_bucket{{{labels},le="+Inf"}} {values["count"]}')
+        lines.append(f'scraper_stage_seconds_sum{{{labels}}} {values["sum"]:.6f}')
+        lines.append(f'scraper_stage_seconds_count{{{labels}}} {values["count"]}')
+
+    lines += [
+        '# HELP scraper_stage_quantile_seconds p50/p95 pro Stufe im letzten Lauf.',
+        '# TYPE scraper_stage_quantile_seconds gauge',
+    ]
+    for stage, values in summary['stages'].items():
+        labels = f'{scraper},stage="{_label(stage)}"'
+        lines.append(f'scraper_stage_quantile_seconds{{{labels},quantile="0.5"}} {values["p50"]:.6f}')
+        lines.append(f'scraper_stage_quantile_seconds{{{labels},quantile="0.95"}} {values["p95"]:.6f}')
+    return '\n'.join(lines) + '\n'
+
+
+def write_run_metrics(name, worker_stats, wall_seconds, logger, metrics_dir=METRICS_DIR):
+    """
+    Exportiert die Messwerte eines Laufs:
+      - <name>-<Zeitstempel>.json: Zusammenfassung pro Lauf
+      - <name>.prom: letzter Lauf im Prometheus-Textformat (wird atomar ersetzt)
+    """
+    if not metrics_dir or not worker_stats:
+        return None
+
+    summary = summarize(name, worker_stats, wall_seconds)
+    os.makedirs(metrics_dir, exist_ok=True)
+
+    json_path = os.path.join(metrics_dir, f"{name}-{datetime.datetime.now():%Y%m%d-%H%M%S}.json")
+    with open(json_path, 'w', encoding='utf-8') as f:
+        json.dump(summary, f, indent=2, ensure_ascii=False)
+
+    prom_path = os.path.join(metrics_dir, f"{name}.prom")
+    with open(prom_path + '.tmp', 'w', encoding='utf-8') as f:
+        f.write(to_prometheus(summary))
+    os.replace(prom_path + '.tmp', prom_path)
+
+    logger.info(
+        f"{name}: {summary['pages']} Seiten, {summary['pages_per_minute']:.1f} Seiten/min, "
+        f"Status {summary['statuses']}"
+    )
+    for stage, values in summary['stages'].items():
+        logger.info(f"Stufe {stage}: p50 {values['p50']:.2f}s, p95 {values['p95']:.2f}s, max {values['max']:.2f}s")
+    logger.info(f"Metriken geschrieben: {json_path}, {prom_path}")
+    return summary
@@ -0,0 +1,205 @@
+import os
+import time
+import threading
+from pymongo import MongoClient, monitoring
+
+DATABASE = 'newspapers'
+DEFAULT_HOST = 'BlackWidow:27017'
+
+# Kompression nur mit den installierten Bibliotheken (zlib ist immer dabei),
+# der Server wählt den ersten Eintrag, den er selbst unterstützt
+COMPRESSORS = []
+try:
+    import zstandard  # noqa: F401
+    COMPRESSORS.append('zstd')
+except ImportError:
+    pass
+try:
+    import snappy  # noqa: F401
+    COMPRESSORS.append('snappy')
+except ImportError:
+    pass
+COMPRESSORS.append('zlib')
+
+# Ein Client pro Prozess: die Scraper-Worker nutzen nur wenige Threads
+# (LeaseKeeper, Bulk-Writer), ORF schreibt aus einem Executor-Thread
+CLIENT_OPTIONS = {
+    'maxPoolSize': int(os.getenv('MONGODB_MAX_POOL_SIZE', 20)),
+    'minPoolSize': 0,
+    'maxIdleTimeMS': 60000,
+    'connectTimeoutMS': 10000,
+    'serverSelectionTimeoutMS': 30000,
+    'socketTimeoutMS': 300000,
+    'compressors': ','.join(COMPRESSORS),
+    'zlibCompressionLevel': 1,
+    'retryWrites': True,
+    'appname': 'Masterarbeit',
+}
+
+# Ab dieser Dauer (Sekunden) zählt ein Befehl bzw. ein Check-out als langsam
+SLOW_SECONDS = 1.0
+
+
+class LatencyListener(monitoring.CommandListener, monitoring.ConnectionPoolListener):
+    """
+    Zählt Dauer aller Befehle (pro Befehlsname) und die Wartezeit auf eine
+    freie Verbindung aus dem Pool, damit sichtbar wird, wann ein Lauf auf die
+    Datenbank wartet. Werte pro Prozess, siehe latency_stats().
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.checkout_started = threading.local()
+        self.reset()
+
+    def reset(self):
+        with self.lock:
+            self.commands = {}
+            self.checkout = {'count': 0, 'sum': 0.0, 'max': 0.0, 'slow': 0}
+            self.counters = {'connections_created': 0, 'connections_closed': 0,
+                             'checkout_failed': 0, 'commands_failed': 0, 'pool_cleared': 0}
+
+    @staticmethod
+    def _add(entry, seconds):
+        entry['count'] += 1
+        entry['sum'] += seconds
+        entry['max'] = max(entry['max'], seconds)
+        if seconds >= SLOW_SECONDS:
+            entry['slow'] += 1
+
+    def _command_done(self, event, failed):
+        seconds = event.duration_micros / 1e6
+        with self.lock:
+            entry = self.commands.setdefault(event.command_name, {'count': 0, 'sum': 0.0, 'max': 0.0, 'slow': 0})
+            self._add(entry, seconds)
+            if failed:
+                self.counters['commands_failed'] += 1
+
+    # CommandListener
+    def started(self, event):
+        pass
+
+    def succeeded(self, event):
+        self._command_done(event, failed=False)
+
+    def failed(self, event):
+        self._command_done(event, failed=True)
+
+    # ConnectionPoolListener: Check-out läuft im aufrufenden Thread, Start daher thread-lokal
+    def connection_check_out_started(self, event):
+        self.checkout_started.value = time.perf_counter()
+
+    def connection_checked_out(self, event):
+        started = getattr(self.checkout_started, 'value', None)
+        if started is None:
+            return
+        self.checkout_started.value = None
+        with self.lock:
+            self._add(self.checkout, time.perf_counter() - started)
+
+    def connection_check_out_failed(self, event):
+        self.checkout_started.value = None
+        with self.lock:
+            self.counters['checkout_failed'] += 1
+
+    def connection_created(self, event):
+        with self.lock:
+            self.counters['connections_created'] += 1
+
+    def connection_closed(self, event):
+        with self.lock:
+            self.counters['connections_closed'] += 1
+
+    def pool_cleared(self, event):
+        with self.lock:
+            self.counters['pool_cleared'] += 1
+
+    def connection_ready(self, event):
+        pass
+
+    def connection_checked_in(self, event):
+        pass
+
+    def pool_created(self, event):
+        pass
+
+    def pool_ready(self, event):
+        pass
+
+    def pool_closed(self, event):
+        pass
+
+
+LATENCY = LatencyListener()
+
+_lock = threading.Lock()
+_client = None
+_client_pid = None
+
+
+def mongo_uri():
+    """MONGODB_URI (z.B. lokale Instanz beim Lasttest), sonst BlackWidow mit MONGODB_USER/MONGODB_PWD."""
+    uri = os.getenv("MONGODB_URI")
+    if uri:
+        return uri
+    USERNAME = os.getenv("MONGODB_USER")
+    PASSWORD = os.getenv("MONGODB_PWD")
+    return f"mongodb://{USERNAME}:{PASSWORD}@{DEFAULT_HOST}"
+
+
+def get_client():
+    """
+    Der MongoClient dieses Prozesses, beim ersten Aufruf erzeugt. Nach einem
+    fork (Worker-Prozesse aus run_workers, ProcessPoolExecutor) wird im Kind
+    ein neuer Client angelegt: ein geerbter Client darf dort nicht weiter
+    benutzt werden (Sockets und Monitor-Threads gehören dem Elternprozess).
+    """
+    global _client, _client_pid
+    pid = os.getpid()
+    if _client is not None and _client_pid == pid:
+        return _client
+    with _lock:
+        if _client is None or _client_pid != pid:
+            # Geerbte Zähler gehören zum Elternprozess
+            LATENCY.reset()
+            _client = MongoClient(mongo_uri(), event_listeners=[LATENCY], **CLIENT_OPTIONS)
+            _client_pid = pid
+    return _client
+
+
+def get_database(name=DATABASE):
+    return get_client()[name]
+
+
+def get_collection(name, database=DATABASE):
+    """Collection aus der Datenbank 'newspapers' über den gemeinsamen Client."""
+    return get_client()[database][name]
+
+
+def latency_stats():
+    """Befehls- und Check-out-Latenzen seit Start des Clients in diesem Prozess."""
+    with LATENCY.lock:
+        commands = {name: dict(entry) for name, entry in LATENCY.commands.items()}
+        checkout = dict(LATENCY.checkout)
+        counters = dict(LATENCY.counters)
+    for entry in [*commands.values(), checkout]:
+        entry['mean'] = entry['sum'] / entry['count'] if entry['count'] else 0.0
+    return {'commands': commands, 'checkout': checkout, **counters}
+
+
+def log_latency_stats(logger):
+    stats = latency_stats()
+    if not stats['commands']:
+        return
+    total = sum(entry['count'] for entry in stats['commands'].values())
+    seconds = sum(entry['sum'] for entry in stats['commands'].values())
+    slowest = sorted(stats['commands'].items(), key=lambda item: item[1]['sum'], reverse=True)[:5]
+    slow = sum(entry['slow'] for entry in stats['commands'].values())
+    checkout = stats['checkout']
+    logger.info(
+        f"MongoDB: {total} Befehle in {seconds:.1f}s, {slow} über {SLOW_SECONDS:.0f}s ("
+        + ", ".join(f"{name} {e['count']}x Ø {e['mean'] * 1000:.0f} ms max {e['max'] * 1000:.0f} ms" for name, e in slowest)
+        + f"), Check-out Ø {checkout['mean'] * 1000:.1f} ms max {checkout['max'] * 1000:.0f} ms, "
+        f"{stats['connections_created']} Verbindungen aufgebaut, "
+        f"{stats['commands_failed']} Befehle und {stats['checkout_failed']} Check-outs fehlgeschlagen"
+    )
@@ -0,0 +1,128 @@
+import os
+import json
+from fnmatch import fnmatch
+from collections import namedtuple
+from selenium.common.exceptions import WebDriverException
+
+# Profil für das Blockieren von Requests über das Chrome DevTools Protocol.
+# url_patterns: Muster für Network.setBlockedURLs ('*' als Platzhalter)
+# report_only:  nichts blockieren, nur zählen, was blockiert würde
+BlockingProfile = namedtuple('BlockingProfile', ['url_patterns', 'report_only'], defaults=[False])
+
+# Werbung, Tracking, eingebettete Drittanbieter. Consent (CMP), Forum und
+# Krone-Kommentare (Coral) laufen über die eigenen Domains und bleiben erlaubt.
+AD_TRACKER_PATTERNS = [
+    '*doubleclick.net*',
+    '*googlesyndication.com*',
+    '*googletagservices.com*',
+    '*googletagmanager.com*',
+    '*google-analytics.com*',
+    '*adservice.google.*',
+    '*amazon-adsystem.com*',
+    '*adnxs.com*',
+    '*criteo.*',
+    '*outbrain.com*',
+    '*taboola.com*',
+    '*ioam.de*',
+    '*chartbeat.*',
+    '*hotjar.com*',
+    '*facebook.net*',
+    '*connect.facebook.*',
+    '*platform.twitter.com*',
+    '*youtube.com/embed*',
+    '*ytimg.com*',
+    '*jwplayer*',
+]
+
+# Ressourcentypen: setBlockedURLs kennt nur URL-Muster, daher über die Dateiendung
+IMAGE_PATTERNS = ['*.jpg*', '*.jpeg*', '*.png*', '*.gif*', '*.webp*', '*.avif*', '*.svg*']
+FONT_PATTERNS = ['*.woff*', '*.ttf*', '*.otf*', '*.eot*', '*fonts.gstatic.com*']
+MEDIA_PATTERNS = ['*.mp4*', '*.webm*', '*.m3u8*', '*.mp3*']
+
+DEFAULT_PROFILE = BlockingProfile(AD_TRACKER_PATTERNS + IMAGE_PATTERNS + FONT_PATTERNS + MEDIA_PATTERNS)
+
+
+def profile_from_env():
+    """
+    Profil laut SCRAPER_BLOCK_PROFILE: 'block' (Standard), 'report' (nur zählen)
+    oder 'off' (kein Profil, Seiten werden wie bisher vollständig geladen).
+    """
+    mode = os.getenv("SCRAPER_BLOCK_PROFILE", "block")
+    if mode == 'off':
+        return None
+    return DEFAULT_PROFILE._replace(report_only=(mode == 'report'))
+
+
+def configure_options(chrome_options, profile):
+    """
+    Chrome-Optionen für das Profil: 'eager' kehrt nach DOMContentLoaded aus
+    driver.get zurück (auf dynamische Teile warten die Readiness-Checks), das
+    Performance-Log liefert die Netzwerk-Events für die Statistik.
+    """
+    if profile is None:
+        return
+    chrome_options.page_load_strategy = 'eager'
+    chrome_options.set_capability('goog:loggingPrefs', {'performance': 'ALL'})
+
+
+def apply_profile(driver, profile):
+    """Aktiviert das Blockieren für einen neuen Driver."""
+    if profile is None:
+        return
+    driver.execute_cdp_cmd('Network.enable', {})
+    if not profile.report_only:
+        driver.execute_cdp_cmd('Network.setBlockedURLs', {'urls': list(profile.url_patterns)})
+
+
+def matches(url, profile):
+    return any(fnmatch(url, pattern) for pattern in profile.url_patterns)
+
+
+def page_network_stats(driver, profile):
+    """
+    Wertet die Netzwerk-Events seit dem letzten Aufruf aus (liest das
+    Performance-Log und leert es dabei).
+
+    Rückgabe: {'requests', 'bytes', 'blocked_requests', 'blocked_bytes'}
+      - beim Blockieren: blocked_requests = vermiedene Requests; deren Größe ist
+        unbekannt, weil nie geladen (blocked_bytes bleibt 0)
+      - mit report_only: Requests und Bytes, die das Profil vermeiden würde
+    """
+    stats = {'requests': 0, 'bytes': 0, 'blocked_requests': 0, 'blocked_bytes': 0}
+    if profile is None:
+        return stats
+
+    try:
+        entries = driver.get_log('performance')
+    except WebDriverException:
+        return stats  # Driver abgestürzt, wird vom DriverPool ersetzt
+
+    urls = {}
+    for entry in entries:
+        message = json.loads(entry['message'])['message']
+        method = message.get('method')
+        params = message.get('params', {})
+        if method == 'Network.requestWillBeSent':
+            urls[params['requestId']] = params['request']['url']
+            stats['requests'] += 1
+        elif method == 'Network.loadingFinished':
+            size = int(params.get('encodedDataLength', 0))
+            stats['bytes'] += size
+            if profile.report_only and matches(urls.get(params['requestId'], ''), profile):
+                stats['blocked_requests'] += 1
+                stats['blocked_bytes'] += size
+        elif method == 'Network.loadingFailed' and params.get('blockedReason'):
+            stats['blocked_requests'] += 1
+    return stats
+
+
+def log_network_totals(totals, pages, logger):
+    """Summe der page_network_stats eines Workers loggen."""
+    if not pages:
+        return
+    logger.info(
+        f"Netzwerk: {pages} Seiten, {totals['requests'] / pages:.0f} Requests/Seite "
+        f"({totals['bytes'] / pages / 1024:.0f} KB/Seite geladen), "
+        f"{totals['blocked_requests'] / pages:.0f} Requests/Seite vermieden"
+        + (f" ({totals['blocked_bytes'] / pages / 1024:.0f} KB/Seite)" if totals['blocked_bytes'] else "")
+    )
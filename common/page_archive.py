@@ -0,0 +1,183 @@
+import os
+import gzip
+import json
+import hashlib
+import logging
+import datetime
+import threading
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+logger = logging.getLogger(__name__)
+
+# Ablageort des Archivs, mit SCRAPER_ARCHIVE_DIR="" wird nicht archiviert
+ARCHIVE_DIR = os.getenv(
+    "SCRAPER_ARCHIVE_DIR",
+    os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "archive"))
+)
+
+ZSTD_LEVEL = 10
+SHARD_SUFFIXES = ('.warc.zst', '.warc.gz')
+INDEX_SUFFIX = '.idx.jsonl'
+
+
+def compress(data):
+    if zstandard is not None:
+        return zstandard.ZstdCompressor(level=ZSTD_LEVEL).compress(data)
+    return gzip.compress(data)
+
+
+def decompress(frame, shard_path):
+    if shard_path.endswith('.zst'):
+        if zstandard is None:
+            raise RuntimeError(f"zstandard wird zum Lesen von {shard_path} benötigt")
+        return zstandard.ZstdDecompressor().decompress(frame)
+    return gzip.decompress(frame)
+
+
+class PageArchive:
+    """
+    Archiv der Roh-HTML-Seiten einer Site, geschrieben beim Abruf.
+
+    Aufbau (ähnlich WARC): archive/<site>/<Datum>-<pid>-<n>.warc.zst enthält je Seite
+    einen eigenständig komprimierten Frame, die Index-Datei daneben (.idx.jsonl)
+    pro Abruf eine Zeile mit url, fetched_at, part, digest (SHA-256 des HTML),
+    offset und length. Unveränderte Inhalte (gleicher digest) werden innerhalb
+    eines Prozesses nur einmal gespeichert, der Index verweist auf den
+    vorhandenen Frame.
+
+    Jeder Prozess schreibt in eigene Shards, dadurch ist kein Locking zwischen
+    den Worker-Prozessen nötig.
+    """
+
+    def __init__(self, site, archive_dir=ARCHIVE_DIR, max_shard_bytes=512 * 1024 * 1024):
+        self.site_dir = os.path.join(archive_dir, site)
+        os.makedirs(self.site_dir, exist_ok=True)
+        self.max_shard_bytes = max_shard_bytes
+        self.suffix = SHARD_SUFFIXES[0] if zstandard is not None else SHARD_SUFFIXES[1]
+        self.lock = threading.Lock()
+        self.digests = {}
+        self.shard_number = 0
+        self.shard = None
+        self.index = None
+        self.pages = 0
+        self.raw_bytes = 0
+        self.stored_bytes = 0
+
+    def _open_shard(self):
+        self.close()
+        while True:
+            name = f"{datetime.date.today():%Y%m%d}-{os.getpid()}-{self.shard_number}"
+            self.shard_number += 1
+            self.shard_path = os.path.join(self.site_dir, name + self.suffix)
+            if not os.path.exists(self.shard_path):
+                break
+        self.shard = open(self.shard_path, 'ab')
+        self.index = open(os.path.join(self.site_dir, name + INDEX_SUFFIX), 'a', encoding='utf-8')
+        self.digests = {}
+
+    def add(self, url, html_content, part='page', fetched_at=None):
+        """
+        Archiviert eine abgerufene Seite. 'part' unterscheidet mehrere Dokumente
+        pro URL (z.B. 'comments' für das Krone-Kommentar-iFrame).
+        """
+        data = html_content.encode('utf-8')
+        digest = hashlib.sha256(data).hexdigest()
+        fetched_at = fetched_at or datetime.datetime.now()
+
+        with self.lock:
+            if self.shard is None or self.shard.tell() >= self.max_shard_bytes:
+                self._open_shard()
+
+            location = self.digests.get(digest)
+            if location is None:
+                frame = compress(data)
+                location = (self.shard.tell(), len(frame))
+                self.shard.write(frame)
+                self.shard.flush()
+                self.digests[digest] = location
+                self.raw_bytes += len(data)
+                self.stored_bytes += len(frame)
+
+            record = {
+                'url': url,
+                'fetched_at': fetched_at.isoformat(),
+                'part': part,
+                'digest': digest,
+                'shard': os.path.basename(self.shard_path),
+                'offset': location[0],
+                'length': location[1],
+            }
+            self.index.write(json.dumps(record) + '\n')
+            self.index.flush()
+            self.pages += 1
+
+    def close(self):
+        if self.shard is not None:
+            self.shard.close()
+            self.index.close()
+            self.shard = None
+            self.index = None
+            if self.raw_bytes:
+                logger.info(
+                    f"Archiv {self.shard_path}: {self.pages} Seiten, "
+                    f"{self.raw_bytes / 1024 / 1024:.1f} MB -> {self.stored_bytes / 1024 / 1024:.1f} MB"
+                )
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+
+def open_archive(site):
+    """PageArchive für die Site oder None, wenn die Archivierung abgeschaltet ist."""
+    if not ARCHIVE_DIR:
+        return None
+    return PageArchive(site)
+
+
+def iter_index(site, archive_dir=ARCHIVE_DIR, since=None):
+    """Liefert alle Index-Einträge einer Site (optional nur Abrufe ab 'since')."""
+    site_dir = os.path.join(archive_dir, site)
+    if not os.path.isdir(site_dir):
+        return
+    for file_name in sorted(os.listdir(site_dir)):
+        if not file_name.endswith(INDEX_SUFFIX):
+            continue
+        with open(os.path.join(site_dir, file_name), encoding='utf-8') as f:
+            for line in f:
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    continue  # abgebrochene letzte Zeile
+                if since and record['fetched_at'] < since.isoformat():
+                    continue
+                yield record
+
+
+def latest_records(site, archive_dir=ARCHIVE_DIR, since=None):
+    """
+    Neuester Abruf je URL und Teil.
+    Rückgabe: {url: {part: record}}
+    """
+    latest = {}
+    for record in iter_index(site, archive_dir, since):
+        parts = latest.setdefault(record['url'], {})
+        current = parts.get(record['part'])
+        if current is None or record['fetched_at'] >= current['fetched_at']:
+            parts[record['part']] = record
+    return latest
+
+
+def read_record(site, record, archive_dir=ARCHIVE_DIR):
+    """Liest das HTML eines Index-Eintrags aus dem Shard."""
+    shard_path = os.path.join(archive_dir, site, record['shard'])
+    with open(shard_path, 'rb') as f:
+        f.seek(record['offset'])
+        frame = f.read(record['length'])
+    return decompress(frame, shard_path).decode('utf-8')
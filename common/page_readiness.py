@@ -0,0 +1,64 @@
+import time
+from collections import namedtuple
+
+# Ein Element, auf das gewartet wird.
+#   name:     Bezeichnung für Logs/Statistik
+#   selector: CSS-Selektor, oder XPath wenn er mit '/' beginnt
+#   timeout:  maximale Wartezeit in Sekunden für genau dieses Element
+#   shadow:   optionaler CSS-Selektor innerhalb des shadowRoot von 'selector'
+ReadySelector = namedtuple('ReadySelector', ['name', 'selector', 'timeout', 'shadow'], defaults=[None])
+
+# Prüft alle Selektoren in einem einzigen WebDriver-Aufruf
+_PRESENCE_JS = """
+return arguments[0].map(function (check) {
+    var selector = check[0], shadow = check[1], el;
+    if (selector.charAt(0) === '/') {
+        el = document.evaluate(selector, document, null, XPathResult.FIRST_ORDERED_NODE_TYPE, null).singleNodeValue;
+    } else {
+        el = document.querySelector(selector);
+    }
+    if (!el) return false;
+    if (!shadow) return true;
+    return !!(el.shadowRoot && el.shadowRoot.querySelector(shadow));
+});
+"""
+
+
+def wait_for_page(driver, selectors, poll_interval=0.1):
+    """
+    Wartet, bis alle Selektoren auf der aktuellen Seite vorhanden sind oder ihr
+    jeweiliges Timeout abgelaufen ist, und kehrt sofort zurück, sobald nichts
+    mehr offen ist.
+
+    Rückgabe: dict mit
+      'waited':   tatsächliche Wartezeit in Sekunden
+      'found':    {name: Sekunden bis zum Erscheinen}
+      'missing':  [name, ...] der Selektoren, die nicht erschienen sind
+    """
+    start = time.perf_counter()
+    pending = list(selectors)
+    found = {}
+    missing = []
+
+    while pending:
+        present = driver.execute_script(_PRESENCE_JS, [[s.selector, s.shadow] for s in pending])
+        elapsed = time.perf_counter() - start
+
+        still_pending = []
+        for selector, is_present in zip(pending, present):
+            if is_present:
+                found[selector.name] = elapsed
+            elif elapsed >= selector.timeout:
+                missing.append(selector.name)
+            else:
+                still_pending.append(selector)
+        pending = still_pending
+
+        if pending:
+            time.sleep(poll_interval)
+
+    return {
+        'waited': time.perf_counter() - start,
+        'found': found,
+        'missing': missing,
+    }
@@ -0,0 +1,176 @@
+import time
+import asyncio
+import logging
+from contextlib import asynccontextmanager
+from urllib.parse import urlsplit
+
+logger = logging.getLogger(__name__)
+
+# Antworten, bei denen der Host entlastet werden muss
+THROTTLE_STATUS = {429, 502, 503, 504}
+
+
+class HostLimiter:
+    """
+    Begrenzung für einen Host: Token-Bucket (Anfragen pro Sekunde) plus
+    AIMD-Steuerung der gleichzeitigen Anfragen.
+
+      - gesunde, schnelle Antworten: Nebenläufigkeit +1 pro vollem Fenster,
+        Rate +rate_step (additiv)
+      - 429/5xx oder Verbindungsfehler: Nebenläufigkeit und Rate halbieren,
+        bei Retry-After zusätzlich pausieren (multiplikativ)
+      - Latenz über 'latency_target': Nebenläufigkeit um 10 % senken
+
+    Pro 'cooldown' Sekunden wird höchstens einmal gesenkt, damit viele
+    gleichzeitig fehlschlagende Anfragen die Grenze nicht auf das Minimum drücken.
+    """
+
+    def __init__(self, host, concurrency=20, min_concurrency=1, max_concurrency=50,
+                 rate=20.0, min_rate=0.5, max_rate=100.0, rate_step=0.5,
+                 latency_target=2.0, cooldown=1.0):
+        self.host = host
+        self.limit = float(concurrency)
+        self.min_concurrency = min_concurrency
+        self.max_concurrency = max_concurrency
+        self.rate = rate
+        self.min_rate = min_rate
+        self.max_rate = max_rate
+        self.rate_step = rate_step
+        self.latency_target = latency_target
+        self.cooldown = cooldown
+
+        self.tokens = 1.0
+        self.refilled_at = time.monotonic()
+        self.paused_until = 0.0
+        self.decreased_at = 0.0
+        self.in_flight = 0
+        self.condition = asyncio.Condition()
+
+        self.requests = 0
+        self.throttled = 0
+        self.slow = 0
+
+    def _refill(self, now):
+        burst = max(1.0, self.rate)
+        self.tokens = min(burst, self.tokens + (now - self.refilled_at) * self.rate)
+        self.refilled_at = now
+
+    async def acquire(self):
+        async with self.condition:
+            await self.condition.wait_for(lambda: self.in_flight < int(self.limit))
+            self.in_flight += 1
+
+        try:
+            while True:
+                now = time.monotonic()
+                if now < self.paused_until:
+                    await asyncio.sleep(self.paused_until - now)
+                    continue
+                self._refill(now)
+                if self.tokens >= 1.0:
+                    self.tokens -= 1.0
+                    return
+                await asyncio.sleep((1.0 - self.tokens) / self.rate)
+        except asyncio.CancelledError:
+            # Abbruch (z.B. Timeout) während der Pause oder des Wartens auf ein Token:
+            # Slot sofort freigeben, sonst bleibt er dauerhaft belegt
+            self.in_flight -= 1
+            async with self.condition:
+                self.condition.notify_all()
+            raise
+
+    async def release(self, status, latency, retry_after=None):
+        """
+        Meldet das Ergebnis einer Anfrage zurück.
+        status: HTTP-Status oder None bei Verbindungsfehler/Timeout
+        """
+        now = time.monotonic()
+        async with self.condition:
+            self.in_flight -= 1
+            self.requests += 1
+
+            if status is None or status in THROTTLE_STATUS:
+                self.throttled += 1
+                if retry_after:
+                    self.paused_until = max(self.paused_until, now + retry_after)
+                if now - self.decreased_at >= self.cooldown:
+                    self.decreased_at = now
+                    self.limit = max(self.min_concurrency, self.limit / 2)
+                    self.rate = max(self.min_rate, self.rate / 2)
+                    logger.info(f"{self.host}: HTTP {status}, gedrosselt auf {int(self.limit)} parallel / {self.rate:.1f} req/s")
+            elif latency > self.latency_target:
+                self.slow += 1
+                if now - self.decreased_at >= self.cooldown:
+                    self.decreased_at = now
+                    self.limit = max(self.min_concurrency, self.limit * 0.9)
+            else:
+                self.limit = min(self.max_concurrency, self.limit + 1 / self.limit)
+                self.rate = min(self.max_rate, self.rate + self.rate_step / self.limit)
+
+            self.condition.notify_all()
+
+    def summary(self):
+        return (
+            f"{self.host}: {self.requests} Anfragen, {self.throttled} gedrosselt (429/5xx/Fehler), "
+            f"{self.slow} langsam; zuletzt {int(self.limit)} parallel, {self.rate:.1f} req/s"
+        )
+
+
+def parse_retry_after(value):
+    """Retry-After in Sekunden (nur die Sekunden-Form, HTTP-Datum wird ignoriert)."""
+    try:
+        return float(value) if value else None
+    except ValueError:
+        return None
+
+
+class RequestSlot:
+    """Wird in 'AdaptiveLimiter.slot' übergeben, um das Ergebnis der Anfrage zu melden."""
+
+    def __init__(self):
+        self.status = None
+        self.retry_after = None
+
+    def done(self, status, headers=None):
+        self.status = status
+        if headers is not None:
+            self.retry_after = parse_retry_after(headers.get('Retry-After'))
+
+
+class AdaptiveLimiter:
+    """
+    Eigener HostLimiter je Host, für beliebige aiohttp-Fetcher.
+
+    Verwendung:
+        limiter = AdaptiveLimiter()
+        async with limiter.slot(url) as slot:
+            async with session.get(url) as response:
+                slot.done(response.status, response.headers)
+                ...
+    Wird 'done' nicht aufgerufen (z.B. Exception), zählt die Anfrage als Fehler.
+    """
+
+    def __init__(self, **host_defaults):
+        self.host_defaults = host_defaults
+        self.hosts = {}
+
+    def host(self, url):
+        host = urlsplit(url).netloc
+        if host not in self.hosts:
+            self.hosts[host] = HostLimiter(host, **self.host_defaults)
+        return self.hosts[host]
+
+    @asynccontextmanager
+    async def slot(self, url):
+        host_limiter = self.host(url)
+        await host_limiter.acquire()
+        slot = RequestSlot()
+        start = time.monotonic()
+        try:
+            yield slot
+        finally:
+            await host_limiter.release(slot.status, time.monotonic() - start, slot.retry_after)
+
+    def log_summary(self, logger):
+        for host_limiter in self.hosts.values():
+            logger.info(host_limiter.summary())
@@ -0,0 +1,54 @@
+import datetime
+
+# Status, ab dem eine URL nicht mehr automatisch erneut versucht wird
+DEAD_LETTER = 'dead-letter'
+
+MAX_ATTEMPTS = 6
+BASE_DELAY = datetime.timedelta(minutes=10)
+MAX_DELAY = datetime.timedelta(hours=24)
+
+
+def failure_update(error, status='error', now=None, error_class=None):
+    """
+    Update-Pipeline für einen fehlgeschlagenen Versuch. Unter scraping_info.retry
+    werden Anzahl der Versuche, letzter Fehler (Meldung und Exception-Klasse)
+    und der nächste fällige Zeitpunkt gespeichert (exponentiell: 10 min, 20 min,
+    40 min, ... höchstens 24 h). Nach MAX_ATTEMPTS Versuchen wird der Status auf
+    DEAD_LETTER gesetzt.
+
+    'error' ist eine Exception (Klasse wird übernommen) oder eine Meldung, dann
+    gilt 'error_class' (None bei Fehlern ohne Exception, z.B. fehlender Titel).
+
+    Die Rechnung läuft als Pipeline auf dem Server, damit das Update auch in
+    bulk_write (UpdateOne) ohne vorheriges Lesen funktioniert.
+    """
+    now = now or datetime.datetime.now()
+    if isinstance(error, BaseException):
+        error_class = error_class or type(error).__name__
+        error = str(error)
+    attempts = {'$add': [{'$ifNull': ['$scraping_info.retry.attempts', 0]}, 1]}
+    exhausted = {'$gte': [attempts, MAX_ATTEMPTS]}
+    delay_ms = {'$min': [
+        MAX_DELAY / datetime.timedelta(milliseconds=1),
+        {'$multiply': [BASE_DELAY / datetime.timedelta(milliseconds=1), {'$pow': [2, {'$subtract': [attempts, 1]}]}]}
+    ]}
+    return [{'$set': {
+        'scraping_info.status': {'$cond': [exhausted, DEAD_LETTER, status]},
+        'scraping_info.download_datetime': now,
+        'scraping_info.retry.attempts': attempts,
+        'scraping_info.retry.last_error': {'$literal': error},
+        'scraping_info.retry.last_error_class': error_class,
+        'scraping_info.retry.last_error_at': now,
+        'scraping_info.retry.next_attempt_at': {'$cond': [exhausted, None, {'$add': [now, delay_ms]}]},
+    }}]
+
+
+def record_failure(collection, url, error, status='error', error_class=None):
+    """Schreibt einen fehlgeschlagenen Versuch für die URL (siehe failure_update)."""
+    collection.update_one({'scraping_info.url': url}, failure_update(error, status, error_class=error_class))
+
+
+def due_filter(now=None):
+    """Filter auf URLs, deren nächster Versuch fällig ist (oder die noch nie fehlgeschlagen sind)."""
+    now = now or datetime.datetime.now()
+    return {'scraping_info.retry.next_attempt_at': {'$not': {'$gt': now}}}
@@ -0,0 +1,36 @@
+import os
+import sys
+import importlib.util
+
+WEBSCRAPING_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "Webscraping"))
+
+
+def load_site_module(site, name):
+    """
+    Importiert ein Modul eines Scrapers (z.B. load_site_module('derStandard', 'parsers'))
+    unter dem eindeutigen Namen '<site>_<name>'. Die Scraper importieren ihre
+    Nachbarmodule flach ('from utils import ...'); deren Namen kollidieren
+    zwischen den Sites und werden deshalb nur während des Imports eingeblendet.
+    """
+    module_name = f"{site}_{name}"
+    if module_name in sys.modules:
+        return sys.modules[module_name]
+
+    site_dir = os.path.join(WEBSCRAPING_DIR, site)
+    local_names = {os.path.splitext(f)[0] for f in os.listdir(site_dir) if f.endswith('.py')}
+    saved = {n: sys.modules.pop(n) for n in local_names if n in sys.modules}
+    sys.path.insert(0, site_dir)
+    try:
+        spec = importlib.util.spec_from_file_location(module_name, os.path.join(site_dir, f"{name}.py"))
+        module = importlib.util.module_from_spec(spec)
+        sys.modules[module_name] = module
+        spec.loader.exec_module(module)
+    except Exception:
+        sys.modules.pop(module_name, None)
+        raise
+    finally:
+        sys.path.remove(site_dir)
+        for n in local_names:
+            sys.modules.pop(n, None)
+        sys.modules.update(saved)
+    return module
@@ -0,0 +1,145 @@
+import logging
+import datetime
+import requests
+from xml.etree import ElementTree
+from concurrent.futures import ThreadPoolExecutor
+
+from common.url_dedup import ensure_url_index, insert_new_urls
+
+logger = logging.getLogger(__name__)
+
+SITEMAP_NS = "{http://www.sitemaps.org/schemas/sitemap/0.9}"
+
+# Collection mit dem Stand pro Sitemap-Shard (lastmod, abgeschlossen)
+STATE_COLLECTION = 'sitemap_state'
+
+# Fehler beim Laden bzw. Lesen einer Sitemap. Abbrüche mitten in der Antwort
+# (Verbindung, Dekompression) kommen über iter_content als requests-Fehler an,
+# eine unvollständige, aber sauber beendete Antwort als ParseError.
+SITEMAP_ERRORS = (requests.RequestException, ElementTree.ParseError)
+
+CHUNK_SIZE = 64 * 1024
+
+
+def iter_sitemap(url, tag, session=None):
+    """
+    Lädt eine Sitemap gestreamt und liefert (loc, lastmod) für jedes <tag>-Element
+    ('sitemap' im Index, 'url' in einem Shard), während die Antwort noch gelesen wird.
+    Bereits gelieferte Elemente werden sofort wieder freigegeben.
+    Bei HTTP-Fehlern wird requests.HTTPError ausgelöst, damit der Aufrufer einen
+    leeren von einem fehlgeschlagenen Abruf unterscheiden kann; abgebrochene
+    oder abgeschnittene Antworten lösen einen der SITEMAP_ERRORS aus.
+    """
+    response = (session or requests).get(url, stream=True, timeout=60)
+    if response.status_code != 200:
+        response.close()
+        raise requests.HTTPError(f"Failed to fetch sitemap: {url} (HTTP {response.status_code})", response=response)
+
+    # iter_content statt response.raw: urllib3-Fehler (ProtocolError, ReadTimeoutError,
+    # DecodeError) kommen so als requests-Fehler an
+    parser = ElementTree.XMLPullParser(events=('end',))
+
+    def elements():
+        for _, elem in parser.read_events():
+            if elem.tag == SITEMAP_NS + tag:
+                loc = elem.findtext(SITEMAP_NS + 'loc')
+                lastmod = elem.findtext(SITEMAP_NS + 'lastmod')
+                if loc:
+                    yield loc.strip(), lastmod.strip() if lastmod else None
+                elem.clear()
+
+    try:
+        for chunk in response.iter_content(chunk_size=CHUNK_SIZE):
+            parser.feed(chunk)
+            yield from elements()
+        # ParseError, falls das Dokument vorzeitig endet
+        parser.close()
+        yield from elements()
+    finally:
+        response.close()
+
+
+def iter_sitemap_index(url, session=None):
+    """Liefert (loc, lastmod) aller Kind-Sitemaps eines Sitemap-Index."""
+    return iter_sitemap(url, 'sitemap', session)
+
+
+def iter_sitemap_urls(url, session=None):
+    """Liefert die URLs (<loc>) eines Sitemap-Shards einzeln."""
+    for loc, _ in iter_sitemap(url, 'url', session):
+        yield loc
+
+
+def process_sitemap_index(index_url, collection, state_collection, make_document, select=None, workers=1, batch_size=1000):
+    """
+    Fügt die URLs aller (geänderten) Kind-Sitemaps eines Index in 'collection' ein.
+
+      - Shards, deren lastmod seit dem letzten abgeschlossenen Lauf gleich geblieben
+        ist, werden übersprungen
+      - ein Shard gilt erst als erledigt, wenn alle URLs eingefügt sind; ein
+        abgebrochener Lauf setzt daher bei den offenen Shards fort
+      - mit workers > 1 werden Shards parallel geladen (Backfill)
+
+    select: optionale Funktion(list[(loc, lastmod)]) -> Auswahl der Shards
+    Rückgabe: Anzahl neu eingefügter Dokumente
+    """
+    try:
+        shards = list(iter_sitemap_index(index_url))
+    except SITEMAP_ERRORS as e:
+        logger.error(f"Failed to read sitemap index {index_url}: {e}")
+        return 0
+    if select:
+        shards = select(shards)
+
+    locs = [loc for loc, _ in shards]
+    states = {doc['sitemap']: doc for doc in state_collection.find({'sitemap': {'$in': locs}})}
+    todo = [
+        (loc, lastmod) for loc, lastmod in shards
+        if lastmod is None
+        or not states.get(loc, {}).get('completed')
+        or states[loc].get('lastmod') != lastmod
+    ]
+    logger.info(f"{len(shards)} sitemaps selected, {len(shards) - len(todo)} unchanged since last run, {len(todo)} to process.")
+
+    unique_index = ensure_url_index(collection)
+
+    def process_shard(shard):
+        loc, lastmod = shard
+        inserted = 0
+        url_count = 0
+        batch = []
+        try:
+            for url in iter_sitemap_urls(loc):
+                batch.append(url)
+                url_count += 1
+                if len(batch) >= batch_size:
+                    inserted += insert_new_urls(collection, batch, make_document, unique_index=unique_index)
+                    batch = []
+        except SITEMAP_ERRORS as e:
+            # Nicht als erledigt markieren: der nächste Lauf lädt den Shard erneut
+            logger.error(f"Failed to read sitemap {loc} after {url_count} URLs: {e}")
+            state_collection.update_one(
+                {'sitemap': loc},
+                {'$set': {'completed': False, 'last_error': str(e), 'failed_at': datetime.datetime.now()}},
+                upsert=True
+            )
+            return inserted
+        if batch:
+            inserted += insert_new_urls(collection, batch, make_document, unique_index=unique_index)
+
+        # Erst nach vollständig gelesenem Shard als erledigt vermerken
+        state_collection.update_one(
+            {'sitemap': loc},
+            {'$set': {
+                'lastmod': lastmod,
+                'completed': True,
+                'url_count': url_count,
+                'processed_at': datetime.datetime.now()
+            }, '$unset': {'last_error': '', 'failed_at': ''}},
+            upsert=True
+        )
+        logger.info(f"Processed sitemap {loc}: {url_count} URLs, {inserted} new.")
+        return inserted
+
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        return sum(executor.map(process_shard, todo))
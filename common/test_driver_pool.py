@@ -0,0 +1,107 @@
+"""
+Start-Fehler im DriverPool mit einer Fake-Driver-Fabrik (ohne Chrome).
+
+Aufruf: python -m unittest common/test_driver_pool.py
+"""
+import os
+import sys
+import logging
+import tempfile
+import unittest
+from selenium.common.exceptions import WebDriverException
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+from common.driver_pool import DriverPool
+
+
+class FakeDriver:
+    def __init__(self):
+        self.quit_called = False
+
+    def execute_script(self, script):
+        return 1
+
+    def execute_cdp_cmd(self, cmd, params):
+        return {}
+
+    def get_cookies(self):
+        return [{'name': 'consent', 'value': '1', 'domain': 'example.org'}]
+
+    def quit(self):
+        self.quit_called = True
+
+
+class FakeFactory:
+    """Liefert FakeDriver, die ersten 'failures' Aufrufe lösen WebDriverException aus."""
+
+    def __init__(self, failures):
+        self.failures = failures
+        self.calls = 0
+        self.drivers = []
+
+    def __call__(self):
+        self.calls += 1
+        if self.calls <= self.failures:
+            raise WebDriverException("chrome not reachable")
+        driver = FakeDriver()
+        self.drivers.append(driver)
+        return driver
+
+
+class DriverPoolStartTest(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.cookie_file = os.path.join(self.tmp.name, 'cookies.json')
+        self.logger = logging.getLogger('test_driver_pool')
+        self.logger.disabled = True
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def make_pool(self, factory, accept_consent=lambda driver: True, size=0):
+        return DriverPool(factory, accept_consent, self.cookie_file, self.logger,
+                          size=size, start_attempts=3, start_retry_delay=0)
+
+    def test_start_is_retried_after_one_failure(self):
+        factory = FakeFactory(failures=1)
+        pool = self.make_pool(factory)
+        with pool.page() as driver:
+            self.assertIs(driver, factory.drivers[0])
+        self.assertEqual(factory.calls, 2)
+        self.assertEqual(pool.drivers_started, 1)
+        pool.close()
+
+    def test_prewarm_survives_one_failure(self):
+        factory = FakeFactory(failures=1)
+        pool = self.make_pool(factory, size=1)
+        self.assertEqual(len(pool.idle), 1)
+        pool.close()
+
+    def test_half_started_driver_is_quit(self):
+        factory = FakeFactory(failures=0)
+        consent_calls = []
+
+        def accept_consent(driver):
+            consent_calls.append(driver)
+            if len(consent_calls) == 1:
+                raise WebDriverException("consent iframe detached")
+            return True
+
+        pool = self.make_pool(factory, accept_consent)
+        with pool.page() as driver:
+            self.assertIs(driver, factory.drivers[1])
+        self.assertTrue(factory.drivers[0].quit_called)
+        self.assertFalse(factory.drivers[1].quit_called)
+        pool.close()
+
+    def test_gives_up_after_start_attempts(self):
+        factory = FakeFactory(failures=10)
+        pool = self.make_pool(factory)
+        with self.assertRaises(WebDriverException):
+            pool.acquire()
+        self.assertEqual(factory.calls, 3)
+
+
+if __name__ == "__main__":
+    unittest.main()
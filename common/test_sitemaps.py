@@ -0,0 +1,97 @@
+"""
+Abgebrochene und abgeschnittene Sitemap-Downloads (lokaler HTTP-Server, ohne Datenbank).
+
+Aufruf: python -m unittest common/test_sitemaps.py
+"""
+import os
+import sys
+import logging
+import threading
+import unittest
+from unittest import mock
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+from common import sitemaps
+
+SHARD = (
+    '<?xml version="1.0" encoding="UTF-8"?>'
+    '<urlset xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">'
+    + ''.join(f'<url><loc>https://example.org/artikel/{i}</loc></url>' for i in range(50))
+    + '</urlset>'
+).encode('utf-8')
+
+
+class SitemapHandler(BaseHTTPRequestHandler):
+    """/full: vollständig, /truncated: Verbindung bricht vor Content-Length ab, /cut: Dokument endet vorzeitig."""
+
+    def do_GET(self):
+        body = SHARD if self.path == '/full' else SHARD[:len(SHARD) // 2]
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/xml')
+        if self.path == '/cut':
+            self.send_header('Connection', 'close')
+        else:
+            self.send_header('Content-Length', str(len(SHARD)))
+        self.end_headers()
+        self.wfile.write(body)
+        self.wfile.flush()
+        self.close_connection = True
+
+    def log_message(self, format, *args):
+        pass
+
+
+class FakeStateCollection:
+    def __init__(self):
+        self.states = {}
+
+    def find(self, query):
+        return [doc for loc, doc in self.states.items() if loc in query['sitemap']['$in']]
+
+    def update_one(self, query, update, upsert=False):
+        self.states.setdefault(query['sitemap'], {'sitemap': query['sitemap']}).update(update['$set'])
+
+
+class SitemapDownloadTest(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        logging.disable(logging.CRITICAL)
+        cls.server = ThreadingHTTPServer(('127.0.0.1', 0), SitemapHandler)
+        threading.Thread(target=cls.server.serve_forever, daemon=True).start()
+        cls.base_url = f"http://127.0.0.1:{cls.server.server_port}"
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.shutdown()
+        cls.server.server_close()
+        logging.disable(logging.NOTSET)
+
+    def test_full_shard(self):
+        self.assertEqual(len(list(sitemaps.iter_sitemap_urls(self.base_url + '/full'))), 50)
+
+    def test_truncated_response_raises_sitemap_error(self):
+        for path in ('/truncated', '/cut'):
+            with self.subTest(path=path):
+                with self.assertRaises(sitemaps.SITEMAP_ERRORS):
+                    list(sitemaps.iter_sitemap_urls(self.base_url + path))
+
+    def test_truncated_shard_is_recorded_and_others_continue(self):
+        index = [(self.base_url + path, '2025-01-01') for path in ('/full', '/truncated', '/cut')]
+        state = FakeStateCollection()
+        inserted = []
+        with mock.patch.object(sitemaps, 'iter_sitemap_index', return_value=index), \
+                mock.patch.object(sitemaps, 'ensure_url_index', return_value=True), \
+                mock.patch.object(sitemaps, 'insert_new_urls', side_effect=lambda c, urls, *a, **k: inserted.extend(urls) or len(urls)):
+            sitemaps.process_sitemap_index('index', None, state, make_document=None, workers=3, batch_size=1000)
+
+        self.assertTrue(state.states[self.base_url + '/full']['completed'])
+        for path in ('/truncated', '/cut'):
+            self.assertFalse(state.states[self.base_url + path]['completed'])
+            self.assertIn('last_error', state.states[self.base_url + path])
+        self.assertEqual(len(inserted), 50)
+
+
+if __name__ == "__main__":
+    unittest.main()
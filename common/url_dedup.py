@@ -0,0 +1,97 @@
+import logging
+import datetime
+from pymongo.errors import BulkWriteError, OperationFailure
+
+logger = logging.getLogger(__name__)
+
+DUPLICATE_KEY_ERROR = 11000
+URL_INDEX_NAME = 'scraping_info_url_unique'
+
+# Merkt sich pro Collection, dass der Unique-Index nicht angelegt werden konnte,
+# damit nicht jeder Lauf einen fehlschlagenden Index-Build über die ganze Collection startet
+INDEX_STATE_COLLECTION = 'url_index_state'
+INDEX_RETRY_AFTER = datetime.timedelta(days=7)
+
+
+def has_unique_url_index(collection):
+    return any(
+        index.get('unique') and index['key'] == [('scraping_info.url', 1)]
+        for index in collection.index_information().values()
+    )
+
+
+def ensure_url_index(collection):
+    """
+    Legt einen Unique-Index auf 'scraping_info.url' an. Gibt False zurück, wenn
+    das nicht möglich ist (z.B. weil es bereits Duplikate oder einen anderen
+    Index auf dem Feld gibt); dann wird auf einen normalen Index zurückgegriffen.
+    Ein fehlgeschlagener Versuch wird in INDEX_STATE_COLLECTION vermerkt und erst
+    nach INDEX_RETRY_AFTER wiederholt (z.B. nachdem Duplikate entfernt wurden).
+    """
+    if has_unique_url_index(collection):
+        return True
+
+    state_collection = collection.database[INDEX_STATE_COLLECTION]
+    state = state_collection.find_one({'_id': collection.name})
+    now = datetime.datetime.now()
+    if state and state['failed_at'] > now - INDEX_RETRY_AFTER:
+        return False
+
+    try:
+        collection.create_index('scraping_info.url', unique=True, name=URL_INDEX_NAME)
+        state_collection.delete_one({'_id': collection.name})
+        return True
+    except OperationFailure as e:
+        logger.warning(f"Kein Unique-Index auf scraping_info.url in '{collection.name}' möglich: {e}")
+        state_collection.update_one(
+            {'_id': collection.name},
+            {'$set': {'failed_at': now, 'error': str(e)}},
+            upsert=True
+        )
+        try:
+            collection.create_index('scraping_info.url')
+        except OperationFailure:
+            pass  # es existiert bereits ein Index auf dem Feld
+        return False
+
+
+def insert_new_urls(collection, urls, make_document, batch_size=1000, unique_index=None):
+    """
+    Fügt für alle URLs, die noch nicht in der Collection sind, ein Dokument ein.
+    Der Aufwand hängt nur von der Anzahl der übergebenen URLs ab, nicht von der
+    Größe der Collection:
+      - mit Unique-Index: ungeordnetes insert_many, Duplikate werden ignoriert
+      - sonst: $in-Abfrage pro Batch über den Index, dann insert_many
+
+    make_document: Funktion(url) -> einzufügendes Dokument
+    unique_index:  Ergebnis von ensure_url_index, falls bereits bekannt
+    Rückgabe: Anzahl der neu eingefügten Dokumente
+    """
+    urls = list(dict.fromkeys(urls))  # Duplikate innerhalb der Eingabe entfernen, Reihenfolge behalten
+    if unique_index is None:
+        unique_index = ensure_url_index(collection)
+    inserted = 0
+
+    for i in range(0, len(urls), batch_size):
+        batch = urls[i:i + batch_size]
+
+        if unique_index:
+            try:
+                result = collection.insert_many([make_document(url) for url in batch], ordered=False)
+                inserted += len(result.inserted_ids)
+            except BulkWriteError as e:
+                other_errors = [err for err in e.details.get('writeErrors', []) if err.get('code') != DUPLICATE_KEY_ERROR]
+                if other_errors:
+                    raise
+                inserted += e.details.get('nInserted', 0)
+        else:
+            existing = set(
+                doc['scraping_info']['url']
+                for doc in collection.find({'scraping_info.url': {'$in': batch}}, {'scraping_info.url': 1})
+            )
+            new_documents = [make_document(url) for url in batch if url not in existing]
+            if new_documents:
+                collection.insert_many(new_documents)
+                inserted += len(new_documents)
+
+    return inserted
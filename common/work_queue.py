@@ -0,0 +1,144 @@
+import os
+import queue
+import time
+import multiprocessing
+
+from common.metrics import write_run_metrics
+
+# Markiert das Ende der Arbeit für genau einen Worker
+_SENTINEL = None
+
+
+class WorkerStats:
+    """
+    Misst für einen Worker-Prozess, wie viel Zeit mit Arbeit (busy) bzw.
+    mit Warten auf die Queue (wait) verbracht wurde.
+    """
+
+    def __init__(self):
+        self.pid = os.getpid()
+        self.items = 0
+        self.busy_seconds = 0.0
+        self.wait_seconds = 0.0
+        self.timings = {}
+        self.statuses = {}
+        self.started = time.time()
+
+    def record(self, name, seconds):
+        """Zusätzliche Zeitmessung pro Eintrag (z.B. Wartezeit auf die Seite)."""
+        self.timings.setdefault(name, []).append(seconds)
+
+    def count_status(self, status):
+        """Zählt den Ergebnis-Status eines Eintrags (z.B. 'success', 'error')."""
+        self.statuses[status] = self.statuses.get(status, 0) + 1
+
+    def as_dict(self):
+        return {
+            'pid': self.pid,
+            'items': self.items,
+            'busy_seconds': self.busy_seconds,
+            'wait_seconds': self.wait_seconds,
+            'timings': self.timings,
+            'statuses': self.statuses,
+            'lifetime_seconds': time.time() - self.started,
+        }
+
+
+def iter_queue(task_queue, stats):
+    """
+    Holt Batches aus der gemeinsamen Queue, bis der Sentinel kommt, und liefert
+    die Einträge einzeln. Die Zeit zwischen yield und nächstem Aufruf zählt als
+    Arbeitszeit, das Warten auf die Queue als Wartezeit.
+    """
+    while True:
+        wait_start = time.perf_counter()
+        batch = task_queue.get()
+        stats.wait_seconds += time.perf_counter() - wait_start
+        if batch is _SENTINEL:
+            return
+        for item in batch:
+            busy_start = time.perf_counter()
+            yield item
+            stats.busy_seconds += time.perf_counter() - busy_start
+            stats.items += 1
+
+
+def run_workers(items, worker, n, logger, batch_size=1, metrics_name=None):
+    """
+    Verteilt 'items' über eine gemeinsame Queue auf n Prozesse. Jeder Worker holt
+    sich immer nur den nächsten Batch (Work-Stealing), dadurch blockiert ein
+    langsamer Teil (z.B. viele Timeouts) nicht den gesamten Durchlauf.
+
+    'worker' muss eine Top-Level-Funktion mit der Signatur
+    worker(task_queue, stats_queue) sein, die über iter_queue() iteriert und am
+    Ende WorkerStats.as_dict() in die stats_queue legt.
+
+    Mit 'metrics_name' werden die Messwerte des Laufs zusätzlich als JSON und
+    im Prometheus-Textformat exportiert (siehe common/metrics.py).
+
+    Rückgabe: Liste der WorkerStats-Dicts aller Worker.
+    """
+    task_queue = multiprocessing.Queue()
+    stats_queue = multiprocessing.Queue()
+
+    for i in range(0, len(items), batch_size):
+        task_queue.put(items[i:i + batch_size])
+    for _ in range(n):
+        task_queue.put(_SENTINEL)
+
+    started = time.time()
+    processes = [multiprocessing.Process(target=worker, args=(task_queue, stats_queue)) for _ in range(n)]
+    for process in processes:
+        process.start()
+
+    # Stats einsammeln, bevor gejoint wird (sonst kann die Queue blockieren)
+    worker_stats = []
+    while len(worker_stats) < n:
+        try:
+            worker_stats.append(stats_queue.get(timeout=5))
+        except queue.Empty:
+            if not any(process.is_alive() for process in processes):
+                logger.warning(f"{n - len(worker_stats)} Worker ohne Statistik beendet (abgestürzt?).")
+                break
+
+    for process in processes:
+        process.join()
+
+    wall_seconds = time.time() - started
+    log_utilisation(worker_stats, wall_seconds, logger)
+    if metrics_name:
+        write_run_metrics(metrics_name, worker_stats, wall_seconds, logger)
+    return worker_stats
+
+
+def log_utilisation(worker_stats, wall_seconds, logger):
+    """Loggt die Auslastung pro Worker und gesamt."""
+    if not worker_stats or wall_seconds <= 0:
+        return
+
+    for stats in sorted(worker_stats, key=lambda s: s['pid']):
+        utilisation = stats['busy_seconds'] / wall_seconds
+        idle = wall_seconds - stats['busy_seconds']
+        logger.info(
+            f"Worker {stats['pid']}: {stats['items']} Einträge, "
+            f"Arbeit {stats['busy_seconds']:.1f}s, Queue-Wartezeit {stats['wait_seconds']:.1f}s, "
+            f"Leerlauf {idle:.1f}s, Auslastung {utilisation:.0%}"
+        )
+
+    total_items = sum(s['items'] for s in worker_stats)
+    total_busy = sum(s['busy_seconds'] for s in worker_stats)
+    mean_utilisation = total_busy / (wall_seconds * len(worker_stats))
+    logger.info(
+        f"Gesamt: {total_items} Einträge in {wall_seconds:.1f}s mit {len(worker_stats)} Workern, "
+        f"mittlere Auslastung {mean_utilisation:.0%}"
+    )
+
+    timings = {}
+    for stats in worker_stats:
+        for name, values in stats.get('timings', {}).items():
+            timings.setdefault(name, []).extend(values)
+    for name, values in sorted(timings.items()):
+        logger.info(
+            f"{name}: {len(values)} Messungen, Mittel {sum(values) / len(values):.2f}s, "
+            f"Max {max(values):.2f}s, Summe {sum(values):.1f}s"
+        )